@@ -3,19 +3,29 @@
 # The actions module contains the functions that are called when a command is executed.
 # Each function takes 3 parameters:
 # - game: the game object
-# - list_of_words: the list of words in the command
+# - list_of_words: the list of words in the command, as parsed by the grammar of the game: the command
+#   word, then the parameters, the directions being given by their canonical name (N, E, S, O, U, D)
 # - number_of_parameters: the number of parameters expected by the command
 # The functions return True if the command was executed successfully, False otherwise.
-# The functions print an error message if the number of parameters is incorrect.
-# The error message is different depending on the number of parameters expected by the command.
+# The number of parameters has already been checked by the grammar, which prints an error message if
+# it is incorrect. The error message is different depending on the number of parameters expected by the command.
 
 
+from behaviors import use_item
+from events import (InventoryShown, ItemDropped, ItemNotFound, ItemsDropped, ItemsTaken, ItemTaken, ItemTooHeavy,
+                    MoneyTaken, NpcNotFound, NpcSpoke, RoomLooked)
+from fuzzy import did_you_mean
+from item import MONEY
+from output import publish, say
+
 # The error message is stored in the MSG0 and MSG1 variables and formatted 
 #with the command_word variable, the first word in the command.
 # The MSG0 variable is used when the command does not take any parameter.
 MSG0 = "\nLa commande '{command_word}' ne prend pas de paramètre.\n"
 # The MSG1 variable is used when the command takes 1 parameter.
 MSG1 = "\nLa commande '{command_word}' prend 1 seul paramètre.\n"
+# The word standing for all the Items, in take all and drop all.
+ALL_ITEMS = "all"
 
 class Actions:
     """
@@ -48,7 +58,7 @@ class Actions:
         Sorties: N, E, S, O
         <BLANKLINE>
         True
-         >>> Actions.go(game, ["go", "W"], 1)
+        >>> Actions.go(game, ["go", "W"], 1)
         <BLANKLINE>
         Direction 'W' non reconnue.
         <BLANKLINE>
@@ -56,52 +66,182 @@ class Actions:
         <BLANKLINE>
         Sorties: N, E, S, O
         <BLANKLINE>
-        True
-        >>> Actions.go(game, ["go", "N", "E"], 1)
+        False
+        >>> Actions.go(game, ["go", "U"], 1)
+        <BLANKLINE>
+        Aucune porte dans cette direction !
+        <BLANKLINE>
+        False
+        >>> game.process_command('go N E')
         <BLANKLINE>
         La commande 'go' prend 1 seul paramètre.
         <BLANKLINE>
         False
-        >>> Actions.go(game, ["go"], 1)
+        >>> game.process_command('go')
         <BLANKLINE>
         La commande 'go' prend 1 seul paramètre.
         <BLANKLINE>
         False
         """
-        
+
         player = game.player
-        l = len(list_of_words)
-        # If the number of parameters is incorrect, print an error message and return False.
-        if l != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
-            return False
 
         #A supprimer si trop contraignant
         if player.current_room.is_dark :
-            print("\nSe déplacer dans le noir est trop dangereux, il faudrait de quoi s'éclairer...\n") 
+            say("\nSe déplacer dans le noir est trop dangereux, il faudrait de quoi s'éclairer...\n") 
             return False
 
-        # Get the direction from the list of words.
+        # Get the direction from the list of words: the grammar has already replaced any of its words with the direction itself.
         direction = list_of_words[1]
-        #Check if the provided direction is part of the valid words list of one possible direction
-        for d in game.directions.keys() :
-            if direction in game.directions.get(d) :
-                player.move(d)
-                # Characters move only if the player uses the command "go". 
-                for character in game.characters :
-                    if character in ["King", "Shopkeeper", "Dragon"]:
-                        continue
-                    npc = game.characters.get(character)
-                    if npc :
-                        npc.move()
-                return True
-                
-        else:
-            print(f"\nDirection '{direction}' non reconnue.")
-            print(player.current_room.get_long_description())
+        if direction in game.exits :
+            if not player.move(direction) :
+                return False
+            # Characters move only if the player moves with the command "go".
+            Actions._move_characters(game)
+            return True
+
+        say(f"\nDirection '{direction}' non reconnue.")
+        say(player.current_room.get_long_description())
+        return False
+
+    @staticmethod
+    def _move_characters(game):
+        """Give every NPC that wanders around the chance to move, after a move of the player."""
+        # Iterate over a copy: with a world store, a move can load a room and the NPCs it contains.
+        for character in list(game.characters) :
+            if character in ["King", "Shopkeeper", "Dragon"]:
+                continue
+            npc = game.characters.get(character)
+            if npc :
+                npc.move()
+
+    @staticmethod
+    def goto(game, list_of_words, number_of_parameters):
+        """
+        Move the player to the room specified by the parameter, following the shortest route.
+        One-way passages are only taken in their direction, and the route never goes through a dark room.
+
+        Args:
+            game (Game): The game object.
+            list_of_words (list): The list of words in the command.
+            number_of_parameters (int): The number of parameters expected by the command.
+
+        Returns:
+            bool: True if the command was executed successfully, False otherwise.
+
+        Examples:
+
+        >>> from game import Game
+        >>> game = Game()
+        >>> game.setup("TestPlayer")
+        >>> Actions.goto(game, ["goto", "Shop"], 1) # doctest: +ELLIPSIS
+        <BLANKLINE>
+        Vous êtes dans la partie nord du village.
+        ...
+        Vous êtes dans une boutique d'items tenue par un vieil homme.
+        <BLANKLINE>
+        Sorties: E, S
+        <BLANKLINE>
+        True
+        >>> Actions.goto(game, ["goto", "Nowhere"], 1)
+        <BLANKLINE>
+        Aucun lieu nommé Nowhere n'existe.
+        <BLANKLINE>
+        False
+        >>> Actions.goto(game, ["goto", "UnderCastle"], 1) # doctest: +ELLIPSIS
+        <BLANKLINE>
+        ...
+        Vous êtes dans un sous-terrain entièrement plongé dans l'obscurité
+        <BLANKLINE>
+        Impossible de se repérer, il fait trop sombre.
+        <BLANKLINE>
+        True
+        >>> Actions.goto(game, ["goto", "Castle"], 1)
+        <BLANKLINE>
+        Se déplacer dans le noir est trop dangereux, il faudrait de quoi s'éclairer...
+        <BLANKLINE>
+        False
+        """
+
+        player = game.player
+
+        if player.current_room.is_dark :
+            say("\nSe déplacer dans le noir est trop dangereux, il faudrait de quoi s'éclairer...\n") 
+            return False
+
+        # Get the target room from the list of words.
+        room_name = list_of_words[1]
+        target = game.world.get_room(room_name)
+        if target is None :
+            say(f"\nAucun lieu nommé {room_name} n'existe.\n")
+            return False
+
+        route = game.router.route(player.current_room, target)
+        if route is None :
+            say(f"\nAucun chemin ne mène à {room_name} d'ici.\n")
+            return False
+        if not route :
+            say(f"\nVous êtes déjà dans {room_name}.\n")
+            return False
+
+        # Follow the route one move at a time, as with the command "go".
+        for direction in route :
+            player.move(direction)
+            Actions._move_characters(game)
+        return True
+
+    @staticmethod
+    def search(game, list_of_words, number_of_parameters):
+        """
+        Print the rooms, Items and characters whose names, descriptions or messages contain the word
+        specified by the parameter. Accents and capital letters are ignored.
+
+        Args:
+            game (Game): The game object.
+            list_of_words (list): The list of words in the command.
+            number_of_parameters (int): The number of parameters expected by the command.
+
+        Returns:
+            bool: True if the command was executed successfully, False otherwise.
+
+        Examples:
+
+        >>> from game import Game
+        >>> game = Game()
+        >>> game.setup("TestPlayer")
+        >>> Actions.search(game, ["search", "epee"], 1) # doctest: +NORMALIZE_WHITESPACE
+        <BLANKLINE>
+        Résultats pour 'epee' :
+            - objet sword : une épée au fil tranchant comme un rasoir (dans Castle)
+        <BLANKLINE>
+        True
+        >>> Actions.search(game, ["search", "licorne"], 1)
+        <BLANKLINE>
+        Aucun résultat pour 'licorne'.
+        <BLANKLINE>
+        False
+        """
+
+        word = list_of_words[1]
+        rooms, items, characters = game.search_index.search(word)
+        if not (rooms or items or characters) :
+            say(f"\nAucun résultat pour '{word}'.\n")
             return False
 
+        result_string = f"\nRésultats pour '{word}' :\n"
+        for room in rooms :
+            result_string += f"\t - lieu {room.name} : {room.description}\n"
+        for item, room_names, carried in items :
+            # An Item may lie in several rooms, and be carried by the player as well.
+            places = [f"dans {', '.join(room_names)}"] if room_names else []
+            if carried :
+                places.append("dans votre inventaire")
+            result_string += f"\t - objet {item.name} : {item.description} ({' et '.join(places)})\n"
+        for character in characters :
+            result_string += f"\t - personnage {character.name} : {character.description} (dans {character.current_room.name})\n"
+        say(result_string)
+        return True
+
     @staticmethod
     def quit(game, list_of_words, number_of_parameters):
         """
@@ -119,34 +259,28 @@ class Actions:
 
         >>> from game import Game
         >>> game = Game()
-        game.setup("TestPlayer")
+        >>> game.setup("TestPlayer")
         >>> Actions.quit(game, ["quit"], 0)
         <BLANKLINE>
         Merci TestPlayer d'avoir joué. Au revoir.
         <BLANKLINE>
         True
-         >>> Actions.quit(game, ["quit", "N"], 0)
+        >>> game.process_command('quit N')
         <BLANKLINE>
         La commande 'quit' ne prend pas de paramètre.
-        False
         <BLANKLINE>
-         >>> Actions.quit(game, ["quit", "N", "E"], 0)
+        False
+        >>> game.process_command('quit N E')
         <BLANKLINE>
         La commande 'quit' ne prend pas de paramètre.
         <BLANKLINE>
         False
         """
-        l = len(list_of_words)
-        # If the number of parameters is incorrect, print an error message and return False.
-        if l != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
-        
+
         # Set the finished attribute of the game object to True.
         player = game.player
         msg = f"\nMerci {player.name} d'avoir joué. Au revoir.\n"
-        print(msg)
+        say(msg)
         game.finished = True
         return True
 
@@ -167,43 +301,47 @@ class Actions:
 
         >>> from game import Game
         >>> game = Game()
-       >>> game.setup("TestPlayer")
+        >>> game.setup("TestPlayer")
         >>> Actions.help(game, ["help"], 0) # doctest: +NORMALIZE_WHITESPACE
         <BLANKLINE>
         Voici les commandes disponibles:
             - help : afficher cette aide
             - quit : quitter le jeu
-            - go <direction> : se déplacer dans une direction cardinale (N, E, S, O)
+            - go<N|E|S|O|U|D> : se déplacer dans une direction cardinale
+            - goto <lieu> : se rendre dans un lieu par le plus court chemin
+            - search <mot> : chercher un mot dans les lieux, les objets et les personnages
             - quests : afficher la liste des quêtes
             - quest <titre> : afficher les détails d'une quête
             - activate <titre> : activer une quête
             - rewards : afficher vos récompenses
+            - history : afficher le parcours du joueur
+            - look : afficher la liste des items et des personnages présents dans cette pièce
+            - back : revenir dans la dernière pièce visitée
+            - take <objet>|all [poids max] : prendre un Item présent dans la pièce où se situe le joueur, ou tous
+            - drop <objet>|all : déposer un Item de l'inventaire dans la pièce actuelle, ou tous
+            - check : afficher la liste des items présents dans l'inventaire du joueur
+            - talk <personnage> : parler à un personnage présent dans la pièce
+            - charge : mémoriser la pièce actuelle si le beamer est présent dans l'inventaire
+            - use <objet> : utiliser un objet présent dans votre inventaire
         <BLANKLINE>
         True
-        >>> Actions.help(game, ["help", "N"], 0)
+        >>> game.process_command('help N')
         <BLANKLINE>
         La commande 'help' ne prend pas de paramètre.
         <BLANKLINE>
         False
-         >>> Actions.help(game, ["help", "N", "E"], 0)
+        >>> game.process_command('help N E')
         <BLANKLINE>
         La commande 'help' ne prend pas de paramètre.
         <BLANKLINE>
         False
         """
 
-        # If the number of parameters is incorrect, print an error message and return False.
-        l = len(list_of_words)
-        if l != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
-        
         # Print the list of available commands.
-        print("\nVoici les commandes disponibles:")
+        say("\nVoici les commandes disponibles:")
         for command in game.commands.values():
-            print("\t- " + str(command))
-        print()
+            say("\t- " + str(command))
+        say()
         return True
     
     @staticmethod
@@ -227,28 +365,25 @@ class Actions:
         >>> Actions.quests(game, ["quests"], 0)
         <BLANKLINE>
         📋 Liste des quêtes:
-          ❓ Grand Explorateur (Non activée)
-          ❓ Grand Voyageur (Non activée)
-          ❓ Découvreur de Secrets (Non activée)
+          ❓ Prévenir le peuple (Non activée)
+          🔒 La requête du souverain (Verrouillée)
+          🔒 Le tour du pays (Verrouillée)
+          🔒 L'habit fait le chevalier (Verrouillée)
+        <BLANKLINE>
+        Veuillez les réaliser dans l'ordre.
         <BLANKLINE>
         True
-        >>> Actions.quests(game, ["quests", "param"], 0)
+        >>> game.process_command('quests param')
         <BLANKLINE>
         La commande 'quests' ne prend pas de paramètre.
         <BLANKLINE>
         False
 
         """
-        # If the number of parameters is incorrect, print an error message and return False.
-        n = len(list_of_words)
-        if n != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
 
         # Show all quests
         game.player.quest_manager.show_quests()
-        print("Veuillez les réaliser dans l'ordre.\n")
+        say("Veuillez les réaliser dans l'ordre.\n")
         return True
 
 
@@ -270,41 +405,42 @@ class Actions:
         >>> from game import Game
         >>> game = Game()
         >>> game.setup("TestPlayer")
-        >>> Actions.quest(game, ["quest", "Grand", "Voyageur"], 1)
+        >>> Actions.quest(game, ["quest", "Prévenir", "le", "peuple"], 1)
         <BLANKLINE>
-        📋 Quête: Grand Voyageur
-        📖 Déplacez-vous 10 fois entre les lieux.
+        📋 Quête: Prévenir le peuple
+        📖 Aller voir chaque membre du royaume pour les prévenir du danger : un dragon qui se serait établi dans les environs et qui est connu pour sa violence.
         <BLANKLINE>
         Objectifs:
-          ⬜ Se déplacer 10 fois (Progression: 0/10)
+          ⬜ Parler avec Timmy
+          ⬜ Parler avec Shopkeeper
+          ⬜ Parler avec Dad
+          ⬜ Parler avec Witch
+          ⬜ Parler avec Troubadour
         <BLANKLINE>
-        🎁 Récompense: Bottes de voyageur
+        🎁 Récompense: Un paquet de bonbons
         <BLANKLINE>
         True
-        >>> Actions.quest(game, ["quest"], 1)
+        >>> game.process_command('quest')
         <BLANKLINE>
         La commande 'quest' prend 1 seul paramètre.
         <BLANKLINE>
         False
 
         """
-        # If the number of parameters is incorrect, print an error message and return False.
-        n = len(list_of_words)
-        if n < number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
-            return False
-
         # Get the quest title from the list of words (join all words after command)
         quest_title = " ".join(list_of_words[1:])
 
-        # Prepare current counter values to show progress
-        current_counts = {
-            "Se déplacer": game.player.move_count
-        }
+        # The title may be typed without its capital letters or accents
+        match, suggestions = game.name_index.find(game.name_index.quests, quest_title)
+        if match is None:
+            say(f"\nQuête '{quest_title}' non trouvée.\n{did_you_mean(suggestions)}")
+            return False
+
+        # The current counter values, to show progress
+        current_counts = game.player.quest_manager.counters
 
         # Show quest details
-        game.player.quest_manager.show_quest_details(quest_title, current_counts)
+        game.player.quest_manager.show_quest_details(match, current_counts)
         return True
 
 
@@ -326,38 +462,43 @@ class Actions:
         >>> from game import Game
         >>> game = Game()
         >>> game.setup("TestPlayer")
-        >>> Actions.activate(game, ["activate", "Grand", "Voyageur"], 1) # doctest: +ELLIPSIS
+        >>> Actions.activate(game, ["activate", "La", "requête", "du", "souverain"], 1)
+        <BLANKLINE>
+        La quête 'La requête du souverain' n'est pas encore disponible. Terminez d'abord : Prévenir le peuple.
+        <BLANKLINE>
+        False
+        >>> Actions.activate(game, ["activate", "Prévenir", "le", "peuple"], 1)
         <BLANKLINE>
-        🗡️  Nouvelle quête activée: Grand Voyageur
-        📝 Déplacez-vous 10 fois entre les lieux.
+        🗡️  Nouvelle quête activée: Prévenir le peuple
+        📝 Aller voir chaque membre du royaume pour les prévenir du danger : un dragon qui se serait établi dans les environs et qui est connu pour sa violence.
         <BLANKLINE>
         True
-        >>> Actions.activate(game, ["activate"], 1)
+        >>> game.process_command('activate')
         <BLANKLINE>
         La commande 'activate' prend 1 seul paramètre.
         <BLANKLINE>
         False
 
         """
-        # If the number of parameters is incorrect, print an error message and return False.
-        n = len(list_of_words)
-        if n < number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
-            return False
-
         # Get the quest title from the list of words (join all words after command)
         quest_title = " ".join(list_of_words[1:])
 
-        # Try to activate the quest
-        if game.player.quest_manager.activate_quest(quest_title):
+        # Try to activate the quest, whose title may be typed without its capital letters or accents
+        match, suggestions = game.name_index.find(game.name_index.quests, quest_title)
+        manager = game.player.quest_manager
+        if match is not None and manager.activate_quest(match):
             return True
 
+        # The quest exists but its prerequisites are not all completed.
+        quest = manager.get_quest_by_title(match) if match is not None else None
+        if quest is not None and not manager.is_unlocked(quest):
+            say(f"\nLa quête '{match}' n'est pas encore disponible. "
+                f"Terminez d'abord : {', '.join(manager.get_missing_prerequisites(quest))}.\n")
+            return False
+
         msg1 = f"\nImpossible d'activer la quête '{quest_title}'. "
         msg2 = "Vérifiez le nom ou si elle n'est pas déjà active.\n"
-        print(msg1 + msg2)
-        # print(f"\nImpossible d'activer la quête '{quest_title}'. \
-        #             Vérifiez le nom ou si elle n'est pas déjà active.\n")
+        say(msg1 + msg2 + did_you_mean(suggestions))
         return False
 
 
@@ -384,18 +525,12 @@ class Actions:
         🎁 Aucune récompense obtenue pour le moment.
         <BLANKLINE>
         True
-        >>> Actions.rewards(game, ["rewards", "param"], 0)
+        >>> game.process_command('rewards param')
         <BLANKLINE>
         La commande 'rewards' ne prend pas de paramètre.
         <BLANKLINE>
         False
         """
-        # If the number of parameters is incorrect, print an error message and return False.
-        n = len(list_of_words)
-        if n != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
 
         # Show all rewards
         game.player.show_rewards()
@@ -434,31 +569,25 @@ class Actions:
         >>> Actions.history(game, ["history"], 0) # doctest: +NORMALIZE_WHITESPACE
         <BLANKLINE>
         Votre parcours est le suivant : 
-            - dans la partie sud du village
+            - dans la partie sud du village.
         <BLANKLINE>
         True
-        >>> Actions.history(game, ["history", "N"], 0)
+        >>> game.process_command('history N')
         <BLANKLINE>
         La commande 'history' ne prend pas de paramètre.
         <BLANKLINE>
         False
-         >>> Actions.history(game, ["history", "N", "E"], 0)
+        >>> game.process_command('history N E')
         <BLANKLINE>
         La commande 'history' ne prend pas de paramètre.
         <BLANKLINE>
         False
         """
-    
+
         player = game.player
-        # If the number of parameters is incorrect, print an error message and return False.
-        l = len(list_of_words)
-        if l != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
 
         # Print the history of the player.
-        print(player.get_history())
+        say(player.get_history())
         return True
 
     @staticmethod
@@ -477,7 +606,7 @@ class Actions:
         <BLANKLINE>
         Vous êtes dans la partie nord du village.
         <BLANKLINE>
-        Sorties: N, S, E, O
+        Sorties: N, E, S, O
         <BLANKLINE>
         True
         >>> Actions.back(game, ["back"], 0) # doctest: +NORMALIZE_WHITESPACE
@@ -487,12 +616,12 @@ class Actions:
         Sorties: N, E, S, O
         <BLANKLINE>
         True
-        >>> Actions.back(game, ["back", "N"], 0)
+        >>> game.process_command('back N')
         <BLANKLINE>
         La commande 'back' ne prend pas de paramètre.
         <BLANKLINE>
         False
-         >>> Actions.back(game, ["back", "N", "E"], 0)
+        >>> game.process_command('back N E')
         <BLANKLINE>
         La commande 'back' ne prend pas de paramètre.
         <BLANKLINE>
@@ -500,16 +629,9 @@ class Actions:
         """
 
         player = game.player
-        # If the number of parameters is incorrect, print an error message and return False.
-        l = len(list_of_words)
-        if l != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
 
         # Move the player to the previous room.
-        player.move_back()
-        return True
+        return player.move_back()
 
     @staticmethod
     def look(game, list_of_words, number_of_parameters):
@@ -529,7 +651,7 @@ class Actions:
         >>> from game import Game
         >>> game = Game()
         >>> game.setup("TestPlayer")
-        >>> Actions.look(game, ["look"], 0)
+        >>> Actions.look(game, ["look"], 0) # doctest: +NORMALIZE_WHITESPACE
         <BLANKLINE>
         Vous êtes dans la partie sud du village.
         <BLANKLINE>
@@ -539,41 +661,37 @@ class Actions:
             - money : une pièce d'argent (0 kg)
         <BLANKLINE>
         True
-        >>> Actions.look(game, ["look", "N"], 0)
+        >>> game.process_command('look N')
         <BLANKLINE>
         La commande 'look' ne prend pas de paramètre.
         <BLANKLINE>
         False
-        >>> Actions.look(game, ["look", "N", "E"], 0)
+        >>> game.process_command('look N E')
         <BLANKLINE>
         La commande 'look' ne prend pas de paramètre.
         <BLANKLINE>
         False
 
         """
-        
+
         player = game.player
-        # If the number of parameters is incorrect, print an error message and return False.
-        l = len(list_of_words)
-        if l != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
 
         # If the room is dark, print the corresponding message and return False.
         if player.current_room.is_dark :
-            print("\nCette pièce est beaucoup trop sombre pour y voir quoi que ce soit !\n")
+            say("\nCette pièce est beaucoup trop sombre pour y voir quoi que ce soit !\n")
             return False 
 
         # Print the description and the list of items in the current room.
-        print(f"{player.current_room.get_long_description()} {player.current_room.get_inventory()}")
+        publish(RoomLooked(player.current_room))
         return True
 
     @staticmethod
     def take(game, list_of_words, number_of_parameters):
         """
         Take an Item from the current room and place it in the player's inventory. 
-        The parameter must be the name of an Item that is present in the current room.
+        The parameter must be the name of an Item that is present in the current room, or 'all' to take
+        all the Items of the room, followed by a maximal weight to take only the lighter ones. The lightest
+        Items are taken first, as long as they fit in the bag.
 
         Args:
             game (Game): The game object.
@@ -593,6 +711,7 @@ class Actions:
         Votre porte-monnaie a été incrémenté.
         <BLANKLINE>
         True
+        >>> game.player.current_room = game.world.get_room("Castle")
         >>> Actions.take(game, ["take", "sword"], 1)
         <BLANKLINE>
         Vous avez pris l'objet 'sword'.
@@ -600,73 +719,124 @@ class Actions:
         True
         >>> Actions.take(game, ["take", "shield"], 1)
         <BLANKLINE>
-        L'objet 'shield' ne rentre pas dans votre sac. Il n'y a plus de place.
+        Vous avez pris l'objet 'shield'.
         <BLANKLINE>
-        False
+        True
         >>> Actions.take(game, ["take", "pi"], 1)
         <BLANKLINE>
         Aucun objet nommé pi ne se trouve dans la pièce. Tapez look pour avoir la liste des objets disponibles dans cette pièce.
         <BLANKLINE>
         False
-        >>> Actions.take(game, ["take", "sword", "shield"], 1)
+        >>> game.process_command('take sword shield')
         <BLANKLINE>
         La commande 'take' prend 1 seul paramètre.
         <BLANKLINE>
         False
-        >>> Actions.take(game, ["take"], 1)
+        >>> game.process_command('take')
         <BLANKLINE>
         La commande 'take' prend 1 seul paramètre.
         <BLANKLINE>
         False
+        >>> game.player.current_room = game.world.get_room("Shop")
+        >>> game.process_command('take all 2')
+        <BLANKLINE>
+        Vous avez pris : potion.
+        <BLANKLINE>
+        True
 
         """
-        
+
         player = game.player
-        l = len(list_of_words)
-        # If the number of parameters is incorrect, print an error message and return False.
-        if l != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
-            return False
 
         # If the room is dark, print the corresponding message and return False.
         if player.current_room.is_dark :
-            print("\nLa pièce est plongée dans le noir, impossible d'attraper un objet dans ces conditions.\n")
+            say("\nLa pièce est plongée dans le noir, impossible d'attraper un objet dans ces conditions.\n")
             return False 
 
         # Get the item name from the list of words.
         item_name = list_of_words[1]
 
-        #Get the item from the current room.
-        item = player.current_room.inventory.get(item_name)
+        # Take all the Items, lighter than the weight given after 'all' if any.
+        if item_name.split()[0] == ALL_ITEMS :
+            return Actions._take_all(game, item_name.split()[1:])
+        # Only 'take all' can be followed by another word.
+        if " " in item_name :
+            say(MSG1.format(command_word=list_of_words[0]))
+            return False
+
+        #Get the item from the current room, the name may be typed without its capital letters or accents.
+        room_inventory = player.current_room.inventory
+        item = room_inventory.get(item_name)
+        if item is None :
+            match, suggestions = game.name_index.find(game.name_index.items, item_name, room_inventory)
+            if match is not None :
+                item_name, item = match, room_inventory[match]
 
         #Check if the requested item is present in the room.
         if item is None :
-            print(f"\nAucun objet nommé {item_name} ne se trouve dans la pièce. Tapez look pour avoir la liste des objets disponibles dans cette pièce.\n")
+            publish(ItemNotFound(item_name, False, suggestions))
             return False
         elif player.current_weight + item.weight > player.max_weight:
-            print(f"\nL'objet '{item_name}' ne rentre pas dans votre sac. Il n'y a plus de place.\n")
+            publish(ItemTooHeavy(item))
             return False
         else :
-            # if the item is 'money', it is not added to the inventory but the attribute 'money' of the player is incremented.
-            if item_name == "money":
-                player.money += 1
-                del player.current_room.inventory[item_name]
-                print(f"\nVotre porte-monnaie a été incrémenté.\n")
+            # A single unit is taken; the coins go to the purse of the player.
+            player.inventory.add(room_inventory.remove(item_name))
+            if item_name == MONEY:
+                publish(MoneyTaken(player.money))
                 return True
             else :
-                player.inventory[item_name] = item
-                player.current_weight += item.weight
-                del player.current_room.inventory[item_name]
-                print(f"\nVous avez pris l'objet '{item_name}'.\n")
+                publish(ItemTaken(item))
                 player.quest_manager.check_action_objectives("Prendre", item_name)
                 return True
 
+    # Take all the Items of the room weighing at most the weight given in words (if any), in one pass.
+    @staticmethod
+    def _take_all(game, words):
+        player = game.player
+        try :
+            if len(words) > 1 :
+                raise ValueError
+            limit = float(words[0]) if words else None
+        except ValueError :
+            say(f"\nUsage : take {ALL_ITEMS} [poids maximal].\n")
+            return False
+
+        room_inventory = player.current_room.inventory
+        # The lightest Items first, so that as many Items as possible fit in the bag.
+        candidates = sorted(((item, count) for item, count in room_inventory.stacks() if limit is None or item.weight <= limit),
+                            key=lambda stack: stack[0].weight)
+        if not candidates :
+            say("\nAucun objet à prendre ici.\n")
+            return False
+
+        taken, left, coins = [], [], 0
+        for item, count in candidates :
+            # The units of a stack that still fit in the bag are moved at once.
+            if item.weight > 0 :
+                count_taken = min(count, max(0, int((player.max_weight - player.current_weight) // item.weight)))
+            else :
+                count_taken = count
+            if count_taken :
+                player.inventory.add(room_inventory.remove(item.name, count_taken), count_taken)
+                if item.name == MONEY :
+                    coins += count_taken
+                else :
+                    taken.append((item, count_taken))
+            if count_taken < count :
+                left.append((item, count - count_taken))
+
+        publish(ItemsTaken(taken, coins, left))
+        # A single notification to the quests for all the Items taken.
+        player.quest_manager.check_batch_action_objectives("Prendre", [item.name for item, count in taken])
+        return bool(taken or coins)
+
     @staticmethod
     def drop(game, list_of_words, number_of_parameters):
         """
         Drop an Item from the player's inventory in the current room. 
-        The parameter must be the name of an Item that is present in player's inventory.
+        The parameter must be the name of an Item that is present in player's inventory, or 'all' to drop
+        all of them.
 
         Args:
             game (Game): The game object.
@@ -681,59 +851,89 @@ class Actions:
         >>> from game import Game
         >>> game = Game()
         >>> game.setup("TestPlayer")
-        >>> Actions.drop(game, ["drop", "money"], 1)
+        >>> Actions.drop(game, ["drop", "shield"], 1)
         <BLANKLINE>
-        Aucun objet nommé money ne se trouve dans votre inventaire. Tapez check pour avoir le détail de votre inventaire.
+        Aucun objet nommé shield ne se trouve dans votre inventaire. Tapez check pour avoir le détail de votre inventaire.
         <BLANKLINE>
         False
+        >>> game.player.current_room = game.world.get_room("Castle")
         >>> Actions.take(game, ["take", "sword"], 1)
         <BLANKLINE>
         Vous avez pris l'objet 'sword'.
         <BLANKLINE>
         True
-        >>> Actions.drop(game, ["drop", "sword"], 1)
+        >>> Actions.drop(game, ["drop", "swrd"], 1)
+        <BLANKLINE>
+        Aucun objet nommé swrd ne se trouve dans votre inventaire. Tapez check pour avoir le détail de votre inventaire.
+        Vouliez-vous dire : sword ?
+        <BLANKLINE>
+        False
+        >>> Actions.drop(game, ["drop", "Sword"], 1)
         <BLANKLINE>
         Vous avez déposé l'objet 'sword'.
         <BLANKLINE>
         True
-        >>> Actions.drop(game, ["drop", "sword", "shield"], 1)
+        >>> game.process_command('drop sword shield')
         <BLANKLINE>
         La commande 'drop' prend 1 seul paramètre.
         <BLANKLINE>
         False
-        >>> Actions.drop(game, ["drop"], 1)
+        >>> game.process_command('drop')
         <BLANKLINE>
         La commande 'drop' prend 1 seul paramètre.
         <BLANKLINE>
         False
 
         """
-        
+
         player = game.player
-        l = len(list_of_words)
-        # If the number of parameters is incorrect, print an error message and return False.
-        if l != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
-            return False
 
         # Get the item name from the list of words.
         item_name = list_of_words[1]
 
-        # Get the item from the player's inventory.
-        item = player.inventory.get(item_name)
+        # Drop all the Items at once.
+        if item_name == ALL_ITEMS :
+            return Actions._drop_all(game)
+        if " " in item_name :
+            say(MSG1.format(command_word=list_of_words[0]))
+            return False
+
+        # Get the item from the player's inventory, the name may be typed without its capital letters or accents.
+        item_name, item, suggestions = Actions._find_carried(game, item_name)
 
         # Check if the requested item is present in the player's inventory.
         if item is None :
-            print(f"\nAucun objet nommé {item_name} ne se trouve dans votre inventaire. Tapez check pour avoir le détail de votre inventaire.\n")
+            publish(ItemNotFound(item_name, True, suggestions))
             return False
         else :
-            del player.inventory[item_name]
-            player.current_weight -= item.weight
-            player.current_room.inventory[item_name] = item
-            print(f"\nVous avez déposé l'objet '{item_name}'.\n")
+            player.current_room.inventory.add(player.inventory.remove(item_name))
+            publish(ItemDropped(item))
             return True
 
+    # Find an Item of the player's inventory from its typed name: return its name, the Item (None if it is
+    # not carried) and the names suggested instead. The coins stay in the purse.
+    @staticmethod
+    def _find_carried(game, item_name):
+        inventory = game.player.inventory
+        match, suggestions = game.name_index.find(game.name_index.items, item_name, inventory)
+        if match is None or match == MONEY :
+            return item_name, None, [name for name in suggestions if name != MONEY]
+        return match, inventory[match], []
+
+    # Drop all the Items of the inventory in the current room.
+    @staticmethod
+    def _drop_all(game):
+        player = game.player
+        # The coins stay in the purse.
+        stacks = [(item, count) for item, count in player.inventory.stacks() if item.name != MONEY]
+        if not stacks :
+            say("\nVotre inventaire est vide.\n")
+            return False
+        for item, count in stacks :
+            player.current_room.inventory.add(player.inventory.remove(item.name, count), count)
+        publish(ItemsDropped(stacks))
+        return True
+
     @staticmethod
     def check(game, list_of_words, number_of_parameters):
         """
@@ -752,21 +952,26 @@ class Actions:
         >>> from game import Game
         >>> game = Game()
         >>> game.setup("TestPlayer")
-        >>> Actions.check(game, ["check"], 0)
+        >>> Actions.check(game, ["check"], 0) # doctest: +NORMALIZE_WHITESPACE
+        <BLANKLINE>
+        Vous disposez des items suivants : 
+            - torch : une torche qui permet d'éclairer les lieux sombres (0 kg)
         <BLANKLINE>
-        Votre inventaire est vide.
+        Votre sac pèse 0 kg
         <BLANKLINE>
         Votre porte-monnaie contient 2 pièces.
         <BLANKLINE>
         True
+        >>> game.player.current_room = game.world.get_room("Castle")
         >>> Actions.take(game, ["take", "sword"], 1)
         <BLANKLINE>
         Vous avez pris l'objet 'sword'.
         <BLANKLINE>
         True
-        >>> Actions.check(game, ["check"], 0)
+        >>> Actions.check(game, ["check"], 0) # doctest: +NORMALIZE_WHITESPACE
         <BLANKLINE>
         Vous disposez des items suivants : 
+            - torch : une torche qui permet d'éclairer les lieux sombres (0 kg)
             - sword : une épée au fil tranchant comme un rasoir (2 kg)
         <BLANKLINE>
         Votre sac pèse 2 kg
@@ -774,27 +979,21 @@ class Actions:
         Votre porte-monnaie contient 2 pièces.
         <BLANKLINE>
         True
-        >>> Actions.check(game, ["check", "N"], 0)
+        >>> game.process_command('check N')
         <BLANKLINE>
         La commande 'check' ne prend pas de paramètre.
         <BLANKLINE>
         False
-        >>> Actions.check(game, ["check", "N", "E"], 0)
+        >>> game.process_command('check N E')
         <BLANKLINE>
         La commande 'check' ne prend pas de paramètre.
         <BLANKLINE>
         False
         """
         player = game.player
-        # If the number of parameters is incorrect, print an error message and return False.
-        l = len(list_of_words)
-        if l != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
 
         # Print the description and the list of items in the current room.
-        print(player.get_inventory())
+        publish(InventoryShown(player))
         return True
     
     @staticmethod
@@ -820,6 +1019,7 @@ class Actions:
         Vous ne possédez aucun beamer à charger.
         <BLANKLINE>
         False
+        >>> game.player.current_room = game.world.get_room("Bridge")
         >>> Actions.take(game, ["take", "beamer"], 1)
         <BLANKLINE>
         Vous avez pris l'objet 'beamer'.
@@ -830,33 +1030,27 @@ class Actions:
         Le beamer a été chargé. Tapez "use beamer" pour vous téléporter dans la pièce mémorisée.
         <BLANKLINE>
         True
-        >>> Actions.charge(game, ["charge", "beamer"], 0)
+        >>> game.process_command('charge beamer')
         <BLANKLINE>
         La commande 'charge' ne prend pas de paramètre.
         <BLANKLINE>
         False
-        >>> Actions.charge(game, ["charge", "N", "E"], 0)
+        >>> game.process_command('charge N E')
         <BLANKLINE>
         La commande 'charge' ne prend pas de paramètre.
         <BLANKLINE>
         False
 
         """
-        l = len(list_of_words)
-        # If the number of parameters is incorrect, print an error message and return False.
-        if l != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
-            return False
-        
+
         #Check if the beamer Item is present in the inventory.
         player = game.player
         if "beamer" not in player.inventory :
-            print("\nVous ne possédez aucun beamer à charger.\n")
+            say("\nVous ne possédez aucun beamer à charger.\n")
             return False
         else :
             player.beamer_room = player.current_room
-            print("\nLe beamer a été chargé. Tapez \"use beamer\" pour vous téléporter dans la pièce mémorisée.\n")
+            say("\nLe beamer a été chargé. Tapez \"use beamer\" pour vous téléporter dans la pièce mémorisée.\n")
             return True
     
     @staticmethod
@@ -878,6 +1072,7 @@ class Actions:
         >>> from game import Game
         >>> game = Game()
         >>> game.setup("TestPlayer")
+        >>> game.player.current_room = game.world.get_room("Bridge")
         >>> Actions.take(game, ["take", "beamer"], 1)
         <BLANKLINE>
         Vous avez pris l'objet 'beamer'.
@@ -893,6 +1088,13 @@ class Actions:
         Le beamer a été chargé. Tapez "use beamer" pour vous téléporter dans la pièce mémorisée.
         <BLANKLINE>
         True
+        >>> Actions.go(game, ["go", "N"], 1)
+        <BLANKLINE>
+        Vous êtes dans un champ de hautes herbes.
+        <BLANKLINE>
+        Sorties: N, O
+        <BLANKLINE>
+        True
         >>> Actions.use(game, ["use", "beamer"], 1)
         <BLANKLINE>
         Vous êtes sur un pont à l'aspect fragile.
@@ -908,6 +1110,13 @@ class Actions:
         Aucun objet nommé pi ne se trouve dans votre inventaire. Tapez check pour avoir le détail de votre inventaire.
         <BLANKLINE>
         False
+        >>> Actions.use(game, ["use", "trch"], 1)
+        <BLANKLINE>
+        Aucun objet nommé trch ne se trouve dans votre inventaire. Tapez check pour avoir le détail de votre inventaire.
+        Vouliez-vous dire : torch ?
+        <BLANKLINE>
+        False
+        >>> game.player.current_room = game.world.get_room("Castle")
         >>> Actions.take(game, ["take", "sword"], 1)
         <BLANKLINE>
         Vous avez pris l'objet 'sword'.
@@ -915,88 +1124,35 @@ class Actions:
         True
         >>> Actions.use(game, ["use", "sword"], 1)
         <BLANKLINE>
-        L'objet 'sword' n'est pas utilisable.
+        Vous ne pouvez pas utiliser la sword dans le royaume. Vous risquez de blesser quelqu'un attendez le bon moment.
         <BLANKLINE>
         False
-        >>> Actions.use(game, ["use", "sword", "shield"], 1)
+        >>> game.process_command('use sword shield')
         <BLANKLINE>
         La commande 'use' prend 1 seul paramètre.
         <BLANKLINE>
         False
-        >>> Actions.use(game, ["use"], 1)
+        >>> game.process_command('use')
         <BLANKLINE>
         La commande 'use' prend 1 seul paramètre.
         <BLANKLINE>
         False
 
         """
-        
-        player = game.player
-        l = len(list_of_words)
-        # If the number of parameters is incorrect, print an error message and return False.
-        if l != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
-            return False
 
         # Check if the given Item name is correct.
         item_name = list_of_words[1]
 
-        # Get the item from the player's inventory.
-        item = player.inventory.get(item_name)
+        # Get the item from the player's inventory, the name may be typed without its capital letters or accents.
+        item_name, item, suggestions = Actions._find_carried(game, item_name)
 
         # Check if the requested item is present in the player's inventory.
         if item is None :
-            print(f"\nAucun objet nommé {item_name} ne se trouve dans votre inventaire. Tapez check pour avoir le détail de votre inventaire.\n")
+            publish(ItemNotFound(item_name, True, suggestions))
             return False
 
-        #Check if the requested item has an use.
-        if item_name == "beamer" :
-            # Check if the beamer is charged.
-            if player.beamer_room == None :
-                print("\nVous n'avez pas chargé le beamer.\n")
-                return False  
-            player.teleport()
-            print("\nLe beamer a été utilisé et a disparu.\n")
-            return True
-
-        elif item_name == "magicmap" :
-            if player.current_room.is_dark :
-                print("\nVous ne pouvez pas lire votre magicmap dans le noir, il faudrait de quoi s'éclairer...\n") 
-                return False
-            else :
-                location_list = ""
-                for charac in game.characters.values() :
-                    location_list += charac.get_location()
-                print(location_list)
-                return True
-
-        elif item_name == "torch" :
-            room = game.player.current_room
-            if room.is_dark :
-                room.is_dark = False
-                print("\nVous avez allumé la torche.\n")
-                return True
-            else :
-                print("\nLa pièce est déjà illuminée.\n")
-                return False
-
-        elif item_name == "sword" :
-            if player.current_room.is_dark :
-                print("\nManier une épée est trop dangereux dans le noir vous risqueriez de vous blesser, il faudrait de quoi s'éclairer...\n") 
-                return False
-            room = game.player.current_room 
-            if room.name == "Cave" :
-                player.quest_manager.check_action_objectives("Utiliser", item_name)
-                print("\nVous avez abattu le dragon !!!\n")
-                return True
-            else : 
-                print("\nVous ne pouvez pas utiliser la sword dans le royaume. Vous risquez de blesser quelqu'un attendez le bon moment.\n")
-                return False
-
-        else :
-            print(f"\nL'objet '{item_name}' n'est pas utilisable.\n")
-            return False
+        # Check the conditions of use of the Item and run its behavior.
+        return use_item(game, item)
     
     @staticmethod
     def talk(game, list_of_words, number_of_parameters):
@@ -1017,6 +1173,7 @@ class Actions:
         >>> from game import Game
         >>> game = Game()
         >>> game.setup("TestPlayer")
+        >>> game.player.current_room = game.world.get_room("Castle")
         >>> Actions.talk(game, ["talk", "King"], 1)
         <BLANKLINE>
         Jeune aventurier, j'ai une mission pour toi.
@@ -1032,38 +1189,37 @@ class Actions:
         Aucun personnage nommé pi ne se trouve dans la pièce. Tapez look pour avoir la liste des personnages présents dans cette pièce.
         <BLANKLINE>
         False
-        >>> Actions.talk(game, ["talk", "Timmy", "Tommy"], 1)
+        >>> game.process_command('talk Timmy Tommy')
         <BLANKLINE>
         La commande 'talk' prend 1 seul paramètre.
         <BLANKLINE>
         False
-        >>> Actions.talk(game, ["talk"], 1)
+        >>> game.process_command('talk')
         <BLANKLINE>
         La commande 'talk' prend 1 seul paramètre.
         <BLANKLINE>
         False
 
         """
-        
+
         player = game.player
-        l = len(list_of_words)
-        # If the number of parameters is incorrect, print an error message and return False.
-        if l != number_of_parameters + 1:
-            command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
-            return False
 
         # Get the character name from the list of words.
         character_name = list_of_words[1]
 
-        # Find the NPC in the current room.
-        character = player.current_room.characters.get(character_name)
+        # Find the NPC in the current room, the name may be typed without its capital letters or accents.
+        characters = player.current_room.characters
+        character = characters.get(character_name)
+        if character is None :
+            match, suggestions = game.name_index.find(game.name_index.characters, character_name, characters)
+            if match is not None :
+                character = characters[match]
 
         #Check if the NPC is present in the room.
         if character is None :
-            print(f"\nAucun personnage nommé {character_name} ne se trouve dans la pièce. Tapez look pour avoir la liste des personnages présents dans cette pièce.\n")
+            publish(NpcNotFound(character_name, suggestions))
             return False
         else :
-            print(f"\n{character.get_msg()}\n")
+            publish(NpcSpoke(character, character.get_msg()))
             player.quest_manager.check_action_objectives("Parler", character.name)
             return True
@@ -0,0 +1,242 @@
+# Define the WorldReport class, the analysis of the map of a world.
+#
+# Usage: python analysis.py [worlds/default.json]
+
+import sys
+from array import array
+from collections import deque
+
+from graph import NO_EXIT
+
+
+class WorldReport:
+    """
+    This class holds the analysis of the map of a world, computed from the exits of its RoomGraph in
+    linear time: the rooms the player can reach from the start, the strongly connected components
+    (groups of rooms that can all be reached from each other), the dead ends, the one-way passages,
+    and the Items and NPCs that cannot be reached. The darkness is ignored: a dark room can be lit.
+
+    The rooms are referred to by their id in the graph.
+
+    Attributes:
+        start (int) : The id of the start room.
+        exits_version (int) : The exits version of the graph when the report was computed.
+        reachable (bytearray) : 1 for each room that can be reached from the start room, 0 otherwise.
+        returnable (bytearray) : 1 for each room from which the start room can be reached again, 0 otherwise.
+        components (array) : The number of the strongly connected component of each room.
+        component_count (int) : The number of strongly connected components.
+        dead_ends (list) : The ids of the reachable rooms that have no exit.
+        one_way (list) : The (source id, direction, target id) of the exits with no exit leading straight back.
+        traps (list) : The (source id, direction, target id) of the reachable exits after which the source can never be reached again.
+        unreachable_items (list) : The (item name, room id) of the Items placed in rooms that cannot be reached.
+        unreachable_characters (list) : The (NPC name, room id) of the NPCs placed in rooms that cannot be reached.
+
+    Methods:
+        __init__(self, start, exits_version) : The constructor.
+        is_reachable(self, room_id) : Return True if the room can be reached from the start room.
+        same_component(self, room_id, other_id) : Return True if each room can be reached from the other.
+        get_summary(self, rooms) : Return a string describing the report, with the names of the rooms.
+
+    Examples:
+
+    >>> from world import load_world
+    >>> world = load_world()
+    >>> report = world.analyze()
+    >>> report.is_reachable(world.get_room("Cave").id)
+    True
+    >>> [(world.rooms[s].name, d, world.rooms[t].name) for s, d, t in report.one_way]
+    [('Bridge', 'N', 'Field'), ('Lake', 'E', 'Bridge')]
+    >>> report.component_count, report.traps
+    (1, [])
+    """
+
+    __slots__ = ("start", "exits_version", "reachable", "returnable", "components", "component_count",
+                 "dead_ends", "one_way", "traps", "unreachable_items", "unreachable_characters")
+
+    # Define the constructor.
+    def __init__(self, start, exits_version):
+        self.start = start
+        self.exits_version = exits_version
+        self.reachable = bytearray()
+        self.returnable = bytearray()
+        self.components = array("i")
+        self.component_count = 0
+        self.dead_ends = []
+        self.one_way = []
+        self.traps = []
+        self.unreachable_items = []
+        self.unreachable_characters = []
+
+    # Define the is_reachable method.
+    def is_reachable(self, room_id):
+        return bool(self.reachable[room_id])
+
+    # Define the same_component method.
+    def same_component(self, room_id, other_id):
+        return self.components[room_id] == self.components[other_id]
+
+    # Define the get_summary method.
+    def get_summary(self, rooms):
+        unreachable = [rooms[room_id].name for room_id, flag in enumerate(self.reachable) if not flag]
+        no_return = [rooms[room_id].name for room_id, flag in enumerate(self.reachable) if flag and not self.returnable[room_id]]
+        lines = [f"\nAnalyse du monde depuis {rooms[self.start].name} :",
+                 f"\t- salles : {len(self.reachable)}, accessibles : {len(self.reachable) - len(unreachable)}",
+                 f"\t- composantes fortement connexes : {self.component_count}"]
+        sections = [("salles inaccessibles", unreachable),
+                    ("salles sans retour vers le départ", no_return),
+                    ("culs-de-sac", [rooms[room_id].name for room_id in self.dead_ends]),
+                    ("passages à sens unique", [f"{rooms[s].name} -{d}-> {rooms[t].name}" for s, d, t in self.one_way]),
+                    ("passages sans retour possible", [f"{rooms[s].name} -{d}-> {rooms[t].name}" for s, d, t in self.traps]),
+                    ("objets inaccessibles", [f"{name} ({rooms[room_id].name})" for name, room_id in self.unreachable_items]),
+                    ("personnages inaccessibles", [f"{name} ({rooms[room_id].name})" for name, room_id in self.unreachable_characters])]
+        for title, names in sections:
+            if names:
+                lines.append(f"\t- {title} ({len(names)}) : " + ", ".join(names[:20]) + (", ..." if len(names) > 20 else ""))
+        return "\n".join(lines) + "\n"
+
+
+def analyze_world(world):
+    """
+    Analyze the map of a world.
+
+    Only the rooms that cannot be reached are visited to find the Items and NPCs they contain, so that
+    the analysis of a world kept in a world store does not load the whole world.
+
+    Args:
+        world (World): The world to analyze.
+
+    Returns:
+        WorldReport: The report.
+    """
+    graph = world.graph
+    width = len(graph.directions)
+    targets = graph._targets
+    count = len(targets) // width if width else 0
+    report = WorldReport(world.start_room.id, graph.exits_version)
+
+    # The exits are read straight from the array, without building the neighbours of every room.
+    report.reachable = _flood(world.start_room.id, count, lambda room_id: targets[room_id * width:(room_id + 1) * width])
+    # The reverse edges are only needed here: they are kept in two flat arrays rather than in the reverse
+    # index of the graph, which would stay in memory for the whole game.
+    starts, sources = _reverse_edges(targets, width, count)
+    report.returnable = _flood(world.start_room.id, count, lambda room_id: sources[starts[room_id]:starts[room_id + 1]])
+    report.components, report.component_count = _strong_components(targets, width, count)
+
+    components = report.components
+    for room_id in range(count):
+        base = room_id * width
+        has_exit = False
+        for slot in range(width):
+            target_id = targets[base + slot]
+            if target_id == NO_EXIT:
+                continue
+            has_exit = True
+            if room_id not in targets[target_id * width:(target_id + 1) * width]:
+                report.one_way.append((room_id, graph.directions[slot], target_id))
+            if components[room_id] != components[target_id] and report.reachable[room_id]:
+                report.traps.append((room_id, graph.directions[slot], target_id))
+        if not has_exit and report.reachable[room_id]:
+            report.dead_ends.append(room_id)
+
+    for room_id in range(count):
+        if report.reachable[room_id]:
+            continue
+        room = world.rooms[room_id]
+        report.unreachable_items.extend((name, room_id) for name in (room._inventory or {}))
+        report.unreachable_characters.extend((name, room_id) for name in (room._characters or {}))
+    return report
+
+
+# Breadth-first search from a room, following the ids (or NO_EXIT) given by the step function; return the visited rooms as flags.
+def _flood(start, count, step):
+    seen = bytearray(count)
+    seen[start] = 1
+    queue = deque([start])
+    while queue:
+        for next_id in step(queue.popleft()):
+            if next_id != NO_EXIT and not seen[next_id]:
+                seen[next_id] = 1
+                queue.append(next_id)
+    return seen
+
+
+# Return the rooms leading to each room as two arrays: the ids of the rooms leading to the room with
+# id i are sources[starts[i]:starts[i + 1]].
+def _reverse_edges(targets, width, count):
+    starts = array("i", [0]) * (count + 1)
+    for target_id in targets:
+        if target_id != NO_EXIT:
+            starts[target_id + 1] += 1
+    for room_id in range(count):
+        starts[room_id + 1] += starts[room_id]
+    sources = array("i", [0]) * starts[count]
+    filled = array("i", starts[:count])
+    for index, target_id in enumerate(targets):
+        if target_id != NO_EXIT:
+            sources[filled[target_id]] = index // width
+            filled[target_id] += 1
+    return starts, sources
+
+
+# Tarjan's algorithm, with an explicit stack so that very large worlds do not hit the recursion limit.
+# Return the component number of every room and the number of components.
+def _strong_components(targets, width, count):
+    index = array("i", [-1]) * count
+    low = array("i", [0]) * count
+    components = array("i", [-1]) * count
+    on_stack = bytearray(count)
+    stack = []
+    counter = 0
+    component_count = 0
+    for root in range(count):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        # Each frame is a room and the next exit slot to look at.
+        work = [(root, 0)]
+        while work:
+            room_id, slot = work[-1]
+            base = room_id * width
+            while slot < width:
+                target_id = targets[base + slot]
+                slot += 1
+                if target_id == NO_EXIT:
+                    continue
+                if index[target_id] == -1:
+                    work[-1] = (room_id, slot)
+                    index[target_id] = low[target_id] = counter
+                    counter += 1
+                    stack.append(target_id)
+                    on_stack[target_id] = 1
+                    work.append((target_id, 0))
+                    break
+                if on_stack[target_id] and index[target_id] < low[room_id]:
+                    low[room_id] = index[target_id]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[room_id] < low[parent]:
+                        low[parent] = low[room_id]
+                if low[room_id] == index[room_id]:
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        components[member] = component_count
+                        if member == room_id:
+                            break
+                    component_count += 1
+    return components, component_count
+
+
+def main():
+    from world import DEFAULT_WORLD, load_world
+    world = load_world(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_WORLD)
+    print(world.analyze().get_summary(world.rooms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# Define the behaviors of the Items, run by the use command.
+#
+# The world pack declares, for each Item that can be used, the name of its behavior, the conditions to
+# check before (light, rooms) and its messages (see ItemUse in item.py). A behavior is a function
+# registered here under its name, called with the game, the Item and its ItemUse; it returns True if
+# the Item has been used. Using an Item costs one lookup in BEHAVIORS, whatever the number of behaviors.
+
+from output import say
+
+# The behaviors, by name.
+BEHAVIORS = {}
+
+
+def behavior(name):
+    """Register the decorated function as the behavior of the Items whose ItemUse names it."""
+    def register(function):
+        BEHAVIORS[name] = function
+        return function
+    return register
+
+
+def use_item(game, item):
+    """
+    Check the conditions of use of an Item of the inventory of the player, then run its behavior.
+
+    Args:
+        game (Game): The game object.
+        item (Item): The Item to use.
+
+    Returns:
+        bool: True if the Item has been used, False otherwise.
+    """
+    use = item.use
+    if use is None:
+        say(f"\nL'objet '{item.name}' n'est pas utilisable.\n")
+        return False
+    room = game.player.current_room
+    if use.dark_message is not None and room.is_dark:
+        say(f"\n{use.dark_message}\n")
+        return False
+    if use.rooms is not None and room.name not in use.rooms:
+        say(f"\n{use.room_message}\n")
+        return False
+    return BEHAVIORS[use.behavior](game, item, use)
+
+
+@behavior("teleport")
+def teleport(game, item, use):
+    """Teleport the player to the room memorized by the charge command; the Item disappears."""
+    player = game.player
+    if player.beamer_room is None:
+        say("\nVous n'avez pas chargé le beamer.\n")
+        return False
+    player.teleport(item.name)
+    say(f"\n{use.message}\n")
+    return True
+
+
+@behavior("locate")
+def locate(game, item, use):
+    """Print where each NPC is."""
+    say("".join(character.get_location() for character in game.characters.values()))
+    return True
+
+
+@behavior("light")
+def light(game, item, use):
+    """Light the room, if it is dark."""
+    room = game.player.current_room
+    if not room.is_dark:
+        say("\nLa pièce est déjà illuminée.\n")
+        return False
+    room.is_dark = False
+    say(f"\n{use.message}\n")
+    return True
+
+
+@behavior("objective")
+def objective(game, item, use):
+    """Complete the quest objectives about using the Item."""
+    game.player.quest_manager.check_action_objectives("Utiliser", item.name)
+    say(f"\n{use.message}\n")
+    return True
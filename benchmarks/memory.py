@@ -0,0 +1,79 @@
+# Description: memory benchmark of the game entities.
+#
+# Reports the number of bytes used per Room, Item and NPC, measured with tracemalloc.
+# Usage: python benchmarks/memory.py [-n COUNT]
+
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from graph import RoomGraph
+from room import Room
+from item import Item
+from character import Character
+
+DIRECTIONS = ("N", "E", "S", "O", "U", "D")
+MESSAGES = ("Bonjour, aventurier !", "Il fait beau aujourd'hui.")
+
+
+def measure(build, count):
+    """Return the number of bytes allocated per entity by build(count), keeping the result alive."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    entities = build(count)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del entities
+    return allocated / count
+
+
+def build_rooms_graph(count):
+    """Rooms of a corridor stored in a RoomGraph, each with two exits and nothing inside."""
+    graph = RoomGraph(DIRECTIONS)
+    rooms = [Room(f"Room{i}", "dans une salle du donjon.", False) for i in range(count)]
+    for room in rooms:
+        graph.add_room(room)
+    for i in range(1, count):
+        rooms[i - 1].exits = {"E": rooms[i]}
+        rooms[i].exits = {"O": rooms[i - 1]}
+    return graph
+
+
+def build_rooms_dict(count):
+    """The same corridor with the six directions stored in a dict per room, as in the original game."""
+    rooms = [Room(f"Room{i}", "dans une salle du donjon.", False) for i in range(count)]
+    for i, room in enumerate(rooms):
+        room.exits = {d: None for d in DIRECTIONS}
+        room.exits["E"] = rooms[i + 1] if i + 1 < count else None
+        room.exits["O"] = rooms[i - 1] if i > 0 else None
+    return rooms
+
+
+def build_items(count):
+    return [Item(f"item{i}", "un objet sans grande valeur", 1) for i in range(count)]
+
+
+def build_npcs(count):
+    room = Room("Hall", "dans un grand hall", False)
+    return [Character(f"Npc{i}", "un villageois", room, MESSAGES) for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure de la mémoire utilisée par entité.")
+    parser.add_argument("-n", "--count", type=int, default=100_000, help="nombre d'entités à créer")
+    args = parser.parse_args()
+
+    print(f"{'entité':<32} {'octets/entité':>14}")
+    for label, build in (("room (RoomGraph, 2 sorties)", build_rooms_graph),
+                         ("room (dict de 6 directions)", build_rooms_dict),
+                         ("item", build_items),
+                         ("npc", build_npcs)):
+        print(f"{label:<32} {measure(build, args.count):>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# Description: world-scale benchmark.
+#
+# Generates worlds of growing size and reports the setup time (of which the analysis of the map)
+# and the latency of the main commands (go, look, take, drop, talk) and of the quest checks.
+# Usage: python benchmarks/world_scale.py [--sizes 100 1000 10000] [--repeat 200] [--seed 0]
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from game import Game
+from item import Item
+from output import capture
+from analysis import analyze_world
+from world import build_world, compile_world, load_world
+from worldgen import generate_pack
+
+
+def timed(function, repeat):
+    """Return the median duration of function() in microseconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1e6
+
+
+def bench_commands(game, rng, repeat):
+    """Return the median latency (µs) of each command, in a game that has been set up."""
+    player = game.player
+    start_room = player.current_room
+    probe = Item("sonde", "un objet de mesure", 0)
+    npc = next(iter(game.characters.values()), None)
+    results = {}
+
+    def go():
+        # Dark rooms cannot be left: put the player back at the start before the next move.
+        if player.current_room.is_dark:
+            player.current_room = start_room
+        directions = player.current_room.graph.get_exit_directions(player.current_room.id)
+        game.process_command("go " + rng.choice(directions))
+    results["go"] = timed(go, repeat)
+
+    player.current_room = start_room
+    results["look"] = timed(lambda: game.process_command("look"), repeat)
+
+    def take():
+        player.current_room.inventory["sonde"] = probe
+        game.process_command("take sonde")
+    results["take"] = timed(take, repeat)
+
+    def drop():
+        player.inventory["sonde"] = probe
+        game.process_command("drop sonde")
+        del player.current_room.inventory["sonde"]
+    results["drop"] = timed(drop, repeat)
+
+    if npc is not None:
+        npc.current_room.characters.pop(npc.name, None)
+        npc.current_room = start_room
+        start_room.characters[npc.name] = npc
+        results["talk"] = timed(lambda: game.process_command(f"talk {npc.name}"), repeat)
+
+    manager = player.quest_manager
+    for quest in manager.quests:
+        manager.activate_quest(quest.title)
+    results["quêtes"] = timed(lambda: manager.check_room_objectives(start_room.name), repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temps de chargement et latence des commandes selon la taille du monde.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000], help="nombres de salles")
+    parser.add_argument("--repeat", type=int, default=200, help="nombre de mesures par commande")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    columns = ["salles", "build ms", "analyse ms", "snapshot ms", "go µs", "look µs", "take µs", "drop µs", "talk µs", "quêtes µs"]
+    print(" ".join(f"{column:>12}" for column in columns))
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            pack = generate_pack(rooms=size, items=size // 2, npcs=max(1, size // 100), quests=max(1, size // 1000),
+                                 seed=args.seed)
+
+            start = time.perf_counter()
+            built = build_world(pack)
+            build_ms = (time.perf_counter() - start) * 1e3
+            start = time.perf_counter()
+            analyze_world(built)
+            analysis_ms = (time.perf_counter() - start) * 1e3
+
+            path = Path(tmp) / f"world{size}.json"
+            path.write_text(json.dumps(pack, ensure_ascii=False), encoding="utf-8")
+            compile_world(path)
+            start = time.perf_counter()
+            world = load_world(path)
+            snapshot_ms = (time.perf_counter() - start) * 1e3
+
+            game = Game()
+            # Headless: the events of the game are not even formatted.
+            with capture(formatted=False):
+                game.setup("Bench", world=world)
+                results = bench_commands(game, random.Random(args.seed), args.repeat)
+
+            row = [size, build_ms, analysis_ms, snapshot_ms] + [results.get(c) for c in ("go", "look", "take", "drop", "talk", "quêtes")]
+            print(" ".join(f"{value:>12.1f}" if isinstance(value, float) else f"{value!s:>12}" for value in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import random 
+import sys
 
 # Define the Character class.
 
@@ -10,13 +11,13 @@ class Character():
         name (str): The name of the NPC.
         description (str) : The description of the NPC.
         current_room (Room) : The room where the character is currently located.
-        msgs(list) : The list of messages to print when the player interacts with the NPC.
+        msgs(tuple) : The messages to print when the player interacts with the NPC. The tuple is immutable and can be shared between NPCs.
         
 
     Methods:
         __init__(self, name) : The constructor.
         move(self) : Move the character to an adjacent room with a one in two chance. If the randomly chosen room is the cave, cancel the movement.
-        get_msg(self) : Return the message in first position in the msgs attribute, remove it and add it at the end of the msgs attribute.
+        get_msg(self) : Return the next message of the msgs attribute, cycling through them in order.
         get_location(self) : Return the description of the current_room attribute. 
 
     Examples:
@@ -34,19 +35,22 @@ class Character():
 
     """
 
+    __slots__ = ("name", "description", "current_room", "msgs", "_msg_index")
+
     # Define the constructor.
     def __init__(self, name, description,current_room, msgs):
-        self.name = name
+        self.name = sys.intern(name)
         self.description = description
         self.current_room = current_room
-        self.msgs = msgs
+        self.msgs = tuple(msgs)
+        self._msg_index = 0
 
     def __str__(self):
         return f"{self.name} : {self.description}"
 
     # Define the move method
     def move(self):
-        l = [x for x in self.current_room.exits.values() if x != None]
+        l = self.current_room.get_neighbours()
         r = random.choice([0, 1])
         if r == 0 :
             next_room = random.choice(l)
@@ -64,10 +68,9 @@ class Character():
 
     #Define the get_msg method
     def get_msg(self):
-        #Get the first message in line
-        message = self.msgs.pop(0)
-        #Add it back in last position
-        self.msgs.append(message)
+        #Get the message in line, then move on to the next one (back to the first after the last)
+        message = self.msgs[self._msg_index]
+        self._msg_index = (self._msg_index + 1) % len(self.msgs)
         return message
 
     def get_location(self):
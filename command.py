@@ -3,15 +3,20 @@
 class Command:
     """
     This class represents a command. A command is composed of a command word, a help string, an action and a number of parameters.
+    It can also be typed with other words (aliases), take all the remaining words as its last parameter
+    (a quest title, for instance), or expect a direction, whose words are then replaced by the direction itself.
 
     Attributes:
         command_word (str): The command word.
         help_string (str): The help string.
         action (function): The action to execute when the command is called.
         number_of_parameters (int): The number of parameters expected by the command.
+        aliases (tuple): The other words that can be used instead of the command word.
+        variadic (bool): True if the last parameter is made of all the remaining words.
+        parameter_type (str): What the parameter names: "direction", "item" (in the room), "inventory", "character" or "quest", None otherwise.
 
     Methods:
-        __init__(self, command_word, help_string, action, number_of_parameters) : The constructor.
+        __init__(self, command_word, help_string, action, number_of_parameters, aliases, variadic, parameter_type) : The constructor.
         __str__(self) : The string representation of the command.
 
     Examples:
@@ -30,11 +35,14 @@ class Command:
     """
 
     # The constructor.
-    def __init__(self, command_word, help_string, action, number_of_parameters):
+    def __init__(self, command_word, help_string, action, number_of_parameters, aliases=(), variadic=False, parameter_type=None):
         self.command_word = command_word
         self.help_string = help_string
         self.action = action
         self.number_of_parameters = number_of_parameters
+        self.aliases = tuple(aliases)
+        self.variadic = variadic
+        self.parameter_type = parameter_type
     
     # The string representation of the command.
     def __str__(self):
@@ -0,0 +1,224 @@
+# Define the PrefixTrie and Completer classes, which complete the commands typed in the GUI.
+
+from grammar import COMMAND_SEPARATOR
+from item import MONEY
+from observed import MISSING
+
+# The number of completions given at most for a word.
+MAX_COMPLETIONS = 20
+
+
+class _Node:
+    """A node of a PrefixTrie: its children by letter, the word ending here (None if none) and the number of words below."""
+
+    __slots__ = ("children", "word", "count")
+
+    # Define the constructor.
+    def __init__(self):
+        self.children = {}
+        self.word = None
+        self.count = 0
+
+
+class PrefixTrie:
+    """
+    This class is a prefix tree of words, compared without capital letters. The words starting with a
+    prefix are found by following the letters of the prefix, whatever the number of words.
+
+    Methods:
+        __init__(self, words=()) : The constructor.
+        add(self, word) : Add a word.
+        remove(self, word) : Remove a word, if present.
+        complete(self, prefix, limit=MAX_COMPLETIONS) : Return the words starting with a prefix, in alphabetical order.
+
+    Examples:
+
+    >>> trie = PrefixTrie(["take", "talk", "quest", "quests"])
+    >>> trie.complete("ta")
+    ['take', 'talk']
+    >>> trie.remove("talk")
+    >>> trie.complete("TA"), trie.complete("quest"), trie.complete("x")
+    (['take'], ['quest', 'quests'], [])
+    """
+
+    __slots__ = ("_root",)
+
+    # Define the constructor.
+    def __init__(self, words=()):
+        self._root = _Node()
+        for word in words:
+            self.add(word)
+
+    # Define the add method.
+    def add(self, word):
+        path = [self._root]
+        for letter in word.casefold():
+            path.append(path[-1].children.get(letter) or _Node())
+        if path[-1].word is not None:
+            return
+        path[-1].word = word
+        for parent, (letter, node) in zip(path, zip(word.casefold(), path[1:])):
+            parent.children[letter] = node
+        for node in path:
+            node.count += 1
+
+    # Define the remove method.
+    def remove(self, word):
+        path = [self._root]
+        for letter in word.casefold():
+            node = path[-1].children.get(letter)
+            if node is None:
+                return
+            path.append(node)
+        if path[-1].word is None:
+            return
+        path[-1].word = None
+        for node in path:
+            node.count -= 1
+        # Prune the branch that no longer leads to any word.
+        for parent, letter, node in zip(path, word.casefold(), path[1:]):
+            if node.count == 0:
+                del parent.children[letter]
+                break
+
+    # Define the complete method.
+    def complete(self, prefix, limit=MAX_COMPLETIONS):
+        node = self._root
+        for letter in prefix.casefold():
+            node = node.children.get(letter)
+            if node is None:
+                return []
+        # Depth-first search, the letters in alphabetical order, stopped after limit words.
+        words = []
+        stack = [node]
+        while stack and len(words) < limit:
+            node = stack.pop()
+            if node.word is not None:
+                words.append(node.word)
+            stack.extend(node.children[letter] for letter in sorted(node.children, reverse=True))
+        return words
+
+
+class Completer:
+    """
+    This class completes the word being typed in a command line: the command word, or the parameter of
+    the command, among the names valid where the player is. The Command gives the names to use by its
+    parameter_type: the directions ("direction"), the Items of the room ("item"), the Items of the
+    inventory ("inventory"), the NPCs present ("character") or the titles of the quests ("quest").
+
+    The names of the room are kept in tries updated as the Items and NPCs enter or leave it, and loaded
+    again once the player has moved, rather than at each completion; the inventory trie follows the
+    changes of the inventory.
+
+    Attributes:
+        game (Game) : The game whose commands are completed.
+        verbs (PrefixTrie) : The words that can start a command.
+        directions (PrefixTrie) : The words of the directions.
+        quests (PrefixTrie) : The titles of the quests.
+        inventory (PrefixTrie) : The names of the Items of the inventory.
+        items (PrefixTrie) : The names of the Items of the room of the player.
+        characters (PrefixTrie) : The names of the NPCs of the room of the player.
+
+    Methods:
+        __init__(self, game) : The constructor.
+        complete(self, line) : Return where the word being completed starts in the line, and its completions.
+        contents_changed(self, room, attribute, key, old, new) : Follow the Items and NPCs of the room of the player.
+        room_added(self, room) : Nothing to do, the names of a room are loaded when the player enters it.
+        inventory_changed(self, key, old, new) : Follow the Items of the inventory.
+
+    Examples:
+
+    >>> from game import Game
+    >>> game = Game()
+    >>> game.setup("Sam")
+    >>> completer = Completer(game)
+    >>> completer.complete("ac")
+    (0, ['activate'])
+    >>> completer.complete("go ; go n")
+    (8, ['N', 'North'])
+    >>> completer.complete("activate le t")
+    (9, ['Le tour du pays'])
+    >>> game.player.current_room = game.world.get_room("Castle")
+    >>> completer.complete("take s")
+    (5, ['shield', 'sword'])
+    >>> game.process_command("take sword") and completer.complete("drop ")
+    <BLANKLINE>
+    Vous avez pris l'objet 'sword'.
+    <BLANKLINE>
+    (5, ['sword', 'torch'])
+    >>> completer.complete("take s")
+    (5, ['shield'])
+    """
+
+    # Define the constructor.
+    def __init__(self, game):
+        self.game = game
+        self.verbs = PrefixTrie(game.grammar.verbs)
+        self.directions = PrefixTrie(game.grammar.directions)
+        self.quests = PrefixTrie(quest.title for quest in game.player.quest_manager.quests)
+        # The coins are in the purse, they cannot be dropped nor used.
+        self.inventory = PrefixTrie(name for name in game.player.inventory if name != MONEY)
+        self.items = PrefixTrie()
+        self.characters = PrefixTrie()
+        self._room = None
+        self._tries = {"direction": self.directions, "item": self.items, "inventory": self.inventory,
+                       "character": self.characters, "quest": self.quests}
+        game.world.graph.observers.append(self)
+        game.player.observers.append(self)
+
+    # Define the complete method.
+    def complete(self, line):
+        # Only the last command of the line is completed.
+        offset = line.rfind(COMMAND_SEPARATOR) + 1
+        segment = line[offset:]
+        words = segment.split()
+        if not words or (len(words) == 1 and not segment[-1].isspace()):
+            start = offset + len(segment) - len(segment.lstrip())
+            return start, self.verbs.complete(line[start:])
+
+        command = self.game.grammar.verbs.get(words[0])
+        self._follow_room()
+        trie = self._tries.get(command.parameter_type) if command is not None else None
+        if trie is None:
+            return len(line), []
+        if command.variadic:
+            # The whole rest of the command is the parameter (a quest title may contain spaces).
+            verb_end = segment.index(words[0]) + len(words[0])
+            start = offset + verb_end + len(segment[verb_end:]) - len(segment[verb_end:].lstrip())
+        elif segment[-1].isspace():
+            start = len(line)
+        else:
+            start = len(line) - len(words[-1])
+        return start, trie.complete(line[start:])
+
+    # Load the names of the room of the player, if the player has moved since the last completion.
+    def _follow_room(self):
+        room = self.game.player.current_room
+        if room is self._room:
+            return
+        self._room = room
+        self.items = self._tries["item"] = PrefixTrie(room.inventory)
+        self.characters = self._tries["character"] = PrefixTrie(room.characters)
+
+    # Define the contents_changed method.
+    def contents_changed(self, room, attribute, key, old, new):
+        if room is not self._room:
+            return
+        trie = self.items if attribute == "inventory" else self.characters
+        if new is MISSING:
+            trie.remove(key)
+        elif old is MISSING:
+            trie.add(key)
+
+    # Define the room_added method.
+    def room_added(self, room):
+        pass
+
+    # Define the inventory_changed method.
+    def inventory_changed(self, key, old, new):
+        if key == MONEY:
+            return
+        if new is MISSING:
+            self.inventory.remove(key)
+        elif old is MISSING:
+            self.inventory.add(key)
@@ -0,0 +1,281 @@
+# Define the typed events that the game publishes on the output bus.
+#
+# Each event keeps the objects it is about and builds its text in format(), which is only called by the
+# sinks that need the text (see output.py). The text is the one the game used to print.
+
+from fuzzy import did_you_mean
+from output import Event
+
+
+def _stacks(stacks):
+    """Return the names of (Item, number of units) pairs, with the number of units when there are several."""
+    return ", ".join(f"{item.name} x{count}" if count > 1 else item.name for item, count in stacks)
+
+
+class RoomEntered(Event):
+    """The player entered a room (by moving, going back or teleporting)."""
+
+    __slots__ = ("room",)
+
+    # Define the constructor.
+    def __init__(self, room):
+        self.room = room
+
+    # Define the format method.
+    def format(self):
+        return self.room.get_long_description() + "\n"
+
+
+class RoomLooked(Event):
+    """The player looked at the room and its Items."""
+
+    __slots__ = ("room",)
+
+    # Define the constructor.
+    def __init__(self, room):
+        self.room = room
+
+    # Define the format method.
+    def format(self):
+        return f"{self.room.get_long_description()} {self.room.get_inventory()}\n"
+
+
+class ItemTaken(Event):
+    """The player took an Item from the room."""
+
+    __slots__ = ("item",)
+
+    # Define the constructor.
+    def __init__(self, item):
+        self.item = item
+
+    # Define the format method.
+    def format(self):
+        return f"\nVous avez pris l'objet '{self.item.name}'.\n\n"
+
+
+class MoneyTaken(Event):
+    """The player took a coin from the room; money is the content of the purse afterwards."""
+
+    __slots__ = ("money",)
+
+    # Define the constructor.
+    def __init__(self, money):
+        self.money = money
+
+    # Define the format method.
+    def format(self):
+        return "\nVotre porte-monnaie a été incrémenté.\n\n"
+
+
+class ItemDropped(Event):
+    """The player dropped an Item in the room."""
+
+    __slots__ = ("item",)
+
+    # Define the constructor.
+    def __init__(self, item):
+        self.item = item
+
+    # Define the format method.
+    def format(self):
+        return f"\nVous avez déposé l'objet '{self.item.name}'.\n\n"
+
+
+class ItemsTaken(Event):
+    """
+    The player took all the Items of the room at once: the Items taken and the Items left because too
+    heavy, as (Item, number of units) pairs, and the coins.
+    """
+
+    __slots__ = ("items", "coins", "left")
+
+    # Define the constructor.
+    def __init__(self, items, coins, left):
+        self.items = items
+        self.coins = coins
+        self.left = left
+
+    # Define the format method.
+    def format(self):
+        lines = []
+        if self.items:
+            lines.append(f"Vous avez pris : {_stacks(self.items)}.")
+        if self.coins:
+            lines.append(f"Votre porte-monnaie a été incrémenté de {self.coins} pièce{'s' if self.coins > 1 else ''}.")
+        if self.left:
+            lines.append(f"Trop lourd pour votre sac : {_stacks(self.left)}.")
+        return "\n" + "\n".join(lines) + "\n\n"
+
+
+class ItemsDropped(Event):
+    """The player dropped all the Items of the inventory at once, as (Item, number of units) pairs."""
+
+    __slots__ = ("items",)
+
+    # Define the constructor.
+    def __init__(self, items):
+        self.items = items
+
+    # Define the format method.
+    def format(self):
+        return f"\nVous avez déposé : {_stacks(self.items)}.\n\n"
+
+
+class ItemNotFound(Event):
+    """
+    No Item has the name given by the player, in the room or, if carried is True, in the inventory;
+    suggestions are the close names of the Items that are there.
+    """
+
+    __slots__ = ("name", "carried", "suggestions")
+
+    # Define the constructor.
+    def __init__(self, name, carried, suggestions=()):
+        self.name = name
+        self.carried = carried
+        self.suggestions = suggestions
+
+    # Define the format method.
+    def format(self):
+        if self.carried:
+            return (f"\nAucun objet nommé {self.name} ne se trouve dans votre inventaire. "
+                    f"Tapez check pour avoir le détail de votre inventaire.\n{did_you_mean(self.suggestions)}\n")
+        return (f"\nAucun objet nommé {self.name} ne se trouve dans la pièce. "
+                f"Tapez look pour avoir la liste des objets disponibles dans cette pièce.\n{did_you_mean(self.suggestions)}\n")
+
+
+class ItemTooHeavy(Event):
+    """The Item the player wants to take does not fit in the bag."""
+
+    __slots__ = ("item",)
+
+    # Define the constructor.
+    def __init__(self, item):
+        self.item = item
+
+    # Define the format method.
+    def format(self):
+        return f"\nL'objet '{self.item.name}' ne rentre pas dans votre sac. Il n'y a plus de place.\n\n"
+
+
+class InventoryShown(Event):
+    """The player checked the inventory."""
+
+    __slots__ = ("player",)
+
+    # Define the constructor.
+    def __init__(self, player):
+        self.player = player
+
+    # Define the format method.
+    def format(self):
+        return self.player.get_inventory() + "\n"
+
+
+class NpcSpoke(Event):
+    """An NPC answered the player."""
+
+    __slots__ = ("character", "message")
+
+    # Define the constructor.
+    def __init__(self, character, message):
+        self.character = character
+        self.message = message
+
+    # Define the format method.
+    def format(self):
+        return f"\n{self.message}\n\n"
+
+
+class NpcNotFound(Event):
+    """No NPC of the room has the name given by the player; suggestions are the close names of the NPCs present."""
+
+    __slots__ = ("name", "suggestions")
+
+    # Define the constructor.
+    def __init__(self, name, suggestions=()):
+        self.name = name
+        self.suggestions = suggestions
+
+    # Define the format method.
+    def format(self):
+        return (f"\nAucun personnage nommé {self.name} ne se trouve dans la pièce. "
+                f"Tapez look pour avoir la liste des personnages présents dans cette pièce.\n{did_you_mean(self.suggestions)}\n")
+
+
+class QuestActivated(Event):
+    """A quest has been activated."""
+
+    __slots__ = ("quest",)
+
+    # Define the constructor.
+    def __init__(self, quest):
+        self.quest = quest
+
+    # Define the format method.
+    def format(self):
+        return f"\n🗡️  Nouvelle quête activée: {self.quest.title}\n📝 {self.quest.description}\n\n"
+
+
+class ObjectiveCompleted(Event):
+    """An objective of a quest has been completed."""
+
+    __slots__ = ("quest", "objective")
+
+    # Define the constructor.
+    def __init__(self, quest, objective):
+        self.quest = quest
+        self.objective = objective
+
+    # Define the format method.
+    def format(self):
+        return f"✅ Objectif accompli: {self.objective}\n\n"
+
+
+class QuestCompleted(Event):
+    """A quest has been completed; its reward, if any, is announced with it."""
+
+    __slots__ = ("quest",)
+
+    # Define the constructor.
+    def __init__(self, quest):
+        self.quest = quest
+
+    # Define the format method.
+    def format(self):
+        text = f"\n🏆 Quête terminée: {self.quest.title}\n"
+        if self.quest.reward:
+            text += f"🎁 Récompense: {self.quest.reward}\n"
+        return text
+
+
+class RewardObtained(Event):
+    """The player obtained a new reward."""
+
+    __slots__ = ("reward",)
+
+    # Define the constructor.
+    def __init__(self, reward):
+        self.reward = reward
+
+    # Define the format method.
+    def format(self):
+        return f"\n🎁 Vous avez obtenu: {self.reward}\n\n"
+
+
+class QuestList(Event):
+    """The player asked for the list of the quests; manager is the QuestManager of the player, which knows their status."""
+
+    __slots__ = ("manager",)
+
+    # Define the constructor.
+    def __init__(self, manager):
+        self.manager = manager
+
+    # Define the format method.
+    def format(self):
+        manager = self.manager
+        if not manager.quests:
+            return "\nAucune quête disponible.\n\n"
+        return "\n📋 Liste des quêtes:\n" + "".join(f"  {manager.get_status(quest)}\n" for quest in manager.quests) + "\n"
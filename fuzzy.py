@@ -0,0 +1,193 @@
+# Define the BKTree and NameIndex classes, which find the names close to a misspelt one.
+
+from observed import MISSING
+from search import normalize
+
+# The number of suggestions given for a misspelt name.
+MAX_SUGGESTIONS = 3
+
+
+def distance(text, other):
+    """
+    Return the edit distance (Levenshtein) between two texts: the number of letters to insert, remove
+    or replace to turn one into the other.
+
+    >>> distance("sword", "swrod"), distance("talk", "take")
+    (2, 2)
+    """
+    previous = list(range(len(other) + 1))
+    for i, letter in enumerate(text, 1):
+        current = [i]
+        for j, other_letter in enumerate(other, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (letter != other_letter)))
+        previous = current
+    return previous[-1]
+
+
+def max_distance(text):
+    """Return the edit distance under which a name is taken for a misspelling of a text: longer texts allow more typos."""
+    return max(1, min(3, len(text) // 4))
+
+
+def did_you_mean(suggestions):
+    """Return the line suggesting names to the player, or an empty string if there is none."""
+    if not suggestions:
+        return ""
+    return f"Vouliez-vous dire : {', '.join(suggestions)} ?\n"
+
+
+class BKTree:
+    """
+    This class is a BK-tree of names: the names are compared without capital letters and accents, and
+    each name is stored under the first one it was compared to, at their edit distance. Finding the
+    names close to a text only visits the branches whose distance can lead to them, rather than every name.
+
+    Names can be added but not removed: the names that are no longer valid are filtered out by the caller.
+
+    Methods:
+        __init__(self, names=()) : The constructor.
+        add(self, name) : Add a name.
+        search(self, text, limit=None) : Return the names within an edit distance of a text, the closest first.
+
+    Examples:
+
+    >>> tree = BKTree(["sword", "shield", "torch", "Épée"])
+    >>> tree.search("swrd")
+    ['sword']
+    >>> tree.search("epee")
+    ['Épée']
+    >>> tree.search("dragon")
+    []
+    """
+
+    __slots__ = ("_root", "_children", "_names")
+
+    # Define the constructor.
+    def __init__(self, names=()):
+        self._root = None
+        # The branches of each normalized name, by distance, and the names sharing each normalized name.
+        self._children = {}
+        self._names = {}
+        for name in names:
+            self.add(name)
+
+    # Define the add method.
+    def add(self, name):
+        key = normalize(name)
+        names = self._names.get(key)
+        if names is not None:
+            if name not in names:
+                names.append(name)
+            return
+        self._names[key] = [name]
+        self._children[key] = {}
+        if self._root is None:
+            self._root = key
+            return
+        node = self._root
+        while True:
+            children = self._children[node]
+            gap = distance(key, node)
+            if gap not in children:
+                children[gap] = key
+                return
+            node = children[gap]
+
+    # Define the search method.
+    def search(self, text, limit=None):
+        if self._root is None:
+            return []
+        key = normalize(text)
+        if limit is None:
+            limit = max_distance(key)
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            gap = distance(key, node)
+            if gap <= limit:
+                found.extend((gap, name) for name in self._names[node])
+            # Only the branches between gap - limit and gap + limit can hold names within the limit (triangle inequality).
+            for branch, child in self._children[node].items():
+                if gap - limit <= branch <= gap + limit:
+                    stack.append(child)
+        found.sort()
+        return [name for gap, name in found]
+
+
+class NameIndex:
+    """
+    This class indexes the names of the Items, the NPCs and the quests of the game in BK-trees, to
+    recognize a name typed without its capital letters or accents and to suggest the names close to a
+    misspelt one.
+
+    The index observes the graph of the world: the names of the Items and NPCs entering a room are
+    added as they appear (with a world store, as the rooms are loaded). Since a name stays in its tree,
+    the names found are checked against the names valid where they are looked for.
+
+    Attributes:
+        items (BKTree) : The names of the Items.
+        characters (BKTree) : The names of the NPCs.
+        quests (BKTree) : The titles of the quests.
+
+    Methods:
+        __init__(self, world, player, quests) : The constructor.
+        find(self, tree, name, present=None) : Return the name matching a typed name and the names suggested instead.
+        room_added(self, room) : Index the names of the Items and NPCs of a room.
+        contents_changed(self, room, attribute, key, old, new) : Index the name of an Item or NPC entering a room.
+
+    Examples:
+
+    >>> from world import load_world
+    >>> from player import Player
+    >>> world = load_world()
+    >>> castle = world.get_room("Castle")
+    >>> index = NameIndex(world, Player("Sam"), world.quests)
+    >>> index.find(index.items, "Sword", castle.inventory)
+    ('sword', [])
+    >>> index.find(index.items, "swrd", castle.inventory)
+    (None, ['sword'])
+    >>> index.find(index.quests, "la requete du souverain")
+    ('La requête du souverain', [])
+    """
+
+    # Define the constructor.
+    def __init__(self, world, player, quests):
+        self.items = BKTree()
+        self.characters = BKTree()
+        self.quests = BKTree(quest.title for quest in quests)
+
+        rooms = world.store.resident() if world.store is not None else world.rooms
+        for room in rooms:
+            self.room_added(room)
+        for name in player.inventory:
+            self.items.add(name)
+        world.graph.observers.append(self)
+
+    # Define the find method.
+    def find(self, tree, name, present=None):
+        # present holds the names valid here (the Items of the room, the NPCs present...), None if they all are.
+        if present is not None and name in present:
+            return name, []
+        key = normalize(name)
+        suggestions = [found for found in tree.search(name) if present is None or found in present]
+        for found in suggestions:
+            if normalize(found) == key:
+                return found, []
+        return None, suggestions[:MAX_SUGGESTIONS]
+
+    # Define the room_added method.
+    def room_added(self, room):
+        for name in room._inventory or ():
+            self.items.add(name)
+        for name in room._characters or ():
+            self.characters.add(name)
+
+    # Define the contents_changed method.
+    def contents_changed(self, room, attribute, key, old, new):
+        if new is MISSING:
+            return
+        if attribute == "inventory":
+            self.items.add(key)
+        elif attribute == "characters":
+            self.characters.add(key)
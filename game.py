@@ -1,7 +1,9 @@
 # Description: Game class
 
 # Import modules
+from collections import namedtuple
 from pathlib import Path
+import os
 import sys
 
 # Tkinter imports for GUI
@@ -9,40 +11,78 @@ import tkinter as tk
 from tkinter import ttk, simpledialog
 
 
-from room import Room
 from player import Player
+import replay
 from command import Command
+from completion import Completer
+from fuzzy import NameIndex
+from grammar import Grammar
+import output
+from events import RoomEntered
+from output import Message, capture, publish, say
 from actions import Actions
-from item import Item
-from character import Character
-from quest import Quest
+from routing import Router
+from search import SearchIndex
+from world import DEFAULT_WORLD, load_world
+from worldstore import STORE_SUFFIX, WorldStore
 
 
 
+# The result of a command run by Game.run_script: the command, True if it was executed successfully,
+# the name of the room of the player afterwards, the typed events it published (see events.py) and the text it
+# produced (None when the script is run headless).
+CommandResult = namedtuple("CommandResult", ["command", "success", "room", "events", "text"])
+
+
 class Game:
  
-    """The Game class manages the overall game state and flow."""
+    """
+    The Game class manages the overall game state and flow.
+
+    Attributes :
+        finished (bool) : True once the game is over.
+        world (World) : The world of the game, or None before setup.
+        router (Router) : The shortest routes between the rooms, used by the command goto.
+        search_index (SearchIndex) : The index of the words of the rooms, Items and NPCs, used by the command search.
+        name_index (NameIndex) : The index of the names of the Items, NPCs and quests, used to correct the names typed by the player.
+        rooms (list) : The rooms of the world.
+        commands (dict) : The commands of the game, keyed by their command word.
+        grammar (Grammar) : The parser of the commands typed by the player.
+        player (Player) : The player.
+        exits (set) : The canonical names of the directions.
+        directions (dict) : The words standing for each direction.
+        characters (dict) : The NPCs of the world, keyed by name.
+    """
     
     
     # Constructor
     def __init__(self):
         self.finished = False
+        self.world = None
+        self.router = None
+        self.search_index = None
+        self.name_index = None
         self.rooms = []
         self.commands = {}
+        self.grammar = None
         self.player = None
         self.exits = {}
         self.directions = {}
         self.characters = {}
 
     # Setup the game
-    def setup(self, player_name=None):
-        """Initialize the game with rooms, commands, and quests."""
+    def setup(self, player_name=None, world_path=None, world=None):
+        """Initialize the game with commands and the world (rooms, Items, characters and quests).
+
+        The world is loaded from world_path (worlds/default.json by default), unless an already built World is given.
+        """
         self._setup_commands()
-        self._setup_rooms()
+        self._setup_world(world_path, world)
+        self.grammar = Grammar(self.commands, self.directions)
         self._setup_player(player_name)
         self._setup_quests()
-        self._setup_items()
-        self._setup_characters()
+        self.search_index = SearchIndex(self.world, self.player)
+        self.name_index = NameIndex(self.world, self.player, self.player.quest_manager.quests)
 
 
     def _setup_commands(self):
@@ -58,7 +98,16 @@ class Game:
         self.commands["go"] = Command("go"
                                       , "<N|E|S|O|U|D> : se déplacer dans une direction cardinale"
                                       , Actions.go
-                                      , 1)
+                                      , 1
+                                      , parameter_type="direction")
+        self.commands["goto"] = Command("goto"
+                                        , " <lieu> : se rendre dans un lieu par le plus court chemin"
+                                        , Actions.goto
+                                        , 1)
+        self.commands["search"] = Command("search"
+                                          , " <mot> : chercher un mot dans les lieux, les objets et les personnages"
+                                          , Actions.search
+                                          , 1)
         self.commands["quests"] = Command("quests"
                                           , " : afficher la liste des quêtes"
                                           , Actions.quests
@@ -66,11 +115,15 @@ class Game:
         self.commands["quest"] = Command("quest"
                                          , " <titre> : afficher les détails d'une quête"
                                          , Actions.quest
-                                         , 1)
+                                         , 1
+                                         , variadic=True
+                                         , parameter_type="quest")
         self.commands["activate"] = Command("activate"
                                             , " <titre> : activer une quête"
                                             , Actions.activate
-                                            , 1)
+                                            , 1
+                                            , variadic=True
+                                            , parameter_type="quest")
         self.commands["rewards"] = Command("rewards"
                                            , " : afficher vos récompenses"
                                            , Actions.rewards
@@ -87,13 +140,17 @@ class Game:
                                             , Actions.back
                                             , 0)
         self.commands["take"]     = Command("take"
-                                            , " <objet> : prendre un Item présent dans la pièce où se situe le joueur"
+                                            , " <objet>|all [poids max] : prendre un Item présent dans la pièce où se situe le joueur, ou tous"
                                             , Actions.take
-                                            , 1)
+                                            , 1
+                                            , variadic=True
+                                            , parameter_type="item")
         self.commands["drop"]     = Command("drop"
-                                           , " <objet> : déposer un Item de l'inventaire dans la pièce actuelle"
+                                           , " <objet>|all : déposer un Item de l'inventaire dans la pièce actuelle, ou tous"
                                            , Actions.drop
-                                           , 1)
+                                           , 1
+                                           , variadic=True
+                                           , parameter_type="inventory")
         self.commands["check"]     = Command("check"
                                             , " : afficher la liste des items présents dans l'inventaire du joueur"
                                             , Actions.check
@@ -101,7 +158,8 @@ class Game:
         self.commands["talk"]     = Command("talk"
                                            , " <personnage> : parler à un personnage présent dans la pièce"
                                            , Actions.talk
-                                           , 1)
+                                           , 1
+                                           , parameter_type="character")
         self.commands["charge"]     = Command("charge"
                                             , " : mémoriser la pièce actuelle si le beamer est présent dans l'inventaire"
                                             , Actions.charge
@@ -109,80 +167,27 @@ class Game:
         self.commands["use"]     = Command("use"
                                            , " <objet> : utiliser un objet présent dans votre inventaire"
                                            , Actions.use
-                                           , 1)                        
-
-    def _setup_rooms(self):
-        """Initialize all rooms and their exits."""
-        # Create rooms
-        s = "dans la partie nord du village."
-        villagenorth = Room("VillageNorth", s, False, image = "villagenorth.png")
-
-        s = "dans la partie sud du village."
-        villagesouth = Room("VillageSouth", s, False, image="villagesouth.png")
-
-        s = "à l'intérieur d'un château aux murs sombres."
-        castle = Room("Castle", s, False, image = "castle.png")
-
-        s = "dans un sous-terrain entièrement plongé dans l'obscurité"
-        undercastle = Room("UnderCastle", s, True, image = "undercastle.png")
-
-        s = "dans le hall d'une tour. Il y a des escaliers menant au sommet, et d'autres cachés dans un recoin."
-        tower = Room("Tower", s, False, image = "tower.png")
-
-        s = "dans une pièce minuscule au sommet de la tour."
-        toptower = Room("TopTower", s, False, image = "toptower.png")
-        
-        s = "dans une cave encombrée d'objets poussiérieux."
-        towercave = Room("BottomTower", s, True, image = "towercave.png")
-
-        s = "dans une grotte immense au sol inégal et dans laquelle vous entendez des bruits provenant du fond de celle-ci. Préparez vous à vous battre !!!"
-        cave = Room("Cave", s, True, image = "cave.png")
-
-        s = "dans une barque sur un lac."
-        lake = Room("Lake", s, False, image = "lake.png")
-
-        s = "dans une forêt enchantée. On y entend une brise légère à travers la cime des arbres."
-        forest = Room("Forest", s, False, image = "forest.png")
-
-        s = "dans des écuries bien entretenues, où quelques chevaux se reposent."
-        stable = Room("Stable", s, False, image = "stable.png")
-
-        s = "sur un pont à l'aspect fragile."
-        bridge = Room("Bridge", s, False, image = "bridge.png")
-
-        s = "dans un champ de hautes herbes."
-        field = Room("Field", s, False, image = "field.png")
-
-        s = "dans une boutique d'items tenue par un vieil homme."
-        shop = Room("Shop", s, False, image = "shop.png")
-
-        # Add rooms to game
-        for room in [villagenorth, villagesouth, forest, tower, toptower, towercave, cave, castle, undercastle, stable, bridge, lake, field, shop]:
-            self.rooms.append(room)
-
-        # Create exits
-        villagesouth.exits = {"N" : villagenorth, "E" : field, "S" : lake, "O" : stable, "U" : None, "D" : None}
-        villagenorth.exits = {"N" : forest, "E" : tower, "S" : villagesouth, "O" : shop, "U" : None, "D" : None}
-        castle.exits = {"N" : stable, "E" : lake, "S" : None, "O" : None, "U" : None, "D" : undercastle}
-        undercastle.exits = {"N" : towercave, "E" : None, "S" : None, "O" : None, "U" : castle, "D" : None}
-        tower.exits = {"N" : None, "E" : None, "S" : field, "O" : villagenorth, "U" : toptower, "D" : towercave}
-        toptower.exits = {"N" : None, "E" : None, "S" : None, "O" : None, "U" : None, "D" : tower}
-        towercave.exits = {"N" : None, "E" : None, "S" : undercastle, "O" : None, "U" : tower, "D" : None}
-        cave.exits = {"N" : None, "E" : forest, "S" : None, "O" : None, "U" : None, "D" : None}
-        lake.exits = {"N" : villagesouth, "E" : bridge, "S" : None, "O" : castle, "U" : None, "D" : None}
-        forest.exits = {"N" : None, "E" : None, "S" : villagenorth, "O" : cave, "U" : None, "D" : None}
-        stable.exits = {"N" : shop, "E" : villagesouth, "S" : castle, "O" : None, "U" : None, "D" : None}
-        bridge.exits = {"N" : field, "E" : None, "S" : None, "O" : None, "U" : None, "D" : None}
-        field.exits = {"N" : tower, "E" : None, "S" : None, "O" : villagesouth, "U" : None, "D" : None}
-        shop.exits = {"N" : None, "E" : villagenorth, "S" : stable, "O" : None, "U" : None, "D" : None}
+                                           , 1
+                                           , parameter_type="inventory")                        
+
+    def _setup_world(self, world_path=None, world=None):
+        """Load the rooms, Items, characters and quests from the world pack, or open the world store."""
+        if world is None:
+            world_path = Path(world_path or DEFAULT_WORLD)
+            if world_path.suffix == STORE_SUFFIX:
+                world = WorldStore(world_path).world
+            else:
+                world = load_world(world_path)
+        self.world = world
+        self.rooms = self.world.rooms
+        self.characters = self.world.characters
+        self.router = Router(self.world.graph, report=self.world.analyze())
 
         # Create set of directions
-        self.exits = {d for d in tower.exits.keys()}
+        self.exits = set(self.world.directions.keys())
 
         # Create dict object with compatible words for directions
-        self.directions = {'N' : ['N', 'North', 'NORTH', 'north', 'n'], 'S' : ['S', 'South', 'SOUTH', 'south', 's'], 'E' : ['E', 'East', 'EAST', 'east', 'e'], 'O' : ['O', 'Ouest', 'OUEST', 'ouest', 'o'], 'U' : ['U', 'Up', 'UP', 'up', 'u'], 'D' : ['D', 'Down', 'DOWN', 'down', 'd']} 
-
-
+        self.directions = self.world.directions
 
     def _setup_player(self, player_name=None):
         """Initialize the player."""
@@ -190,101 +195,17 @@ class Game:
             player_name = input("\nEntrez votre nom: ")
 
         self.player = Player(player_name)
-        self.player.current_room = self.rooms[1]  # villagesouth
-
-    def _setup_items(self):
-        """Initialize the Items and their locations"""
-        sword = Item("sword", "une épée au fil tranchant comme un rasoir", 2)
-        money = Item("money", "une pièce d'argent", 0)
-        potion = Item("potion", "une potion de soin", 2)
-        shield = Item("shield", "un bouclier pour se défendre", 3)
-        torch = Item("torch", "une torche qui permet d'éclairer les lieux sombres", 0)
-        ring = Item("ring", "une bague de valeur qui semble appartenir à quelqu'un d'important", 3)
-        key = Item("key", "uné clé qui ouvre des portes", 3)
-        beamer = Item("beamer", "un objet permettant de \"mémoriser\" une pièce et de s'y téléporter", 1)
-        magicmap = Item("magicmap", "une carte permettant de voir les localisations de tous les villageois", 1)
-        
-        #Setup item location
-        self.rooms[13].inventory["potion"] = potion     # shop
-        self.rooms[7].inventory["sword"] = sword        # castle
-        self.rooms[7].inventory["shield"] = shield      # castle
-        self.rooms[7].inventory["money"] = money        # castle
-        self.rooms[5].inventory["ring"] = ring          #towercave
-        self.rooms[1].inventory["money"] = money        # villagesouth
-        self.rooms[9].inventory["money"] = money        # stable
-        self.rooms[10].inventory["beamer"] = beamer     # bridge
-        self.rooms[8].inventory["magicmap"] = magicmap  #undercastle
+        self.player.current_room = self.world.start_room
 
         #Setup Player's inventory
-        self.player.inventory["torch"] = torch
-        
-    def _setup_characters(self):
-        """Initialize the Characters and their locations"""
-        king = Character("King", "le roi du pays, un guerrier exceptionnel qui a conquis de nombreux territoires", self.rooms[7], ["Jeune aventurier, j'ai une mission pour toi.", "Retrouve ma bague, et je te ferai don d'un objet qui te sera indispensable pour ta quête."]) 
-        self.rooms[7].characters["King"] = king     # castle
-        self.characters["King"] = king
-
-        timmy = Character("Timmy", "un enfant du village qui adore explorer et ne se trouve jamais longtemps au même endroit, au grand dam de ses parents", self.rooms[0], ["Moi j'ai pas peur des dragons ! Je peux aller où je veux !", "C'est parti pour l'aventure!", "J'ai envie de bonbons...", "Où est-ce que je peux aller?"])
-        self.rooms[0].characters["Timmy"] = timmy   # villagenorth
-        self.characters["Timmy"] = timmy
-
-        shopkeeper = Character("Shopkeeper", "le seul vendeur du royaume, demandez lui n'importe quoi ça vous sera utile", self.rooms[13], ["Quoi, un dragon qui rôde autour ? Ce n'est pas bon pour les affaires, ça...", "Bonjour, que puis-je faire pour vous ?", "Tu peux aussi récolter des items à travers le pays."])
-        self.rooms[13].characters["Shopkeeper"] = shopkeeper   # shop
-        self.characters["Shopkeeper"] = shopkeeper
-
-        dad = Character("Dad", "le botaniste du village, toujours à la recherche de nouvelles plantes ou des matériaux rares. Il est également le père de Timmy", self.rooms[12], ["Un dragon ?! Ce n'est pas vrai, Timmy est encore dehors ! Je dois vite le retrouver!", "Où est-ce qu'il a bien pu se fourrer, cette fois...", "Ces fleurs protègent du mal, selon les légendes."])
-        self.rooms[12].characters["Dad"] = dad          # field
-        self.characters["Dad"] = dad
-
-        witch = Character("Witch", "une sorcière ayant plus de 150 ans mais qui n'en fait pas plus de 40, sa magie est d'un niveau plutôt moyen contrairement à ce qu'elle prétend", self.rooms[4], ["Face à mes sorts, un dragon ne fait pas le poids ! Mais merci tout de même de m'avoir prévenue.", "Sauriez-vous s'il existe un abri bien protégé ? C'est pour un ami, bien sûr, je m'en sortirai très bien...", "Emp ots nacydobon enoon ! C'est mon sortilège favori."])
-        self.rooms[4].characters["Witch"] = witch       # toptower
-        self.characters["Witch"] = witch
-
-        troubadour = Character("Troubadour", "un musicien talentueux qui ne peut s'empêcher de chantonner et de rimer", self.rooms[0], ["🎶​ Une créature terrifiante serait dans le coin ? J'ai intérêt à fuir bien loin 🎶​", " 🎶​ Même les plus braves et les plus fous, prendraient leurs jambes à leur cou ! 🎶​"])
-        self.rooms[0].characters["Troubadour"] = troubadour     #villagenorth
-        self.characters["Troubadour"] = troubadour
-
-        dragon = Character("Dragon", "un dragon en rage est prêt à détruire le royaume", self.rooms[6], ["GRRRRRRRRRRRRRRRRRRRR 🔥 !!!"])
-        self.rooms[6].characters["Dragon"] = dragon     #cave
-        self.characters["Dragon"] = dragon
-
+        for item in self.world.player_inventory:
+            self.player.inventory.add(item)
 
     def _setup_quests(self):
-        """Initialize all quests."""
-        talking_quest = Quest(
-            title="Prévenir le peuple",
-            description="Aller voir chaque membre du royaume pour les prévenir du danger : un dragon qui se serait établi dans les environs et qui est connu pour sa violence.",
-            objectives=["Parler avec Timmy", "Parler avec Shopkeeper", "Parler avec Dad", "Parler avec Witch", "Parler avec Troubadour"],
-            reward="Un paquet de bonbons"
-        )
-
-        ring_quest = Quest(
-            title= "La requête du souverain",
-            description= "Parler au roi qui a besoin de votre aide. Le roi se trouve dans le château.",
-            objectives= ["Parler avec King", "Prendre ring"],
-            reward="Un talisman puissant permettant de résister aux flammes"
-        )
-
-        walking_quest = Quest(
-            title ="Le tour du pays",
-            description ="Parcourir le pays entier, et découvrir tous les lieux qui le composent.",
-            objectives = ["Visiter VillageNorth", "Visiter Castle", "Visiter UnderCastle", 
-                        "Visiter Tower", "Visiter TopTower", "Visiter BottomTower", "Visiter Lake", 
-                        "Visiter Forest", "Visiter Stable", "Visiter Bridge", "Visiter Field", "Visiter Shop"],
-            reward="Une paire de bottes confortables, parfaites pour de longues distances"
-        )
-
-        suit_up_quest = Quest(
-            title="L'habit fait le chevalier",
-            description="Récupérer le nécessaire pour aller vaincre le dragon",
-            objectives=["Prendre sword", "Prendre shield", "Aller à Cave", "Utiliser sword"],
-            reward="Une médaille d'honneur"
-        )
-
-        self.player.quest_manager.add_quest(talking_quest)
-        self.player.quest_manager.add_quest(ring_quest)
-        self.player.quest_manager.add_quest(walking_quest)
-        self.player.quest_manager.add_quest(suit_up_quest)
+        """Initialize all quests: the definitions of the world are shared, the player's progress is kept by the QuestManager."""
+        for quest in self.world.quests:
+            self.player.quest_manager.add_quest(quest)
+        self.player.quest_manager.set_victory(self.world.victory)
 
     # Play the game
     def play(self):
@@ -297,27 +218,73 @@ class Game:
             # Get the command from the player
             self.process_command(input("> "))
 
-    # Process the command entered by the player
-    def process_command(self, command_string) -> None:
-        """Process the command entered by the player."""
+    # Run commands without a player at the keyboard
+    def run_script(self, commands, text=True):
+        """Run the commands of an iterable one by one, and yield a CommandResult for each of them.
+
+        The commands are read lazily, so the iterable can be a file or a generator; the game must have been set up.
+        What the game says is kept in the results rather than written on the standard output. With text=False
+        the script runs headless: the events are kept but never formatted.
+        The script stops when the game is finished.
+
+        >>> game = Game()
+        >>> game.setup("Bot")
+        >>> result = next(game.run_script(["go N"]))
+        >>> result.success, result.room
+        (True, 'VillageNorth')
+        >>> "partie nord du village" in result.text
+        True
+        >>> [type(event).__name__ for event in result.events]
+        ['RoomEntered']
+        >>> next(game.run_script(["take torch"], text=False)).text is None
+        True
+        """
+        for command_string in commands:
+            with capture(text) as transcript:
+                success = self.process_command(command_string.rstrip("\n"))
+            events = tuple(event for event in transcript.events if not isinstance(event, Message))
+            yield CommandResult(command_string.rstrip("\n"), success, self.player.current_room.name,
+                                events, transcript.get_text() if text else None)
+            if self.finished:
+                return
 
-        # Split the command string into a list of words
-        list_of_words = command_string.split(" ")
-
-        command_word = list_of_words[0]
-
-        # command empty
-        if command_word == "":
-            print(">")
-        # If the command is not recognized, print an error message
-        elif command_word not in self.commands.keys():
-            print(f"\nCommande '{command_word}' non reconnue. Entrez 'help' pour voir la liste des commandes disponibles.\n")
-        # If the command is recognized, execute it
-        else:
-            command = self.commands[command_word]
-            command.action(self, list_of_words, command.number_of_parameters)
-            self.win()
-            self.loose()
+    # Process the command entered by the player
+    def process_command(self, command_string) -> bool:
+        """Process the command entered by the player.
+
+        Several commands can be separated by ';': they run in sequence, and the batch stops as soon as one of them
+        ends the game. Victory is checked once, after the batch. Defeat is checked after each command, because it
+        depends on where the player is (and this check is immediate), but the batch stops at the first defeat.
+
+        Return True if every command was recognized and executed successfully.
+        """
+
+        executed = False
+        success = True
+        # Parse the command string into the commands and their lists of words, checking their parameters
+        for command, list_of_words, error in self.grammar.parse_batch(command_string):
+            # command empty
+            if not list_of_words:
+                say(">")
+                success = False
+            # If the command is not recognized, or its parameters are incorrect, print the error message
+            elif error is not None:
+                say(error)
+                success = False
+            # If the command is recognized, execute it
+            else:
+                success = command.action(self, list_of_words, command.number_of_parameters) is not False and success
+                executed = True
+                if self.finished or self.loose():
+                    break
+
+        if executed:
+            if not self.finished:
+                self.win()
+            # Keep the rooms around the player and the NPCs loaded, and only them, when the world is in a store.
+            if self.world.store is not None:
+                self.world.store.update([self.player.current_room.id])
+        return success
 
     # Print the welcome message
     def print_welcome(self):
@@ -326,22 +293,21 @@ class Game:
         if not self.player or not self.player.name:
             return
 
-        print(f"\nBienvenue {self.player.name} dans ce jeu d'aventure médiéval !")
-        print("Le royaume est en danger et vous avez été élu pour en être le héros !")
-        print("Explorez, Discutez, pour découvrir tous les secrets de ce monde et ce pourquoi vous avez attéri ici.")
-        print("Bon courage !!!")
-        print("Entrez 'help' si vous avez besoin d'aide.")
+        say(f"\nBienvenue {self.player.name} dans ce jeu d'aventure médiéval !")
+        say("Le royaume est en danger et vous avez été élu pour en être le héros !")
+        say("Explorez, Discutez, pour découvrir tous les secrets de ce monde et ce pourquoi vous avez attéri ici.")
+        say("Bon courage !!!")
+        say("Entrez 'help' si vous avez besoin d'aide.")
         #
-        print(self.player.current_room.get_long_description())
+        publish(RoomEntered(self.player.current_room))
 
 
     def win(self):
-        quests = self.player.quest_manager.quests
-        for quest in quests :
-            if not quest.is_completed :
-                return False
-        print("\n🙌 🎊 Vous avez sauvé le royaume en éliminant la menace, le dragon est hors d'état de nuire.\n")
-        print(f"Votre mission s'arrête ici, merci {self.player.name} pour votre aide. Au revoir.\n")
+        # The victory is the last node of the graph of the quests, reached once the quests it follows are completed.
+        if not self.player.quest_manager.victory :
+            return False
+        say("\n🙌 🎊 Vous avez sauvé le royaume en éliminant la menace, le dragon est hors d'état de nuire.\n")
+        say(f"Votre mission s'arrête ici, merci {self.player.name} pour votre aide. Au revoir.\n")
         self.finished = True
         return True
 
@@ -350,8 +316,8 @@ class Game:
     def loose(self):
         # Condition de défaite
         if self.player.current_room.name == "Cave" and ("sword" not in self.player.inventory or "shield" not in self.player.inventory) :
-            print("\n💀 Vous vous êtes aventuré dans un lieu trop dangereux pour survivre sans équipement.\n")
-            print(f"Votre mission s'arrête ici, vos blessures vous ont emporté. Merci {self.player.name} pour votre dévouement.\n")
+            say("\n💀 Vous vous êtes aventuré dans un lieu trop dangereux pour survivre sans équipement.\n")
+            say(f"Votre mission s'arrête ici, vos blessures vous ont emporté. Merci {self.player.name} pour votre dévouement.\n")
             self.finished = True
             return True 
         return False
@@ -363,7 +329,7 @@ class Game:
 ##############################
 
 class _StdoutRedirector:
-    """Redirect sys.stdout writes into a Tkinter Text widget."""
+    """Redirect sys.stdout writes, and the events of the output bus, into a Tkinter Text widget."""
     def __init__(self, text_widget):
         self.text_widget = text_widget
 
@@ -378,6 +344,10 @@ class _StdoutRedirector:
     def flush(self):
         """Flush method required by sys.stdout interface (no-op for Text widget)."""
 
+    def handle(self, event):
+        """Write the text of an event of the output bus to the Text widget."""
+        self.write(event.format())
+
 class GameGUI(tk.Tk):
     """Tkinter GUI for the text-based adventure game.
 
@@ -404,13 +374,18 @@ class GameGUI(tk.Tk):
         if not name:
             name = "Joueur"
         self.game.setup(player_name=name)  # Pass name to avoid double prompt
+        # Completion of the command entry with the Tab key
+        self.completer = Completer(self.game)
 
         # Build UI layers
         self._build_layout()
 
-        # Redirect stdout so game prints appear in terminal output area
+        # Subscribe the terminal output area to the output bus instead of the standard output, and redirect
+        # stdout to it too so that the remaining prints appear there
         self.original_stdout = sys.stdout
         sys.stdout = _StdoutRedirector(self.text_output)
+        output.unsubscribe(output.STDOUT)
+        output.subscribe(sys.stdout)
 
         # Print welcome text in GUI
         self.game.print_welcome()
@@ -448,6 +423,7 @@ class GameGUI(tk.Tk):
 
         # Initialize image reference (will be loaded by _update_room_image)
         self._image_ref = None  # Keep reference to prevent garbage collection
+        self._image_room = None  # Room whose image is displayed
         # Initial image will be loaded after welcome message
 
         # L3R Buttons area (right)
@@ -523,6 +499,7 @@ class GameGUI(tk.Tk):
         self.entry = ttk.Entry(entry_frame, textvariable=self.entry_var)
         self.entry.grid(row=0, column=0, sticky="ew")
         self.entry.bind("<Return>", self._on_enter)
+        self.entry.bind("<Tab>", self._on_tab)
         self.entry.focus_set()
 
 
@@ -533,6 +510,10 @@ class GameGUI(tk.Tk):
             return
 
         room = self.game.player.current_room
+        # Nothing to redraw if the player is still in the same room
+        if room is self._image_room:
+            return
+        self._image_room = room
         assets_dir = Path(__file__).parent / 'assets'
 
         # Use room-specific image if available, otherwise fallback
@@ -572,11 +553,29 @@ class GameGUI(tk.Tk):
         self.entry_var.set("")
 
 
+    def _on_tab(self, _event=None):
+        """Complete the word being typed in the entry field, or list the possible completions."""
+        line = self.entry_var.get()
+        start, completions = self.completer.complete(line)
+        if len(completions) == 1:
+            self.entry_var.set(line[:start] + completions[0] + " ")
+        elif completions:
+            prefix = os.path.commonprefix(completions)
+            if len(prefix) > len(line) - start:
+                self.entry_var.set(line[:start] + prefix)
+            else:
+                say("  ".join(completions))
+        self.entry.icursor("end")
+        # Keep the focus in the entry field
+        return "break"
+
+
     def _send_command(self, command):
         if self.game.finished:
             return
         # Echo the command in output area
-        print(f"> {command}\n")
+        say(f"> {command}\n")
+        # The command may be a batch of commands separated by ';': the image is updated once, after the last one
         self.game.process_command(command)
         # Update room image after command (in case player moved)
         self._update_room_image()
@@ -587,7 +586,9 @@ class GameGUI(tk.Tk):
 
 
     def _on_close(self):
-        # Restore stdout and destroy window
+        # Restore stdout and the output bus, and destroy window
+        output.unsubscribe(sys.stdout)
+        output.subscribe(output.STDOUT)
         sys.stdout = self.original_stdout
         self.destroy()
 
@@ -596,10 +597,15 @@ def main():
     """Entry point.
 
     If '--cli' is passed as an argument, start the classic console version.
+    If '--script' is passed, followed by files of commands, replay them without any interface (see replay.py).
     Otherwise launch the Tkinter GUI.
     Fallback to CLI if GUI cannot be initialized (e.g., headless environment).
     """
     args = sys.argv[1:]
+    if '--script' in args:
+        args.remove('--script')
+        replay.main(args)
+        return
     if '--cli' in args:
         Game().play()
         return
@@ -608,7 +614,7 @@ def main():
         app.mainloop()
     except tk.TclError as e:
         # Fallback to CLI if GUI fails (e.g., no DISPLAY, Tkinter not available)
-        print(f"GUI indisponible ({e}). Passage en mode console.")
+        say(f"GUI indisponible ({e}). Passage en mode console.")
         Game().play()
 
 
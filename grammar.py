@@ -0,0 +1,91 @@
+# Define the Grammar class, which parses the commands typed by the player.
+
+from actions import MSG0, MSG1
+from fuzzy import MAX_SUGGESTIONS, BKTree, did_you_mean
+
+# Separator of the commands typed on the same line.
+COMMAND_SEPARATOR = ";"
+
+# Message printed when the first word is not a command.
+UNKNOWN_COMMAND = "\nCommande '{command_word}' non reconnue. Entrez 'help' pour voir la liste des commandes disponibles.\n"
+
+
+class Grammar:
+    """
+    This class turns a command line into the command to run and its parameters. It is compiled once from
+    the commands and the directions of the game into flat tables: every word that can start a command
+    (command words and aliases) gives its Command, and every word of a direction gives the direction.
+
+    Several commands can be typed on the same line, separated by ';'.
+    The words of a command line are separated by any number of spaces. The number of parameters is
+    checked here, so that the actions receive a list of words that is already valid: the command word,
+    then the parameters, the last one holding all the remaining words for a variadic command, and the
+    direction itself for a command that expects a direction.
+
+    Attributes:
+        verbs (dict) : The Command of each word that can start a command.
+        directions (dict) : The direction (N, E, S, O, U, D) of each word of a direction.
+        verb_tree (BKTree) : The words that can start a command, to suggest the closest ones to an unknown word.
+
+    Methods:
+        __init__(self, commands, directions) : The constructor.
+        parse(self, command_string) : Return the Command, the list of words for its action and an error message.
+        parse_batch(self, command_string) : Return the result of parse for each of the commands of a line.
+
+    Examples:
+
+    >>> from command import Command
+    >>> from actions import Actions
+    >>> grammar = Grammar({"go": Command("go", "", Actions.go, 1, parameter_type="direction")},
+    ...                   {"N": ["N", "nord"], "S": ["S", "sud"]})
+    >>> command, words, error = grammar.parse("  go   nord ")
+    >>> command.command_word, words, error
+    ('go', ['go', 'N'], None)
+    >>> grammar.parse("go")[2]
+    "\\nLa commande 'go' prend 1 seul paramètre.\\n"
+    >>> grammar.parse("")
+    (None, [], None)
+    >>> grammar.parse("gi N")[2]
+    "\\nCommande 'gi' non reconnue. Entrez 'help' pour voir la liste des commandes disponibles.\\nVouliez-vous dire : go ?\\n"
+    >>> [words for command, words, error in grammar.parse_batch("go N ; ; go sud")]
+    [['go', 'N'], ['go', 'S']]
+    """
+
+    # Define the constructor.
+    def __init__(self, commands, directions):
+        self.verbs = {}
+        for command in commands.values():
+            self.verbs[command.command_word] = command
+            for alias in command.aliases:
+                self.verbs[alias] = command
+        self.directions = {word: direction for direction, words in directions.items() for word in words}
+        self.verb_tree = BKTree(self.verbs)
+
+    # Define the parse method.
+    def parse(self, command_string):
+        words = command_string.split()
+        if not words:
+            return None, words, None
+
+        command = self.verbs.get(words[0])
+        if command is None:
+            suggestions = self.verb_tree.search(words[0])[:MAX_SUGGESTIONS]
+            return None, words, UNKNOWN_COMMAND.format(command_word=words[0]) + did_you_mean(suggestions)
+
+        count = command.number_of_parameters
+        parameters = words[1:]
+        if command.variadic and len(parameters) > count:
+            parameters[count - 1:] = [" ".join(parameters[count - 1:])]
+        if len(parameters) != count:
+            message = MSG0 if count == 0 else MSG1
+            return command, words, message.format(command_word=words[0])
+
+        if command.parameter_type == "direction":
+            parameters = [self.directions.get(word, word) for word in parameters]
+        return command, [command.command_word] + parameters, None
+
+    # Define the parse_batch method.
+    def parse_batch(self, command_string):
+        # The empty commands between two separators are skipped; a line with no command at all gives one empty command.
+        batch = [self.parse(part) for part in command_string.split(COMMAND_SEPARATOR)]
+        return [parsed for parsed in batch if parsed[1]] or batch[:1]
@@ -0,0 +1,268 @@
+# Define the RoomGraph class, an integer-indexed backend for the exits of the rooms.
+
+from array import array
+from collections.abc import MutableMapping
+
+# Value stored in the adjacency array when there is no exit in a direction.
+NO_EXIT = -1
+
+
+class RoomGraph:
+    """
+    This class stores the exits of a set of rooms in compact arrays. Each room receives a dense
+    integer id, and the exits of the room with id i are stored in the slots
+    [i * len(directions), (i + 1) * len(directions)) of a single array of ints, one slot per direction.
+    The tuple of the real neighbours of every room is computed once and kept until its exits change,
+    and the darkness of the rooms is mirrored in a byte array so that the graph can be walked without the rooms.
+    A reverse index gives, for every room, the rooms that lead into it and the first direction they use;
+    it is built in one pass the first time it is needed, then kept up to date by set_exit and set_exits.
+
+    Attributes:
+        directions (tuple) : The directions, in the order of the slots (e.g. N, E, S, O, U, D).
+        rooms (list) : The rooms of the graph. The id of a room is its index in this list.
+        version (int) : A counter incremented each time an exit, or the darkness of a room, changes.
+        exits_version (int) : A counter incremented each time an exit changes.
+        observers (list) : The objects told about the rooms added to the graph and about the changes of the Items
+            and characters of its rooms, through their room_added(room) and contents_changed(room, attribute, key, old, new)
+            methods. The observers belong to a game and are not pickled with the graph.
+
+    Methods:
+        __init__(self, directions) : The constructor.
+        add_room(self, room) : Give an id to the room, attach it to the graph and return the id.
+        get_exit(self, room_id, direction) : Return the room in the given direction, or None.
+        set_exit(self, room_id, direction, target) : Set (or remove, if target is None) an exit.
+        set_exits(self, room_id, exits) : Replace all the exits of a room with the ones of the exits dict.
+        get_neighbours(self, room_id) : Return the tuple of the ids of the rooms reachable in one move.
+        get_exit_directions(self, room_id) : Return the list of the directions that lead somewhere.
+        get_exit_slots(self, room_id) : Return the list of the (direction, target id) pairs of the exits of a room.
+        get_entrances(self, room_id) : Return the tuple of the ids of the rooms that have an exit leading to the room.
+        direction_to(self, room_id, target_id) : Return the direction leading from a room to another one, or None.
+        notify_room_added(self, room) : Tell the observers that a room was added (or loaded again from a world store).
+        notify_contents(self, room, attribute, key, old, new) : Tell the observers that the inventory or the characters of a room changed.
+        is_dark(self, room_id) : Return True if the room is dark.
+        set_dark(self, room_id, is_dark) : Record a change of the darkness of a room.
+
+    Examples:
+
+    >>> from room import Room
+    >>> graph = RoomGraph(("N", "E", "S", "O", "U", "D"))
+    >>> hall = Room("Hall", "dans un grand hall", False)
+    >>> kitchen = Room("Kitchen", "dans une cuisine", False)
+    >>> graph.add_room(hall), graph.add_room(kitchen)
+    (0, 1)
+    >>> hall.exits["N"] = kitchen
+    >>> graph.get_neighbours(hall.id)
+    (1,)
+    >>> hall.exits["S"] is None
+    True
+    >>> hall.get_exit_string()
+    'Sorties: N'
+    >>> graph.get_entrances(kitchen.id), graph.direction_to(hall.id, kitchen.id), graph.direction_to(kitchen.id, hall.id)
+    ((0,), 'N', None)
+    """
+
+    # Define the constructor.
+    def __init__(self, directions):
+        self.directions = tuple(directions)
+        self._slots = {direction: i for i, direction in enumerate(self.directions)}
+        self.rooms = []
+        self._targets = array("i")
+        self._neighbours = []
+        self._dark = bytearray()
+        self._incoming = None
+        self.version = 0
+        self.exits_version = 0
+        self.observers = []
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["observers"] = []
+        return state
+
+    # Define the add_room method.
+    def add_room(self, room):
+        room_id = len(self.rooms)
+        self.rooms.append(room)
+        self._targets.extend([NO_EXIT] * len(self.directions))
+        self._neighbours.append(None)
+        if self._incoming is not None:
+            self._incoming.append(None)
+        self._dark.append(bool(room.is_dark))
+        room.id = room_id
+        room.graph = self
+        self.notify_room_added(room)
+        return room_id
+
+    # Define the get_exit method.
+    def get_exit(self, room_id, direction):
+        slot = self._slots.get(direction)
+        if slot is None:
+            return None
+        target = self._targets[room_id * len(self.directions) + slot]
+        return None if target == NO_EXIT else self.rooms[target]
+
+    # Define the set_exit method.
+    def set_exit(self, room_id, direction, target):
+        if direction not in self._slots:
+            raise KeyError(direction)
+        if target is not None and target.graph is not self:
+            raise ValueError(f"La salle '{target.name}' n'appartient pas à ce graphe.")
+        self._write_slot(room_id, self._slots[direction], NO_EXIT if target is None else target.id)
+        self._refresh(room_id)
+
+    # Define the set_exits method.
+    def set_exits(self, room_id, exits):
+        for direction, target in exits.items():
+            if direction not in self._slots:
+                raise KeyError(direction)
+            if target is not None and target.graph is not self:
+                raise ValueError(f"La salle '{target.name}' n'appartient pas à ce graphe.")
+        for direction, slot in self._slots.items():
+            target = exits.get(direction)
+            self._write_slot(room_id, slot, NO_EXIT if target is None else target.id)
+        self._refresh(room_id)
+
+    # Define the get_neighbours method.
+    def get_neighbours(self, room_id):
+        neighbours = self._neighbours[room_id]
+        if neighbours is None:
+            base = room_id * len(self.directions)
+            neighbours = tuple(t for t in self._targets[base:base + len(self.directions)] if t != NO_EXIT)
+            self._neighbours[room_id] = neighbours
+        return neighbours
+
+    # Define the get_exit_directions method.
+    def get_exit_directions(self, room_id):
+        base = room_id * len(self.directions)
+        targets = self._targets
+        return [direction for i, direction in enumerate(self.directions) if targets[base + i] != NO_EXIT]
+
+    # Define the get_exit_slots method.
+    def get_exit_slots(self, room_id):
+        base = room_id * len(self.directions)
+        targets = self._targets
+        return [(direction, targets[base + i]) for i, direction in enumerate(self.directions) if targets[base + i] != NO_EXIT]
+
+    # Define the get_entrances method.
+    def get_entrances(self, room_id):
+        incoming = self._get_incoming()[room_id]
+        return tuple(incoming) if incoming else ()
+
+    # Define the direction_to method.
+    def direction_to(self, room_id, target_id):
+        incoming = self._get_incoming()[target_id]
+        slot = incoming.get(room_id) if incoming else None
+        return None if slot is None else self.directions[slot]
+
+    # Define the notify_room_added method.
+    def notify_room_added(self, room):
+        for observer in self.observers:
+            observer.room_added(room)
+
+    # Define the notify_contents method.
+    def notify_contents(self, room, attribute, key, old, new):
+        for observer in self.observers:
+            observer.contents_changed(room, attribute, key, old, new)
+
+    # Define the is_dark method.
+    def is_dark(self, room_id):
+        return bool(self._dark[room_id])
+
+    # Define the set_dark method.
+    def set_dark(self, room_id, is_dark):
+        if self._dark[room_id] != bool(is_dark):
+            self._dark[room_id] = bool(is_dark)
+            self.version += 1
+
+    # Change one exit slot, keeping the reverse index (if it has been built) in step with it.
+    def _write_slot(self, room_id, slot, target_id):
+        width = len(self.directions)
+        base = room_id * width
+        old_id = self._targets[base + slot]
+        if old_id == target_id:
+            return
+        self._targets[base + slot] = target_id
+        if self._incoming is None:
+            return
+        if old_id != NO_EXIT:
+            # The room may still lead to the old target through another direction.
+            incoming = self._incoming[old_id]
+            for other in range(width):
+                if self._targets[base + other] == old_id:
+                    incoming[room_id] = other
+                    break
+            else:
+                del incoming[room_id]
+        if target_id != NO_EXIT:
+            incoming = self._incoming[target_id]
+            if incoming is None:
+                incoming = self._incoming[target_id] = {}
+            if incoming.get(room_id, width) > slot:
+                incoming[room_id] = slot
+
+    # Return the reverse index, building it from the exits array the first time. Each entry is None
+    # (no entrance) or a dict mapping the id of every room leading there to the first slot it uses.
+    def _get_incoming(self):
+        if self._incoming is None:
+            incoming = [None] * (len(self._targets) // len(self.directions)) if self.directions else []
+            width = len(self.directions)
+            for index, target_id in enumerate(self._targets):
+                if target_id == NO_EXIT:
+                    continue
+                entry = incoming[target_id]
+                if entry is None:
+                    entry = incoming[target_id] = {}
+                entry.setdefault(index // width, index % width)
+            self._incoming = incoming
+        return self._incoming
+
+    # Drop the precomputed neighbours of a room after one of its exits changed; they are computed again on the next read.
+    def _refresh(self, room_id):
+        self._neighbours[room_id] = None
+        self.version += 1
+        self.exits_version += 1
+
+
+class ExitMap(MutableMapping):
+    """
+    A dict-like view of the exits of a room stored in a RoomGraph. Every direction of the graph is a key;
+    the value is the room in that direction, or None if there is no exit.
+
+    Examples:
+
+    >>> from room import Room
+    >>> graph = RoomGraph(("N", "S"))
+    >>> hall = Room("Hall", "dans un grand hall", False)
+    >>> kitchen = Room("Kitchen", "dans une cuisine", False)
+    >>> _ = graph.add_room(hall), graph.add_room(kitchen)
+    >>> hall.exits = {"N": kitchen}
+    >>> dict((d, r and r.name) for d, r in hall.exits.items())
+    {'N': 'Kitchen', 'S': None}
+    """
+
+    __slots__ = ("_graph", "_room_id")
+
+    # Define the constructor.
+    def __init__(self, graph, room_id):
+        self._graph = graph
+        self._room_id = room_id
+
+    def __getitem__(self, direction):
+        if direction not in self._graph._slots:
+            raise KeyError(direction)
+        return self._graph.get_exit(self._room_id, direction)
+
+    def __setitem__(self, direction, room):
+        self._graph.set_exit(self._room_id, direction, room)
+
+    def __delitem__(self, direction):
+        self._graph.set_exit(self._room_id, direction, None)
+
+    def __iter__(self):
+        return iter(self._graph.directions)
+
+    def __len__(self):
+        return len(self._graph.directions)
+
+    def __repr__(self):
+        return repr({direction: room and room.name for direction, room in self.items()})
@@ -0,0 +1,122 @@
+# Define the Inventory class, the counted inventory of the rooms and of the player.
+
+from observed import MISSING, ObservedDict
+
+
+class Inventory(ObservedDict):
+    """
+    This class is an inventory where identical Items are stacked: each name gives the Item used as the
+    prototype of its units, and the inventory keeps the number of units of each name and the total
+    weight, up to date at each change. Adding or removing any number of units of a name costs the same,
+    and a thousand coins are one Item and a count.
+
+    As a dict, the inventory maps the names to their Item, so that it is read as before. Setting a
+    name puts a single unit; deleting a name removes all its units. Each change is reported to the
+    callback, with the same Item as old and new value when only the number of units changes.
+
+    Attributes:
+        counts (dict) : The number of units of each name.
+        weight (float) : The total weight of the units.
+
+    Methods:
+        __init__(self, on_change, items=(), counts=None) : The constructor.
+        count(self, name) : Return the number of units of a name.
+        add(self, item, count=1) : Add units of an Item.
+        remove(self, name, count=1) : Remove units of a name and return its Item.
+        stacks(self) : Return the (Item, number of units) pairs.
+
+    Examples:
+
+    >>> from item import Item
+    >>> coin = Item("money", "une pièce d'argent", 0)
+    >>> potion = Item("potion", "une potion de soin", 2)
+    >>> changes = []
+    >>> bag = Inventory(lambda name, old, new: changes.append(name))
+    >>> bag.add(coin, 1000)
+    >>> bag.add(potion, 3)
+    >>> bag.count("money"), bag.weight
+    (1000, 6)
+    >>> bag.remove("potion", 2) is potion
+    True
+    >>> bag["potion"] is potion, bag.count("potion"), bag.weight
+    (True, 1, 2)
+    >>> del bag["potion"]
+    >>> "potion" in bag, bag.weight, changes
+    (False, 0, ['money', 'potion', 'potion', 'potion'])
+    """
+
+    __slots__ = ("counts", "weight")
+
+    # Define the constructor. The Items given are put without calling the callback.
+    def __init__(self, on_change, items=(), counts=None):
+        super().__init__(on_change)
+        self.counts = {}
+        self.weight = 0
+        for name, item in dict(items).items():
+            count = counts.get(name, 1) if counts is not None else 1
+            dict.__setitem__(self, name, item)
+            self.counts[name] = count
+            self.weight += item.weight * count
+
+    def __reduce__(self):
+        return (type(self), (self._on_change, dict(self), self.counts))
+
+    def __setitem__(self, name, item):
+        old = dict.get(self, name, MISSING)
+        if old is not MISSING:
+            self.weight -= old.weight * self.counts[name]
+        dict.__setitem__(self, name, item)
+        self.counts[name] = 1
+        self.weight += item.weight
+        self._on_change(name, old, item)
+
+    def __delitem__(self, name):
+        old = self[name]
+        self.weight -= old.weight * self.counts.pop(name)
+        dict.__delitem__(self, name)
+        self._on_change(name, old, MISSING)
+
+    def pop(self, name, *default):
+        if name not in self:
+            return dict.pop(self, name, *default)
+        item = self[name]
+        del self[name]
+        return item
+
+    def popitem(self):
+        name = next(reversed(self))
+        return name, self.pop(name)
+
+    # Define the count method.
+    def count(self, name):
+        return self.counts.get(name, 0)
+
+    # Define the add method.
+    def add(self, item, count=1):
+        name = item.name
+        old = dict.get(self, name, MISSING)
+        if old is MISSING:
+            dict.__setitem__(self, name, item)
+            self.counts[name] = count
+        else:
+            # The units of a name share the Item already there.
+            item = old
+            self.counts[name] += count
+        self.weight += item.weight * count
+        self._on_change(name, old, item)
+
+    # Define the remove method. Removing as many units as there are, or more, removes the name.
+    def remove(self, name, count=1):
+        item = self[name]
+        if count >= self.counts[name]:
+            del self[name]
+        else:
+            self.counts[name] -= count
+            self.weight -= item.weight * count
+            self._on_change(name, item, item)
+        return item
+
+    # Define the stacks method.
+    def stacks(self):
+        counts = self.counts
+        return [(item, counts[name]) for name, item in self.items()]
@@ -1,5 +1,10 @@
 # Define the Item class.
 
+import sys
+
+# The name of the coins, whose units make the purse of the player.
+MONEY = "money"
+
 class Item:
     """
     This class represents a Item. A Item is composed of a name, a description, and a weight.
@@ -8,9 +13,10 @@ class Item:
         name (str) : The name of the Item.
         description (str) : A detailed description of the Item.
         weight (float) : A float that represents the weight of the item.
+        use (ItemUse) : What happens when the Item is used, None if it cannot be used.
 
     Methods : 
-        __init__(self, name, description) : The constructor.
+        __init__(self, name, description, weight, use=None) : The constructor.
         __str__(self) : Return a string containing a full description of the Item.
 
     Examples :
@@ -25,12 +31,45 @@ class Item:
 
     """
 
+    __slots__ = ("name", "description", "weight", "use")
+
     # Define the constructor. 
-    def __init__(self, name, description, weight):
-        self.name = name
+    def __init__(self, name, description, weight, use=None):
+        self.name = sys.intern(name)
         self.description = description
         self.weight = weight
+        self.use = use
 
     # Redefine the __str__() method.
     def __str__(self):
         return f"{self.name} : {self.description} ({self.weight} kg)"
+
+
+class ItemUse:
+    """
+    This class describes what happens when an Item is used, as declared in the world pack: the behavior
+    that runs (see behaviors.py), the conditions to check before, and the messages to print.
+
+    Attributes :
+        behavior (str) : The name of the behavior that runs when the Item is used.
+        message (str) : The message printed when the Item has been used, None if the behavior prints its own.
+        dark_message (str) : The message printed if the room is dark, None if the Item can be used in the dark.
+        rooms (frozenset) : The names of the only rooms where the Item can be used, None if it can be used anywhere.
+        room_message (str) : The message printed when the Item is used in another room.
+
+    Examples :
+
+    >>> use = ItemUse("light", message="Vous avez allumé la torche.")
+    >>> use.behavior, use.dark_message, use.rooms
+    ('light', None, None)
+    """
+
+    __slots__ = ("behavior", "message", "dark_message", "rooms", "room_message")
+
+    # Define the constructor.
+    def __init__(self, behavior, message=None, dark_message=None, rooms=None, room_message=None):
+        self.behavior = sys.intern(behavior)
+        self.message = message
+        self.dark_message = dark_message
+        self.rooms = frozenset(rooms) if rooms is not None else None
+        self.room_message = room_message
@@ -0,0 +1,146 @@
+# Define the objectives of the quests, parsed once from their text when the quest is built.
+
+import sys
+
+# The kind of the objectives completed by visiting a room.
+VISIT = "Visiter"
+# The beginnings of the texts of the objectives completed by visiting a room, e.g. "Aller à Cave".
+VISIT_FORMS = ("Visiter ", "Explorer ", "Aller à ", "Entrer dans ")
+# The words that may come between the verb and the target of an action, e.g. "Parler avec King".
+ACTION_ARTICLES = ("avec", "le", "la")
+
+
+class Objective:
+    """
+    This class is an objective of a quest. The text is only used to display the objective; the key
+    gives the event that completes it, as a (kind, target) pair of interned strings, and is what the
+    quests compare.
+
+    Attributes :
+        text (str) : The text of the objective, as written in the world pack.
+        key (tuple) : The (kind, target) pair of the event that completes the objective.
+
+    Methods :
+        __init__(self, text, kind, target) : The constructor.
+        __str__(self) : Return the text of the objective.
+    """
+
+    __slots__ = ("text", "key")
+
+    # Define the constructor.
+    def __init__(self, text, kind, target):
+        self.text = text
+        self.key = (sys.intern(kind), target and sys.intern(target))
+
+    # Redefine the __str__() method.
+    def __str__(self):
+        return self.text
+
+    # Redefine the __repr__() method.
+    def __repr__(self):
+        return f"{type(self).__name__}({self.text!r})"
+
+
+class Visit(Objective):
+    """An objective completed by visiting a room, e.g. "Visiter Castle"."""
+
+    __slots__ = ()
+
+    # Define the constructor.
+    def __init__(self, text, room):
+        super().__init__(text, VISIT, room)
+
+    @property
+    def room(self):
+        return self.key[1]
+
+
+class Action(Objective):
+    """An objective completed by an action, on a target if any, e.g. "Parler avec King" or "Win"."""
+
+    __slots__ = ()
+
+    # Define the constructor.
+    def __init__(self, text, action, target=None):
+        super().__init__(text, action, target)
+
+    @property
+    def action(self):
+        return self.key[0]
+
+    @property
+    def target(self):
+        return self.key[1]
+
+
+class Talk(Action):
+    """An objective completed by talking to an NPC, e.g. "Parler avec King"."""
+
+    __slots__ = ()
+    VERB = "Parler"
+
+
+class Take(Action):
+    """An objective completed by taking an Item, e.g. "Prendre ring"."""
+
+    __slots__ = ()
+    VERB = "Prendre"
+
+
+class Use(Action):
+    """An objective completed by using an Item, e.g. "Utiliser sword"."""
+
+    __slots__ = ()
+    VERB = "Utiliser"
+
+
+class Counter(Objective):
+    """
+    An objective completed once a counter reaches a number, e.g. "Se déplacer 10 fois": the key is
+    the name of the counter, and required the number to reach.
+    """
+
+    __slots__ = ("required",)
+
+    # Define the constructor.
+    def __init__(self, text, counter, required):
+        super().__init__(text, counter, None)
+        self.required = required
+
+    @property
+    def counter(self):
+        return self.key[0]
+
+
+# The actions with a typed objective, by verb.
+ACTIONS = {action.VERB: action for action in (Talk, Take, Use)}
+
+
+def parse_objective(text):
+    """
+    Return the typed objective written as a text: a Counter if the text contains a number, a Visit if
+    it starts like a visit, an Action (a Talk, Take or Use for their verbs) otherwise.
+
+    >>> parse_objective("Se déplacer 10 fois").counter, parse_objective("Se déplacer 10 fois").required
+    ('Se déplacer', 10)
+    >>> parse_objective("Aller à Cave")
+    Visit('Aller à Cave')
+    >>> parse_objective("Parler avec King").key
+    ('Parler', 'King')
+    >>> parse_objective("Win").key
+    ('Win', None)
+    """
+    if isinstance(text, Objective):
+        return text
+    words = text.split()
+    for position, word in enumerate(words):
+        if word.isdigit():
+            return Counter(text, " ".join(words[:position]), int(word))
+    for form in VISIT_FORMS:
+        if text.startswith(form):
+            return Visit(text, text[len(form):])
+    action, _, target = text.partition(" ")
+    article, _, rest = target.partition(" ")
+    if article in ACTION_ARTICLES and rest:
+        target = rest
+    return ACTIONS.get(action, Action)(text, action, target or None)
@@ -0,0 +1,70 @@
+# Define the ObservedDict class.
+
+# Stands for the value of a key that is absent, before it is added or after it is removed.
+MISSING = object()
+
+
+class ObservedDict(dict):
+    """
+    This class is a dict that reports each of its changes to a callback, so that the owner of the dict
+    can keep caches or indexes up to date. The callback is called after the change, with the key,
+    the old value and the new value (MISSING when the key was absent, or has been removed).
+
+    Examples:
+
+    >>> changes = []
+    >>> d = ObservedDict(lambda key, old, new: changes.append((key, old, new)))
+    >>> d["sword"] = 1
+    >>> del d["sword"]
+    >>> changes == [("sword", MISSING, 1), ("sword", 1, MISSING)]
+    True
+    """
+
+    __slots__ = ("_on_change",)
+
+    # Define the constructor.
+    def __init__(self, on_change, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._on_change = on_change
+
+    def __reduce__(self):
+        return (type(self), (self._on_change, dict(self)))
+
+    def __setitem__(self, key, value):
+        old = dict.get(self, key, MISSING)
+        super().__setitem__(key, value)
+        self._on_change(key, old, value)
+
+    def __delitem__(self, key):
+        old = self[key]
+        super().__delitem__(key)
+        self._on_change(key, old, MISSING)
+
+    def pop(self, key, *default):
+        if key not in self:
+            return super().pop(key, *default)
+        value = super().pop(key)
+        self._on_change(key, value, MISSING)
+        return value
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._on_change(key, value, MISSING)
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        for key in list(self):
+            del self[key]
@@ -0,0 +1,150 @@
+# Description: the output bus of the game.
+#
+# Everything the game tells the player is published on the bus as an Event (the typed events of the game,
+# such as RoomEntered or ItemTaken, are defined in events.py; say() publishes the remaining text as a
+# Message). An event only holds what it is about: its text is built by format(), and only when a sink
+# asks for it. The sinks subscribed to the bus receive every event. By default the only sink is STDOUT,
+# which writes the text on sys.stdout as print() would; the GUI replaces it by its text widget. Inside a
+# capture() block the events go to a Transcript instead, which can drop the formatting altogether.
+
+import sys
+from contextlib import contextmanager
+
+
+class Event:
+    """
+    This class is the base of the events published on the bus.
+
+    Methods:
+        format(self) : Return the text of the event, as print() would write it.
+    """
+
+    __slots__ = ()
+
+    # Define the format method.
+    def format(self):
+        raise NotImplementedError
+
+    # Define the __repr__ method.
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(repr(getattr(self, name)) for name in self.__slots__)})"
+
+
+class Message(Event):
+    """
+    This class is a piece of text that is not worth a typed event, published by say().
+
+    Attributes:
+        values (tuple) : The values to write, like the arguments of print().
+        sep (str) : The separator of the values.
+        end (str) : The string written after the values.
+    """
+
+    __slots__ = ("values", "sep", "end")
+
+    # Define the constructor.
+    def __init__(self, values, sep=" ", end="\n"):
+        self.values = values
+        self.sep = sep
+        self.end = end
+
+    # Define the format method.
+    def format(self):
+        return self.sep.join(map(str, self.values)) + self.end
+
+
+class StdoutSink:
+    """This sink writes the text of the events on sys.stdout, looked up at each event like print() does."""
+
+    __slots__ = ()
+
+    # Define the handle method.
+    def handle(self, event):
+        sys.stdout.write(event.format())
+
+
+class Transcript:
+    """
+    This sink keeps the events published during a capture() block and, unless it is headless, their text.
+
+    Attributes:
+        parts (list) : The pieces of text, in order; always empty for a headless transcript.
+        events (list) : The events, in order.
+        formatted (bool) : False for a headless transcript, which never formats the events.
+
+    Methods:
+        __init__(self, formatted=True) : The constructor.
+        handle(self, event) : Keep an event.
+        get_text(self) : Return the whole text.
+
+    Examples:
+
+    >>> with capture() as transcript:
+    ...     say("Bonjour", "Sam")
+    >>> transcript.get_text()
+    'Bonjour Sam\\n'
+    >>> transcript.events
+    [Message(('Bonjour', 'Sam'), ' ', '\\n')]
+    >>> with capture(formatted=False) as transcript:
+    ...     say("Bonjour")
+    >>> len(transcript.events), transcript.get_text()
+    (1, '')
+    """
+
+    __slots__ = ("parts", "events", "formatted")
+
+    # Define the constructor.
+    def __init__(self, formatted=True):
+        self.parts = []
+        self.events = []
+        self.formatted = formatted
+
+    # Define the handle method.
+    def handle(self, event):
+        self.events.append(event)
+        if self.formatted:
+            # The text is built now: the event refers to objects of the game that the next commands may change.
+            self.parts.append(event.format())
+
+    # Define the get_text method.
+    def get_text(self):
+        return "".join(self.parts)
+
+
+# The default sink, and the sinks subscribed to the bus.
+STDOUT = StdoutSink()
+_sinks = [STDOUT]
+
+
+def subscribe(sink):
+    """Add a sink, an object with a handle(event) method, to the bus and return it."""
+    _sinks.append(sink)
+    return sink
+
+
+def unsubscribe(sink):
+    """Remove a sink from the bus."""
+    _sinks.remove(sink)
+
+
+def publish(event):
+    """Give an event to every sink of the bus."""
+    for sink in _sinks:
+        sink.handle(event)
+
+
+def say(*values, sep=" ", end="\n"):
+    """Publish values like print() would write them; they are only joined if a sink needs the text."""
+    publish(Message(values, sep, end))
+
+
+@contextmanager
+def capture(formatted=True):
+    """Give the events to a Transcript instead of the sinks of the bus; formatted=False drops their text."""
+    transcript = Transcript(formatted)
+    saved = _sinks[:]
+    _sinks[:] = [transcript]
+    try:
+        yield transcript
+    finally:
+        _sinks[:] = saved
@@ -1,6 +1,10 @@
 # Define the Player class.
 
-from quest import QuestManager
+from events import RewardObtained, RoomEntered
+from inventory import Inventory
+from item import MONEY
+from output import publish, say
+from quest import MOVES, QuestManager
 
 class Player():
     """
@@ -10,14 +14,15 @@ class Player():
         name (str): The name of the player.
         current_room (Room) : The room where the player is currently located.
         history (list) : The list containing all the rooms that the player has visited, excluding the current one.
-        inventory(dict) : The inventory of the player, in the form of a dict object where each key is the item's name and the value is the corresponding Item object.
+        inventory(Inventory) : The counted inventory of the player, where each key is the item's name and the value is the corresponding Item object, with its number of units.
         max_weight (int) : The maximum total weight of Items that the player can carry.
-        current_weight (int) : The sum of each Item's weight from the player's inventory.
-        money (int) : The number of coins that the player owns.
+        current_weight (int) : The sum of each Item's weight from the player's inventory (read-only, kept by the inventory).
+        money (int) : The number of coins that the player owns: the units of the money Item of the inventory (read-only).
         beamer_room (Room) : The memorised room in the beamer.
-        move_count : The number of moves the player has made.
+        move_count (int) : The number of moves the player has made (read-only, the "Se déplacer" counter of the quest manager).
         quest_manager (QuestManager) : The player's quest manager, which checks if objectives or tasks have been completed.
         rewards (list) : A list that contains all the rewards (String objects) the player has received.
+        observers (list) : The objects told about each change of the inventory, by their inventory_changed(key, old, new) method.
 
     Methods:
         __init__(self, name) : The constructor.
@@ -25,7 +30,7 @@ class Player():
         get_history(self) : Return a string that contains a list of all the rooms that the player has visited, in order. If the history attribute is empty, return the corresponding message.
         move_back(self) : If the history is not empty, get the last object of the history attribute, removes it from self.history, set it as the current room and return True.
         get_inventory(self) : Return a string listing the contents of the player's inventory.
-        teleport(self) : Teleports the player to the Room that is contained in the beamer_room attribute.
+        teleport(self, item_name="beamer") : Teleports the player to the Room that is contained in the beamer_room attribute, using up the Item.
         add_reward (self, reward) : Add a reward to the player's rewards list.
         show_rewards (self) : Display all rewards earned by the player.
 
@@ -46,6 +51,9 @@ class Player():
 
     """
 
+    __slots__ = ("name", "current_room", "history", "inventory", "max_weight",
+                 "beamer_room", "quest_manager", "rewards", "observers")
+
     # Define the constructor.
     def __init__(self, name):
         """
@@ -65,15 +73,32 @@ class Player():
         self.name = name
         self.current_room = None
         self.history = []
-        self.inventory = {}
+        self.observers = []
+        self.inventory = Inventory(self._inventory_changed)
         self.max_weight = 8
-        self.current_weight = 0
-        self.money = 2
         self.beamer_room = None
-        self.move_count = 0
         self.quest_manager = QuestManager(self)
         self.rewards = []  # List to store earned rewards
     
+    # The moves are counted by the quest manager, with the other counters of the quests.
+    @property
+    def move_count(self):
+        return self.quest_manager.counters.get(MOVES, 0)
+
+    # The weight of the bag and the purse are read from the inventory.
+    @property
+    def current_weight(self):
+        return self.inventory.weight
+
+    @property
+    def money(self):
+        return self.inventory.count(MONEY)
+
+    # Tell the observers about a change of the inventory.
+    def _inventory_changed(self, key, old, new):
+        for observer in self.observers:
+            observer.inventory_changed(key, old, new)
+
     # Define the move method.
     def move(self, direction):
         """
@@ -123,18 +148,18 @@ class Player():
         """
 
         # Get the next room from the exits dictionary of the current room.
-        next_room = self.current_room.exits[direction]
+        next_room = self.current_room.get_exit(direction)
         
 
         # If the next room is None, print an error message and return False.
         if next_room is None:
-            print("\nAucune porte dans cette direction !\n")
+            say("\nAucune porte dans cette direction !\n")
             return False
         
         # Set the current room to the next room.
         self.history.append(self.current_room)
         self.current_room = next_room
-        print(self.current_room.get_long_description())
+        publish(RoomEntered(next_room))
         #print(self.get_history())
 
         
@@ -142,8 +167,7 @@ class Player():
         self.quest_manager.check_room_objectives(self.current_room.name)
 
         # Increment move counter and check movement objectives
-        self.move_count += 1
-        self.quest_manager.check_counter_objectives("Se déplacer", self.move_count)
+        self.quest_manager.increment_counter(MOVES)
 
         return True
     
@@ -241,63 +265,65 @@ class Player():
 
         #If the player has no history, print an error message and return False.
         if len(self.history) == 0 :
-            print("\nImpossible de retourner en arrière ! Votre historique est vide.\n")
+            say("\nImpossible de retourner en arrière ! Votre historique est vide.\n")
             return False
 
         #Set a inter room 
         inter_room = self.history[-1]
-        if inter_room in self.current_room.exits.values() :
+        # The passage is one-way if no exit of the current room leads back to the last room.
+        if self.current_room.get_direction_to(inter_room) is not None :
             #Set the current room to the last visited room.
             self.current_room = self.history.pop()
-            print(self.current_room.get_long_description())
+            publish(RoomEntered(self.current_room))
             #print(self.get_history())
 
             # Check room visit objectives
             self.quest_manager.check_room_objectives(self.current_room.name)
 
             # Increment move counter and check movement objectives
-            self.move_count += 1
-            self.quest_manager.check_counter_objectives("Se déplacer", self.move_count)
+            self.quest_manager.increment_counter(MOVES)
 
             return True
 
         else : 
-            print("\nImpossile de retourner en arrière, le passage est à sens unique !\n")
+            say("\nImpossile de retourner en arrière, le passage est à sens unique !\n")
             return False
 
     #Define the get_inventory method.
     def get_inventory(self) :
 
+        # The coins are in the purse rather than in the bag.
+        stacks = [(item, count) for item, count in self.inventory.stacks() if item.name != MONEY]
+
         #If the inventory is empty, return a string indicating that no Item is present in the inventory.
-        if len(self.inventory) == 0 :
+        if not stacks :
             return "\nVotre inventaire est vide.\n"+f"\nVotre porte-monnaie contient {self.money} pièces.\n"
 
         inventory_string = "\nVous disposez des items suivants : \n"
         
-        for item in self.inventory.values() :
-            #For each Item in the inventory, list its name, description and weight.
-            inventory_string += f"\t - {item.name} : {item.description} ({item.weight} kg)\n"
+        for item, count in stacks :
+            #For each Item in the inventory, list its name, description and weight, and its number of units if there are several.
+            inventory_string += f"\t - {item.name} : {item.description} ({item.weight} kg){f' x{count}' if count > 1 else ''}\n"
         inventory_string += f"\nVotre sac pèse {self.current_weight} kg\n"
         inventory_string += f"\nVotre porte-monnaie contient {self.money} pièces.\n"
         return inventory_string 
     
     # Define the teleport method.
-    def teleport(self) :
+    def teleport(self, item_name="beamer") :
         # Add the current_room to the history.
         self.history.append(self.current_room)
         # Change the current room to the "memorized" room.
         self.current_room = self.beamer_room
-        print(self.current_room.get_long_description())
+        publish(RoomEntered(self.current_room))
         self.beamer_room = None
-        # Delete the beamer from the inventory because it has a one-time use.
-        del self.inventory["beamer"]
+        # Remove a beamer from the inventory because it has a one-time use.
+        self.inventory.remove(item_name)
 
          # Check room visit objectives
         self.quest_manager.check_room_objectives(self.current_room.name)
 
         # Increment move counter and check movement objectives
-        self.move_count += 1
-        self.quest_manager.check_counter_objectives("Se déplacer", self.move_count)
+        self.quest_manager.increment_counter(MOVES)
 
         return True
 
@@ -323,7 +349,7 @@ class Player():
         """
         if reward and reward not in self.rewards:
             self.rewards.append(reward)
-            print(f"\n🎁 Vous avez obtenu: {reward}\n")
+            publish(RewardObtained(reward))
 
 
     def show_rewards(self):
@@ -348,9 +374,9 @@ class Player():
         <BLANKLINE>
         """
         if not self.rewards:
-            print("\n🎁 Aucune récompense obtenue pour le moment.\n")
+            say("\n🎁 Aucune récompense obtenue pour le moment.\n")
         else:
-            print("\n🎁 Vos récompenses:")
+            say("\n🎁 Vos récompenses:")
             for reward in self.rewards:
-                print(f"  • {reward}")
-            print()
\ No newline at end of file
+                say(f"  • {reward}")
+            say()
\ No newline at end of file
@@ -1,188 +1,138 @@
-""" Define the Quest class"""
+""" Define the Quest and QuestManager classes"""
+
+import heapq
+
+from events import ObjectiveCompleted, QuestActivated, QuestCompleted, QuestList
+from objective import VISIT, Counter, parse_objective
+from output import publish, say
+
+# The name of the counter of the moves of the player, e.g. "Se déplacer 10 fois".
+MOVES = "Se déplacer"
+# The node of the graph of the quests reached when the player wins the game.
+VICTORY = -1
 
 class Quest:
     """
-    This class represents a quest in the game. A quest has a title, description,
-    objectives, completion status, and optional rewards.
-    
+    This class represents the definition of a quest in the game. A quest has a title, description,
+    objectives, optional rewards, and the titles of the quests to complete before it can be activated.
+
+    The objectives are given as texts and parsed once into typed objectives (see objective.py): the
+    events of the game are matched against their keys, and their texts are only displayed.
+
+    A quest holds no state of a player: it is shared by all the games played in the same world, and
+    the progress of each player (activation, objectives completed) is kept by the QuestManager of the
+    player, as bitsets where the objective number i is the bit 1 << i.
+
     Attributes:
         title (str): The title of the quest.
         description (str): The description of the quest.
-        objectives (list): List of objectives to complete.
-        is_completed (bool): Whether the quest is completed.
-        is_active (bool): Whether the quest is currently active.
+        objectives (tuple): The objectives to complete (Objective).
         reward (str): Optional reward for completing the quest.
+        prerequisites (tuple): The titles of the quests to complete before this one.
     """
 
+    __slots__ = ("title", "description", "objectives", "reward", "prerequisites")
 
-    def __init__(self, title, description, objectives=None, reward=None):
+    def __init__(self, title, description, objectives=None, reward=None, prerequisites=None):
         """
         Initialize a new quest.
-        
+
         Args:
             title (str): The title of the quest.
             description (str): The description of the quest.
             objectives (list): List of objectives (default: empty list).
             reward (str): Optional reward description.
-            
+            prerequisites (list): The titles of the quests to complete before this one (default: none).
+
         Examples:
-        
+
         >>> quest = Quest("Test Quest", "A test quest", ["Objective 1", "Objective 2"], "Gold coin")
         >>> quest.title
         'Test Quest'
-        >>> quest.is_active
-        False
-        >>> quest.is_completed
-        False
         >>> len(quest.objectives)
         2
         """
         self.title = title
         self.description = description
-        self.objectives = objectives if objectives is not None else []
-        self.completed_objectives = []
-        self.is_completed = False
-        self.is_active = False
+        self.objectives = tuple(parse_objective(objective) for objective in objectives or ())
         self.reward = reward
+        self.prerequisites = tuple(prerequisites or ())
 
 
-    def activate(self):
+    def find_objective(self, text, completed=0):
         """
-        Activate the quest.
-        
-        Examples:
-        
-        >>> quest = Quest("Adventure", "Go on an adventure")
-        >>> quest.is_active
-        False
-        >>> quest.activate()
-        <BLANKLINE>
-        🗡️  Nouvelle quête activée: Adventure
-        📝 Go on an adventure
-        <BLANKLINE>
-        >>> quest.is_active
-        True
-        """
-        self.is_active = True
-        print(f"\n🗡️  Nouvelle quête activée: {self.title}")
-        print(f"📝 {self.description}\n")
+        Find an objective of the quest by its text, among the objectives not completed yet.
 
-
-    def complete_objective(self, objective, player=None):
-        """
-        Mark an objective as completed.
-        
         Args:
-            objective (str): The objective to mark as completed.
-            player: The player object (optional).
-            
+            text (str): The text of the objective.
+            completed (int): The bitset of the objectives already completed.
+
         Returns:
-            bool: True if objective was found and completed, False otherwise.
-            
+            int: The number of the objective if found, None otherwise.
+
         Examples:
-        
+
         >>> quest = Quest("Hunt", "Hunt monsters", ["Kill 5 goblins", "Kill 3 orcs"])
-        >>> quest.complete_objective("Kill 5 goblins")
-        ✅ Objectif accompli: Kill 5 goblins
-        True
-        >>> len(quest.completed_objectives)
+        >>> quest.find_objective("Kill 3 orcs")
         1
-        >>> quest.complete_objective("Kill 5 goblins")
-        False
-        >>> quest.complete_objective("Invalid objective")
-        False
+        >>> quest.find_objective("Kill 3 orcs", completed=0b10) is None
+        True
         """
-        if objective in self.objectives and objective not in self.completed_objectives:
-            self.completed_objectives.append(objective)
-            print(f"✅ Objectif accompli: {objective}\n")
-
-            # Check if all objectives are completed
-            if len(self.completed_objectives) == len(self.objectives):
-                self.complete_quest(player)
-
-            return True
-        return False
+        for number, objective in enumerate(self.objectives):
+            if objective.text == text and not completed >> number & 1:
+                return number
+        return None
 
 
-    def complete_quest(self, player=None):
-        """
-        Mark the quest as completed and give reward to player.
-        
-        Args:
-            player: The player object to give the reward to (optional).
-            
-        Examples:
-        
-        >>> quest = Quest("Final Quest", "The last quest", ["Win"], "Trophy")
-        >>> quest.is_completed
-        False
-        >>> quest.complete_quest() # doctest: +NORMALIZE_WHITESPACE
-        <BLANKLINE>
-        🏆 Quête terminée: Final Quest
-        🎁 Récompense: Trophy
-        <BLANKLINE>
-        >>> quest.is_completed
-        True
+    def get_status(self, completed=None, is_completed=False, locked=False):
         """
-        if not self.is_completed:
-            self.is_completed = True
-            print(f"\n🏆 Quête terminée: {self.title}")
-            if self.reward:
-                print(f"🎁 Récompense: {self.reward}")
-                if player:
-                    player.add_reward(self.reward)
-            print()
+        Get the status of the quest for a player.
 
+        Args:
+            completed (int): The bitset of the objectives completed by the player, None if the quest is not active.
+            is_completed (bool): Whether the player has completed the quest.
+            locked (bool): Whether the quest waits for prerequisites, if it is not active.
 
-    def get_status(self):
-        """
-        Get the current status of the quest.
-        
         Returns:
             str: A formatted string showing the quest status.
-            
+
         Examples:
-        
+
         >>> quest = Quest("Collect", "Collect items", ["Get sword", "Get shield"])
         >>> quest.get_status()
         '❓ Collect (Non activée)'
-        >>> quest.activate()
-        <BLANKLINE>
-        🗡️  Nouvelle quête activée: Collect
-        📝 Collect items
-        <BLANKLINE>
-        >>> quest.get_status()
+        >>> quest.get_status(0b00)
         '⏳ Collect (0/2 objectifs)'
-        >>> quest.complete_objective("Get sword")
-        ✅ Objectif accompli: Get sword
-        True
-        >>> quest.get_status()
+        >>> quest.get_status(0b01)
         '⏳ Collect (1/2 objectifs)'
-        """
-        if not self.is_active:
-            return f"❓ {self.title} (Non activée)"
-        if self.is_completed:
+        >>> quest.get_status(0b11, True)
+        '✅ Collect (Terminée)'
+        >>> quest.get_status(locked=True)
+        '🔒 Collect (Verrouillée)'
+        """
+        if completed is None:
+            return f"🔒 {self.title} (Verrouillée)" if locked else f"❓ {self.title} (Non activée)"
+        if is_completed:
             return f"✅ {self.title} (Terminée)"
-        completed_count = len(self.completed_objectives)
-        total_count = len(self.objectives)
-        return f"⏳ {self.title} ({completed_count}/{total_count} objectifs)"
+        return f"⏳ {self.title} ({completed.bit_count()}/{len(self.objectives)} objectifs)"
 
 
-    def get_details(self, current_counts=None):
+    def get_details(self, completed=0, current_counts=None):
         """
         Get detailed information about the quest.
-        
+
         Args:
-            current_counts (dict): Optional dictionary with current counter values 
+            completed (int): The bitset of the objectives completed by the player.
+            current_counts (dict): Optional dictionary with current counter values
                                    (e.g., {"Se déplacer": 5})
-        
+
         Returns:
             str: A formatted string with quest details.
-            
+
         Examples:
-        
+
         >>> quest = Quest("Travel", "Move around", ["Se déplacer 10 fois"], "Map")
-        >>> details = quest.get_details({"Se déplacer": 5})
+        >>> details = quest.get_details(0, {"Se déplacer": 5})
         >>> "Travel" in details
         True
         >>> "Progression: 5/10" in details
@@ -193,8 +143,8 @@ class Quest:
 
         if self.objectives:
             details += "\nObjectifs:\n"
-            for objective in self.objectives:
-                status = "✅" if objective in self.completed_objectives else "⬜"
+            for number, objective in enumerate(self.objectives):
+                status = "✅" if completed >> number & 1 else "⬜"
                 objective_text = self._format_objective_with_progress(objective, current_counts)
                 details += f"  {status} {objective_text}\n"
 
@@ -206,197 +156,79 @@ class Quest:
     def _format_objective_with_progress(self, objective, current_counts):
         """
         Format an objective with progress information if available.
-        
-        Args:
-            objective (str): The objective text.
-            current_counts (dict): Dictionary with current counter values.
-            
-        Returns:
-            str: Formatted objective text with progress if applicable.
-        """
-        if not current_counts:
-            return objective
-
-        for counter_name, current_count in current_counts.items():
-            if counter_name not in objective:
-                continue
-
-            # Extract required count from objective
-            required = self._extract_number_from_text(objective)
-            if required is not None:
-                return f"{objective} (Progression: {current_count}/{required})"
-
-        return objective
-
-    def _extract_number_from_text(self, text):
-        """
-        Extract the first number from a text string.
-        
-        Args:
-            text (str): The text to search.
-            
-        Returns:
-            int: The first number found, or None if no number exists.
-        """
-        for word in text.split():
-            if word.isdigit():
-                return int(word)
-        return None
-
-
-    def check_room_objective(self, room_name, player=None):
-        """
-        Check if visiting a specific room completes an objective.
-        
-        Args:
-            room_name (str): The name of the room visited.
-            player: The player object (optional).
-            
-        Returns:
-            bool: True if an objective was completed, False otherwise.
-            
-        Examples:
-        
-        >>> quest = Quest("Explore", "Explore the castle", ["Visiter Castle"])
-        >>> quest.check_room_objective("Castle")
-        ✅ Objectif accompli: Visiter Castle
-        <BLANKLINE>
-        🏆 Quête terminée: Explore
-        <BLANKLINE>
-        True
-        >>> quest.check_room_objective("Tower")
-        False
-        """
-        room_objectives = [
-            f"Visiter {room_name}",
-            f"Explorer {room_name}",
-            f"Aller à {room_name}",
-            f"Entrer dans {room_name}"
-        ]
 
-        for objective in room_objectives:
-            if self.complete_objective(objective, player):
-                return True
-        return False
-
-
-    def check_action_objective(self, action, target=None, player=None):
-        """
-        Check if performing an action completes an objective.
-        
         Args:
-            action (str): The action performed (e.g., "parler", "prendre", "utiliser").
-            target (str): Optional target of the action.
-            player: The player object (optional).
-            
-        Returns:
-            bool: True if an objective was completed, False otherwise.
-            
-        Examples:
-        
-        >>> quest = Quest("Talk", "Have a conversation", ["parler avec garde"])
-        >>> quest.check_action_objective("parler", "garde") # doctest: +NORMALIZE_WHITESPACE
-        ✅ Objectif accompli: parler avec garde
-        <BLANKLINE>
-        🏆 Quête terminée: Talk
-        <BLANKLINE>
-        True
-        >>> quest.check_action_objective("courir", "vite")
-        False
-        """
-        if target:
-            objective_variations = [
-                f"{action} {target}",
-                f"{action} avec {target}",
-                f"{action} le {target}",
-                f"{action} la {target}"
-            ]
-        else:
-            objective_variations = [action]
-
-        for objective in objective_variations:
-            if self.complete_objective(objective, player):
-                return True
-        return False
-
+            objective (Objective): The objective.
+            current_counts (dict): Dictionary with current counter values.
 
-    def check_counter_objective(self, counter_name, current_count, player=None):
-        """
-        Check objectives that require counting (e.g., visit X rooms, collect Y items).
-        
-        Args:
-            counter_name (str): The name of what is being counted.
-            current_count (int): The current count.
-            player: The player object (optional).
-            
         Returns:
-            bool: True if an objective was completed, False otherwise.
-            
-        Examples:
-        
-        >>> quest = Quest("Walker", "Walk a lot", ["Marcher 5 fois"])
-        >>> quest.check_counter_objective("Marcher", 3)
-        False
-        >>> quest.check_counter_objective("Marcher", 5) # doctest: +ELLIPSIS
-        ✅ Objectif accompli: Marcher 5 fois
-        <BLANKLINE>
-        🏆 Quête terminée: Walker
-        <BLANKLINE>
-        True
+            str: Formatted objective text with progress if applicable.
         """
-        for objective in self.objectives:
-            if counter_name in objective and objective not in self.completed_objectives:
-                # Extract number from objective (e.g., "Visiter 3 lieux" -> 3)
-                words = objective.split()
-                for word in words:
-                    if word.isdigit():
-                        required_count = int(word)
-                        if current_count >= required_count:
-                            self.complete_objective(objective, player)
-                            return True
-        return False
+        if current_counts and isinstance(objective, Counter) and objective.counter in current_counts:
+            return f"{objective.text} (Progression: {current_counts[objective.counter]}/{objective.required})"
+        return objective.text
 
 
     def __str__(self):
         """
         Return a string representation of the quest.
-        
+
         Examples:
-        
+
         >>> quest = Quest("String Test", "Test __str__", ["Task 1"])
         >>> str(quest)
         '❓ String Test (Non activée)'
-        >>> quest.activate() # doctest: +NORMALIZE_WHITESPACE
-        <BLANKLINE>
-        🗡️  Nouvelle quête activée: String Test
-        📝 Test __str__
-        <BLANKLINE>
-        >>> str(quest)
-        '⏳ String Test (0/1 objectifs)'
         """
         return self.get_status()
 
 
 class QuestManager:
     """
-    This class manages all quests in the game.
-    
+    This class manages the quests of a player: the quests are shared definitions, and the manager
+    keeps the progress of the player as bitsets.
+
+    The quest number n (its position in quests) is the bit 1 << n of the bitsets of the active and
+    of the completed quests, and the objectives completed in an active quest are a bitset as well.
+    A quest is completed when the number of bits set in its bitset (its popcount) reaches its number
+    of objectives.
+
+    The pending objectives of the active quests are indexed when the quests are activated: by their
+    key for the visits and the actions, and, for the counters, in a heap of thresholds per counter. A
+    visit or an action only looks up the objectives it can complete, whatever the number of active
+    quests, and an objective leaves the index once completed. Counting compares the new value with the
+    lowest threshold of the counter, and only completes the objectives whose threshold is crossed.
+
+    The manager keeps the counters of the player: the moves (MOVES) and the actions, each action being
+    counted under its verb ("Prendre 3 objets", "Parler 5 fois").
+
+    The prerequisites of the quests form a directed acyclic graph, whose last node is the victory
+    (VICTORY): by default, the victory follows all the quests. Each quest locked, and the victory,
+    counts its prerequisites not completed yet; completing a quest only decrements the counts of the
+    nodes that follow it, and unlocks those reaching zero.
+
     Attributes:
         quests (list): List of all quests in the game.
-        active_quests (list): List of currently active quests.
+        active (int): The bitset of the quests activated by the player.
+        completed (int): The bitset of the quests completed by the player.
+        progress (dict): The bitset of the objectives completed in each quest activated and not completed yet, by quest number.
+        counters (dict): The value of each counter.
+        unlocked (int): The bitset of the quests whose prerequisites are all completed.
+        victory (bool): Whether the player has completed the quests the victory follows.
         player: Reference to the player object.
     """
 
+    __slots__ = ("quests", "active", "completed", "progress", "counters", "unlocked", "victory", "player",
+                 "_numbers", "_titles", "_successors", "_remaining", "_later", "_victory_titles", "_pending", "_counters")
 
     def __init__(self, player=None):
         """
         Initialize the quest manager.
-        
+
         Args:
             player: The player object (optional, can be set later).
-            
+
         Examples:
-        
+
         >>> manager = QuestManager()
         >>> len(manager.quests)
         0
@@ -404,19 +236,38 @@ class QuestManager:
         0
         """
         self.quests = []
-        self.active_quests = []
+        self.active = 0
+        self.completed = 0
+        self.progress = {}
+        self.counters = {}
+        self.unlocked = 0
+        self.victory = False
         self.player = player
+        # The number of each quest, and of each title.
+        self._numbers = {}
+        self._titles = {}
+        # The nodes (quest numbers or VICTORY) following each quest, and the prerequisites not completed of each locked node.
+        self._successors = []
+        self._remaining = {}
+        # The quests waiting for a prerequisite not added yet, by its title.
+        self._later = {}
+        # The titles of the quests the victory follows, None for all the quests.
+        self._victory_titles = None
+        # The (quest number, objective number) pairs waiting for each key, the quests in the order of their activation.
+        self._pending = {}
+        # The heap of the (threshold, quest number, objective number) of the Counter objectives waiting for each counter.
+        self._counters = {}
 
 
     def add_quest(self, quest):
         """
         Add a quest to the game.
-        
+
         Args:
             quest (Quest): The quest to add.
-            
+
         Examples:
-        
+
         >>> manager = QuestManager()
         >>> quest = Quest("Quest 1", "First quest")
         >>> manager.add_quest(quest)
@@ -424,22 +275,185 @@ class QuestManager:
         1
         >>> manager.quests[0].title
         'Quest 1'
+        >>> manager.add_quest(Quest("Quest 2", "Second quest", prerequisites=["Quest 1"]))
+        >>> manager.is_unlocked(manager.quests[1])
+        False
         """
+        number = len(self.quests)
+        self._numbers[quest] = number
+        self._titles.setdefault(quest.title, number)
         self.quests.append(quest)
+        self._successors.append([])
+
+        remaining = 0
+        for title in quest.prerequisites:
+            prerequisite = self._titles.get(title)
+            if prerequisite is None:
+                self._later.setdefault(title, []).append(number)
+                remaining += 1
+            elif not self.completed >> prerequisite & 1:
+                self._successors[prerequisite].append(number)
+                remaining += 1
+        for dependent in self._later.pop(quest.title, ()):
+            self._successors[number].append(dependent)
+        if remaining:
+            self._remaining[number] = remaining
+        else:
+            self.unlocked |= 1 << number
+
+        if self._victory_titles is None:
+            self._successors[number].append(VICTORY)
+            self._remaining[VICTORY] = self._remaining.get(VICTORY, 0) + 1
+
+
+    def set_victory(self, titles=None):
+        """
+        Set the quests to complete to win the game, once all the quests have been added. A victory that
+        follows no quest left to complete, in a world without quests for instance, is reached at once.
+
+        Args:
+            titles (list): The titles of the quests the victory follows, None for all the quests.
+
+        Examples:
+
+        >>> manager = QuestManager()
+        >>> manager.add_quest(Quest("Side", "Optional", ["Rest"]))
+        >>> manager.add_quest(Quest("Main", "Required", ["Win"]))
+        >>> manager.set_victory(["Main"])
+        >>> manager.activate_quest("Main") and manager.complete_objective("Win") # doctest: +NORMALIZE_WHITESPACE
+        <BLANKLINE>
+        🗡️  Nouvelle quête activée: Main
+        📝 Required
+        <BLANKLINE>
+        ✅ Objectif accompli: Win
+        <BLANKLINE>
+        🏆 Quête terminée: Main
+        <BLANKLINE>
+        True
+        >>> manager.victory
+        True
+        >>> manager = QuestManager()
+        >>> manager.set_victory()
+        >>> manager.victory
+        True
+        >>> manager.add_quest(Quest("Main", "Required", ["Win"]))
+        >>> manager.set_victory([])
+        >>> manager.victory
+        True
+        """
+        if titles is not None:
+            for successors in self._successors:
+                if VICTORY in successors:
+                    successors.remove(VICTORY)
+            self._victory_titles = tuple(titles)
+            remaining = 0
+            for title in self._victory_titles:
+                number = self._titles[title]
+                if not self.completed >> number & 1:
+                    self._successors[number].append(VICTORY)
+                    remaining += 1
+            if remaining:
+                self._remaining[VICTORY] = remaining
+            else:
+                self._remaining.pop(VICTORY, None)
+        # The victory has no prerequisite left: nothing will ever unlock it, so it is reached now.
+        self.victory = VICTORY not in self._remaining
+
+
+    @property
+    def active_quests(self):
+        """The quests activated and not completed yet, in the order of the quests."""
+        pending = self.active & ~self.completed
+        return [quest for number, quest in enumerate(self.quests) if pending >> number & 1]
+
+
+    def is_active(self, quest):
+        """Return True if the player has activated the quest."""
+        return bool(self.active >> self._numbers[quest] & 1)
+
+
+    def is_completed(self, quest):
+        """Return True if the player has completed the quest."""
+        return bool(self.completed >> self._numbers[quest] & 1)
+
+
+    def is_unlocked(self, quest):
+        """Return True if the player has completed all the prerequisites of the quest."""
+        return bool(self.unlocked >> self._numbers[quest] & 1)
+
+
+    def get_missing_prerequisites(self, quest):
+        """Return the titles of the prerequisites of the quest the player has not completed yet."""
+        return [title for title in quest.prerequisites
+                if title not in self._titles or not self.completed >> self._titles[title] & 1]
+
+
+    def get_completed_objectives(self, quest):
+        """
+        Get the objectives of a quest completed by the player.
+
+        Args:
+            quest (Quest): The quest.
+
+        Returns:
+            list: The objectives completed (Objective).
+        """
+        completed = self._completed_bits(self._numbers[quest])
+        return [objective for number, objective in enumerate(quest.objectives) if completed >> number & 1]
+
+
+    # Return the bitset of the objectives completed in a quest; all of them once the quest is completed.
+    def _completed_bits(self, number):
+        if self.completed >> number & 1:
+            return (1 << len(self.quests[number].objectives)) - 1
+        return self.progress.get(number, 0)
+
+
+    def get_status(self, quest):
+        """
+        Get the status of a quest for the player.
+
+        Args:
+            quest (Quest): The quest.
+
+        Returns:
+            str: A formatted string showing the quest status.
+
+        Examples:
+
+        >>> manager = QuestManager()
+        >>> manager.add_quest(Quest("Collect", "Collect items", ["Get sword", "Get shield"]))
+        >>> manager.get_status(manager.quests[0])
+        '❓ Collect (Non activée)'
+        >>> manager.activate_quest("Collect") and manager.complete_objective("Get sword") # doctest: +NORMALIZE_WHITESPACE
+        <BLANKLINE>
+        🗡️  Nouvelle quête activée: Collect
+        📝 Collect items
+        <BLANKLINE>
+        ✅ Objectif accompli: Get sword
+        <BLANKLINE>
+        True
+        >>> manager.get_status(manager.quests[0])
+        '⏳ Collect (1/2 objectifs)'
+        """
+        number = self._numbers[quest]
+        if not self.active >> number & 1:
+            return quest.get_status(locked=not self.unlocked >> number & 1)
+        return quest.get_status(self._completed_bits(number), bool(self.completed >> number & 1))
 
 
     def activate_quest(self, quest_title):
         """
         Activate a quest by its title.
-        
+
         Args:
             quest_title (str): The title of the quest to activate.
-            
+
         Returns:
             bool: True if quest was found and activated, False otherwise.
-            
+
         Examples:
-        
+
         >>> manager = QuestManager()
         >>> quest = Quest("Epic Quest", "An epic adventure")
         >>> manager.add_quest(quest)
@@ -453,27 +467,126 @@ class QuestManager:
         1
         >>> manager.activate_quest("Unknown Quest")
         False
+        >>> manager.add_quest(Quest("Sequel", "After the epic adventure", prerequisites=["Epic Quest"]))
+        >>> manager.activate_quest("Sequel")
+        False
         """
-        for quest in self.quests:
-            if quest.title == quest_title and not quest.is_active:
-                quest.activate()
-                self.active_quests.append(quest)
-                return True
-        return False
+        number = self._titles.get(quest_title)
+        # A quest can only be activated once, and once its prerequisites are completed.
+        if number is None or self.active >> number & 1 or not self.unlocked >> number & 1:
+            return False
+        quest = self.quests[number]
+        self.active |= 1 << number
+        self.progress[number] = 0
+        publish(QuestActivated(quest))
+        self._index(number)
+        return True
+
+
+    # Index the objectives of a quest being activated.
+    def _index(self, number):
+        for objective_number, objective in enumerate(self.quests[number].objectives):
+            if isinstance(objective, Counter):
+                heapq.heappush(self._counters.setdefault(objective.counter, []),
+                               (objective.required, number, objective_number))
+            else:
+                self._pending.setdefault(objective.key, []).append((number, objective_number))
+
+
+    # Take an objective of a quest out of the index. A Counter objective stays in its heap, and is skipped once popped.
+    def _unindex(self, number, objective_number):
+        objective = self.quests[number].objectives[objective_number]
+        if isinstance(objective, Counter):
+            return
+        entries = self._pending.get(objective.key, [])
+        if (number, objective_number) in entries:
+            entries.remove((number, objective_number))
+        if not entries:
+            self._pending.pop(objective.key, None)
+
+
+    # Complete an objective of an active quest, and the quest once all its objectives are completed.
+    def _complete(self, number, objective_number):
+        self._unindex(number, objective_number)
+        quest = self.quests[number]
+        progress = self.progress[number] | 1 << objective_number
+        self.progress[number] = progress
+        publish(ObjectiveCompleted(quest, quest.objectives[objective_number]))
+        if progress.bit_count() == len(quest.objectives):
+            self.complete_quest(quest)
+
+
+    # Complete, for each quest, the first objective waiting for a key; the quests in the order of their activation.
+    def _complete_first(self, key):
+        found = {}
+        for number, objective_number in self._pending.get(key, ()):
+            found.setdefault(number, objective_number)
+        for number, objective_number in found.items():
+            self._complete(number, objective_number)
+
+
+    def complete_quest(self, quest):
+        """
+        Mark a quest as completed and give its reward to the player.
+
+        Args:
+            quest (Quest): The quest to complete.
+
+        Examples:
+
+        >>> manager = QuestManager()
+        >>> manager.add_quest(Quest("Final Quest", "The last quest", ["Win"], "Trophy"))
+        >>> manager.complete_quest(manager.quests[0]) # doctest: +NORMALIZE_WHITESPACE
+        <BLANKLINE>
+        🏆 Quête terminée: Final Quest
+        🎁 Récompense: Trophy
+        <BLANKLINE>
+        >>> manager.is_completed(manager.quests[0])
+        True
+        """
+        number = self._numbers[quest]
+        if self.completed >> number & 1:
+            return
+        self.completed |= 1 << number
+        # The objectives still pending leave the index with the progress of the quest.
+        progress = self.progress.pop(number, None)
+        if progress is not None:
+            for objective_number in range(len(quest.objectives)):
+                if not progress >> objective_number & 1:
+                    self._unindex(number, objective_number)
+        publish(QuestCompleted(quest))
+        if quest.reward and self.player:
+            self.player.add_reward(quest.reward)
+        say()
+        self._unlock_successors(number)
+
+
+    # Count the completion of a quest in the nodes that follow it, and unlock those it was the last prerequisite of.
+    def _unlock_successors(self, number):
+        for successor in self._successors[number]:
+            remaining = self._remaining[successor] - 1
+            if remaining:
+                self._remaining[successor] = remaining
+                continue
+            del self._remaining[successor]
+            if successor == VICTORY:
+                self.victory = True
+            else:
+                self.unlocked |= 1 << successor
 
 
     def complete_objective(self, objective_text):
         """
         Complete an objective in any active quest.
-        
+
         Args:
             objective_text (str): The objective to complete.
-            
+
         Returns:
             bool: True if objective was found and completed, False otherwise.
-            
+
         Examples:
-        
+
         >>> manager = QuestManager()
         >>> quest = Quest("Manager Quest", "Test", ["Do something"])
         >>> manager.add_quest(quest)
@@ -492,11 +605,10 @@ class QuestManager:
         >>> manager.complete_objective("Do nothing")
         False
         """
-        for quest in self.active_quests:
-            if quest.complete_objective(objective_text):
-                # Remove completed quests from active list
-                if quest.is_completed:
-                    self.active_quests.remove(quest)
+        for number, progress in self.progress.items():
+            objective_number = self.quests[number].find_objective(objective_text, progress)
+            if objective_number is not None:
+                self._complete(number, objective_number)
                 return True
         return False
 
@@ -504,12 +616,12 @@ class QuestManager:
     def check_room_objectives(self, room_name):
         """
         Check all active quests for room-related objectives.
-        
+
         Args:
             room_name (str): The name of the room visited.
-            
+
         Examples:
-        
+
         >>> manager = QuestManager()
         >>> quest = Quest("Visit Places", "Visit rooms", ["Visiter Library"])
         >>> manager.add_quest(quest)
@@ -527,22 +639,19 @@ class QuestManager:
         >>> len(manager.active_quests)
         0
         """
-        for quest in self.active_quests[:]:  # Use slice to avoid modification during iteration
-            quest.check_room_objective(room_name, self.player)
-            if quest.is_completed:
-                self.active_quests.remove(quest)
+        self._complete_first((VISIT, room_name))
 
 
     def check_action_objectives(self, action, target=None):
         """
         Check all active quests for action-related objectives.
-        
+
         Args:
             action (str): The action performed.
             target (str): Optional target of the action.
-            
+
         Examples:
-        
+
         >>> manager = QuestManager()
         >>> quest = Quest("Actions", "Do actions", ["parler avec roi"])
         >>> manager.add_quest(quest)
@@ -559,23 +668,101 @@ class QuestManager:
         <BLANKLINE>
         >>> len(manager.active_quests)
         0
+        >>> manager.counters["parler"]
+        1
         """
-        for quest in self.active_quests[:]:
-            quest.check_action_objective(action, target, self.player)
-            if quest.is_completed:
-                self.active_quests.remove(quest)
+        self._complete_first((action, target or None))
+        self.increment_counter(action)
+
+
+    def check_batch_action_objectives(self, action, targets):
+        """
+        Check all active quests for the objectives completed by the same action on several targets,
+        in a single pass over the quests (e.g. after taking all the Items of a room).
+
+        Args:
+            action (str): The action performed.
+            targets (list): The targets of the action.
+
+        Examples:
+
+        >>> manager = QuestManager()
+        >>> quest = Quest("Loot", "Take things", ["Prendre sword", "Prendre le shield", "Prendre ring"])
+        >>> manager.add_quest(quest)
+        >>> manager.activate_quest("Loot") # doctest: +NORMALIZE_WHITESPACE
+        <BLANKLINE>
+        🗡️  Nouvelle quête activée: Loot
+        📝 Take things
+        <BLANKLINE>
+        True
+        >>> manager.check_batch_action_objectives("Prendre", ["sword", "shield", "torch"])
+        ✅ Objectif accompli: Prendre sword
+        <BLANKLINE>
+        ✅ Objectif accompli: Prendre le shield
+        <BLANKLINE>
+        >>> manager.is_completed(quest)
+        False
+        """
+        found = {}
+        for target in dict.fromkeys(targets):
+            for number, objective_number in self._pending.get((action, target), ()):
+                found.setdefault(number, []).append(objective_number)
+        # The quests in their order, the objectives of each in their order in the quest.
+        for number in sorted(found):
+            for objective_number in sorted(found[number]):
+                self._complete(number, objective_number)
+        if targets:
+            self.increment_counter(action, len(targets))
+
+
+    def increment_counter(self, counter_name, amount=1):
+        """
+        Add to a counter of the player, and complete the objectives whose threshold it reaches.
+
+        Args:
+            counter_name (str): The name of what is being counted.
+            amount (int): The number to add (default: 1).
+
+        Returns:
+            int: The new value of the counter.
+
+        Examples:
+
+        >>> manager = QuestManager()
+        >>> manager.add_quest(Quest("Walker", "Walk a lot", ["Se déplacer 2 fois", "Se déplacer 3 fois"]))
+        >>> manager.activate_quest("Walker") # doctest: +NORMALIZE_WHITESPACE
+        <BLANKLINE>
+        🗡️  Nouvelle quête activée: Walker
+        📝 Walk a lot
+        <BLANKLINE>
+        True
+        >>> manager.increment_counter(MOVES)
+        1
+        >>> manager.increment_counter(MOVES, 2) # doctest: +NORMALIZE_WHITESPACE
+        ✅ Objectif accompli: Se déplacer 2 fois
+        <BLANKLINE>
+        ✅ Objectif accompli: Se déplacer 3 fois
+        <BLANKLINE>
+        🏆 Quête terminée: Walker
+        <BLANKLINE>
+        3
+        """
+        value = self.counters.get(counter_name, 0) + amount
+        self.counters[counter_name] = value
+        self.check_counter_objectives(counter_name, value)
+        return value
 
 
     def check_counter_objectives(self, counter_name, current_count):
         """
         Check all active quests for counter-related objectives.
-        
+
         Args:
             counter_name (str): The name of what is being counted.
             current_count (int): The current count.
-            
+
         Examples:
-        
+
         >>> manager = QuestManager()
         >>> quest = Quest("Counter", "Count things", ["Compter 3 fois"])
         >>> manager.add_quest(quest)
@@ -596,21 +783,27 @@ class QuestManager:
         >>> len(manager.active_quests)
         0
         """
-        for quest in self.active_quests[:]:
-            quest.check_counter_objective(counter_name, current_count, self.player)
-            if quest.is_completed:
-                self.active_quests.remove(quest)
+        # Only the thresholds crossed are popped, the lowest first; the others stay in the heap.
+        heap = self._counters.get(counter_name)
+        while heap and heap[0][0] <= current_count:
+            required, number, objective_number = heapq.heappop(heap)
+            progress = self.progress.get(number)
+            # The objective may have been completed otherwise since it was indexed.
+            if progress is not None and not progress >> objective_number & 1:
+                self._complete(number, objective_number)
+        if heap is not None and not heap:
+            del self._counters[counter_name]
 
 
     def get_active_quests(self):
         """
         Get all active quests.
-        
+
         Returns:
             list: List of active quests.
-            
+
         Examples:
-        
+
         >>> manager = QuestManager()
         >>> quest = Quest("Active Quest", "An active quest")
         >>> manager.add_quest(quest)
@@ -631,12 +824,12 @@ class QuestManager:
     def get_all_quests(self):
         """
         Get all quests.
-        
+
         Returns:
             list: List of all quests.
-            
+
         Examples:
-        
+
         >>> manager = QuestManager()
         >>> quest1 = Quest("Q1", "First")
         >>> quest2 = Quest("Q2", "Second")
@@ -651,15 +844,15 @@ class QuestManager:
     def get_quest_by_title(self, title):
         """
         Get a quest by its title.
-        
+
         Args:
             title (str): The title of the quest.
-            
+
         Returns:
             Quest: The quest if found, None otherwise.
-            
+
         Examples:
-        
+
         >>> manager = QuestManager()
         >>> quest1 = Quest("Find Key", "Find the golden key")
         >>> quest2 = Quest("Open Door", "Open the locked door")
@@ -671,18 +864,16 @@ class QuestManager:
         >>> manager.get_quest_by_title("Unknown") is None
         True
         """
-        for quest in self.quests:
-            if quest.title == title:
-                return quest
-        return None
+        number = self._titles.get(title)
+        return self.quests[number] if number is not None else None
 
 
     def show_quests(self):
         """
         Display all quests and their status.
-        
+
         Examples:
-        
+
         >>> manager = QuestManager()
         >>> manager.show_quests()
         <BLANKLINE>
@@ -696,26 +887,19 @@ class QuestManager:
         ❓ Display Quest (Non activée)
         <BLANKLINE>
         """
-        if not self.quests:
-            print("\nAucune quête disponible.\n")
-            return
-
-        print("\n📋 Liste des quêtes:")
-        for quest in self.quests:
-            print(f"  {quest.get_status()}")
-        print()
+        publish(QuestList(self))
 
 
     def show_quest_details(self, quest_title, current_counts=None):
         """
         Show detailed information about a specific quest.
-        
+
         Args:
             quest_title (str): The title of the quest.
             current_counts (dict): Optional dictionary with current counter values.
-            
+
         Examples:
-        
+
         >>> manager = QuestManager()
         >>> quest = Quest("Detail Quest", "Show details", ["Task"])
         >>> manager.add_quest(quest)
@@ -734,6 +918,6 @@ class QuestManager:
         """
         quest = self.get_quest_by_title(quest_title)
         if quest:
-            print(quest.get_details(current_counts))
+            say(quest.get_details(self._completed_bits(self._numbers[quest]), current_counts))
         else:
-            print(f"\nQuête '{quest_title}' non trouvée.\n")
\ No newline at end of file
+            say(f"\nQuête '{quest_title}' non trouvée.\n")
@@ -0,0 +1,93 @@
+# Description: headless replay of command scripts.
+#
+# Each script is a text file with one command per line ('-' reads the commands from the standard input).
+# The commands are streamed into a Game without any interface, and the transcript of the session (each
+# command followed by what the game answered) is written next to the script, in <script>.transcript, or
+# on the standard output for '-'. Several scripts are replayed in parallel by a pool of processes, and a
+# summary of the throughput is printed on the standard error.
+# Usage: python game.py --script session1.txt session2.txt [--jobs 8] [--seed 0] [--world worlds/default.json]
+
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from world import DEFAULT_WORLD
+
+# Suffix of the transcript written next to each script.
+TRANSCRIPT_SUFFIX = ".transcript"
+
+
+def replay(path, world_path=DEFAULT_WORLD, seed=None, output_dir=None):
+    """
+    Replay a script in a new game and write its transcript.
+
+    Args:
+        path (str): The path of the script, or '-' for the standard input.
+        world_path (str | Path): The world to play in.
+        seed (int): The seed of the random moves of the NPCs, None for a random one.
+        output_dir (str | Path): The directory of the transcript, None for the directory of the script.
+
+    Returns:
+        tuple: The path, the number of commands run, the number of commands that failed and the duration in seconds.
+    """
+    # Imported here so that a worker process only loads the game when it starts replaying.
+    from game import Game
+
+    start = time.perf_counter()
+    if seed is not None:
+        random.seed(seed)
+    game = Game()
+    game.setup("Script", world_path=world_path)
+
+    commands = failures = 0
+    source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    if path == "-":
+        target = sys.stdout
+    else:
+        directory = Path(output_dir) if output_dir is not None else Path(path).parent
+        target = open(directory / (Path(path).name + TRANSCRIPT_SUFFIX), "w", encoding="utf-8")
+    try:
+        for result in game.run_script(source):
+            commands += 1
+            failures += not result.success
+            target.write(f"> {result.command}\n{result.text}")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    return path, commands, failures, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="game.py --script", description="Rejouer des scripts de commandes sans interface.")
+    parser.add_argument("scripts", nargs="+", help="fichiers de commandes, une par ligne ('-' pour l'entrée standard)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="nombre de processus (par défaut : un par cœur)")
+    parser.add_argument("--seed", type=int, default=None, help="graine des déplacements des personnages")
+    parser.add_argument("--world", default=str(DEFAULT_WORLD), help="monde dans lequel jouer")
+    parser.add_argument("--output", default=None, help="dossier des transcriptions (par défaut : celui de chaque script)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    jobs = max(1, min(args.jobs or 1, len(args.scripts)))
+    # The standard input can only be read by this process.
+    if jobs == 1 or "-" in args.scripts:
+        results = [replay(path, args.world, args.seed, args.output) for path in args.scripts]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(replay, args.scripts, [args.world] * len(args.scripts),
+                                    [args.seed] * len(args.scripts), [args.output] * len(args.scripts)))
+    elapsed = time.perf_counter() - start
+
+    commands = sum(result[1] for result in results)
+    failures = sum(result[2] for result in results)
+    print(f"{len(results)} script(s), {commands} commandes ({failures} en échec) en {elapsed:.2f} s "
+          f"avec {jobs} processus : {commands / elapsed if elapsed else 0:.0f} commandes/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
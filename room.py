@@ -1,5 +1,15 @@
 # Define the Room class.
 
+import sys
+from types import MappingProxyType
+
+from graph import ExitMap
+from inventory import Inventory
+from observed import MISSING, ObservedDict
+
+# Shared read-only mapping standing in for the dicts that have not been created yet.
+_EMPTY = MappingProxyType({})
+
 class Room:
     """
     This class represents a room. A room is composed of a name, a description, an inventory and at least one exit.
@@ -8,10 +18,19 @@ class Room:
         name (str) : The name of the room.
         description (str) : A detailed description of the room.
         exits (dict) : a dict object. The keys are the directions, and the value associated with a key is the corresponding room.
-        inventory(dict) : a dict object that lists all the Items that are present in the room. Keys are the names of the Items, and the values are the corresponding Item objects.
+        inventory(Inventory) : a counted inventory that lists all the Items that are present in the room. Keys are the names of the Items, and the values are the corresponding Item objects, with their number of units.
         characters(dict) : a dict object that lists the characters that are present in the room. Keys are the names of the characters, and the values are the corresponding Character objects.
         is_dark (bool) : Indicates if the room is dark; if so, the player cannot use certain commands in this Room.
         image (str) : Path to image file (PNG/JPG) for this room
+        id (int) : The integer id of the room in its RoomGraph, or None if the room is not part of a graph.
+        graph (RoomGraph) : The graph that stores the exits of the room, or None. Without a graph, the exits are a plain dict.
+
+    Rooms are slotted, and their exits (without graph), inventory and characters dicts are only created
+    the first time they are accessed: most rooms of a large world never hold anything.
+    The strings returned by get_exit_string, get_long_description and get_inventory are cached until
+    the exits, the darkness, the inventory or the characters of the room change; the dicts are
+    ObservedDict objects (an Inventory for the Items) that report their changes to the room, which
+    passes the changes of the inventory and of the characters on to the observers of its graph.
 
     Methods : 
         __init__(self, name, description) : The constructor.
@@ -19,6 +38,9 @@ class Room:
         get_exit_string(self) : The string listing all of the available exits/directions. 
         get_long_description(self) : The detailed description of the room, followed by the exits list. 
         get_inventory(self) : Return a string listing the Items and the Characters that are in the room.
+        get_neighbours(self) : Return the list of the rooms that can be reached from this room in one move.
+        get_entrances(self) : Return the list of the rooms that have an exit leading to this room.
+        get_direction_to(self, room) : Return the direction leading from this room to the given room, or None.
 
     Examples :
 
@@ -42,6 +64,9 @@ class Room:
 
     """
 
+    __slots__ = ("name", "description", "_is_dark", "image", "id", "graph",
+                 "_exits", "_inventory", "_characters", "_render", "__weakref__")
+
     # Define the constructor.
     def __init__(self, name, description, is_dark, image = None):
         """
@@ -57,13 +82,95 @@ class Room:
         >>> room.image is None
         True
         """
-        self.name = name
+        # Names and images are shared between rooms, generated worlds reusing the same ones many times.
+        self.name = sys.intern(name)
         self.description = description
+        self.id = None
+        self.graph = None
+        self._render = None
         self.is_dark = is_dark
-        self.image = image
-        self.exits = {}
-        self.inventory = {}
-        self.characters = {}
+        self.image = image and sys.intern(image)
+        self._exits = None
+        self._inventory = None
+        self._characters = None
+
+    # The darkness is mirrored in the RoomGraph, where it changes the routes across the map.
+    @property
+    def is_dark(self):
+        return self._is_dark
+
+    @is_dark.setter
+    def is_dark(self, is_dark):
+        self._is_dark = is_dark
+        self._render = None
+        if self.graph is not None:
+            self.graph.set_dark(self.id, is_dark)
+
+    # The exits are stored in the RoomGraph when the room belongs to one, in a dict otherwise.
+    @property
+    def exits(self):
+        if self.graph is not None:
+            return ExitMap(self.graph, self.id)
+        if self._exits is None:
+            self._exits = ObservedDict(self._contents_changed)
+        return self._exits
+
+    @exits.setter
+    def exits(self, exits):
+        if self.graph is not None:
+            self.graph.set_exits(self.id, exits)
+        else:
+            self._exits = ObservedDict(self._contents_changed, exits)
+            self._render = None
+
+    # The inventory and the characters dicts are created on first access.
+    @property
+    def inventory(self):
+        if self._inventory is None:
+            self._inventory = Inventory(self._inventory_changed)
+        return self._inventory
+
+    @inventory.setter
+    def inventory(self, inventory):
+        self._inventory = Inventory(self._inventory_changed, inventory, getattr(inventory, "counts", None))
+        self._render = None
+        for name, item in self._inventory.items():
+            self._inventory_changed(name, MISSING, item)
+
+    @property
+    def characters(self):
+        if self._characters is None:
+            self._characters = ObservedDict(self._characters_changed)
+        return self._characters
+
+    @characters.setter
+    def characters(self, characters):
+        self._characters = ObservedDict(self._characters_changed, characters)
+        self._render = None
+        for name, character in self._characters.items():
+            self._characters_changed(name, MISSING, character)
+
+    # Called by the observed dicts of the room after each change.
+    def _contents_changed(self, key, old, new):
+        self._render = None
+
+    def _inventory_changed(self, key, old, new):
+        self._render = None
+        if self.graph is not None and self.graph.observers:
+            self.graph.notify_contents(self, "inventory", key, old, new)
+
+    def _characters_changed(self, key, old, new):
+        self._render = None
+        if self.graph is not None and self.graph.observers:
+            self.graph.notify_contents(self, "characters", key, old, new)
+
+    # Return the dict of the cached strings, emptied if the room (or, for the exits, the graph) changed.
+    def _get_render(self):
+        render = self._render
+        version = self.graph.version if self.graph is not None else None
+        if render is None or render["version"] != version:
+            render = self._render = {"version": version}
+        return render
     
     # Define the get_exit method.
     def get_exit(self, direction):
@@ -80,10 +187,9 @@ class Room:
         """
 
         # Return the room in the given direction if it exists.
-        if direction in self.exits.keys():
-            return self.exits[direction]
-        else:
-            return None
+        if self.graph is not None:
+            return self.graph.get_exit(self.id, direction)
+        return self._exits.get(direction) if self._exits else None
     
     # Return a string describing the room's exits.
     def get_exit_string(self):
@@ -98,13 +204,71 @@ class Room:
         >>> room1.get_exit_string() # doctest: +ELLIPSIS
         'Sorties: N'
         """
-        exit_string = "Sorties: " 
-        for exit in self.exits.keys():
-            if self.exits.get(exit) is not None:
-                exit_string += exit + ", "
-        exit_string = exit_string.strip(", ")
+        render = self._get_render()
+        exit_string = render.get("exits")
+        if exit_string is None:
+            if self.graph is not None:
+                directions = self.graph.get_exit_directions(self.id)
+            else:
+                directions = [exit for exit, room in (self._exits or _EMPTY).items() if room is not None]
+            exit_string = render["exits"] = ("Sorties: " + ", ".join(directions)).strip()
         return exit_string
 
+    # Return the rooms that can be reached from this room in one move.
+    def get_neighbours(self):
+        """
+        Return the list of the rooms that can be reached from this room in one move, in the order of the directions.
+
+        >>> room1 = Room("Room1", "dans une pièce", False)
+        >>> room2 = Room("Room2", "dans une autre pièce", False)
+        >>> room1.exits = {"N": room2, "S": None}
+        >>> [room.name for room in room1.get_neighbours()]
+        ['Room2']
+        """
+        if self.graph is not None:
+            rooms = self.graph.rooms
+            return [rooms[room_id] for room_id in self.graph.get_neighbours(self.id)]
+        return [room for room in (self._exits or _EMPTY).values() if room is not None]
+
+    # Return the rooms that lead to this room.
+    def get_entrances(self):
+        """
+        Return the list of the rooms that have an exit leading to this room. Without a graph, the rooms
+        do not know their entrances and the list is empty.
+
+        >>> from graph import RoomGraph
+        >>> graph = RoomGraph(("N", "S"))
+        >>> room1 = Room("Room1", "dans une pièce", False)
+        >>> room2 = Room("Room2", "dans une autre pièce", False)
+        >>> _ = graph.add_room(room1), graph.add_room(room2)
+        >>> room1.exits = {"N": room2}
+        >>> [room.name for room in room2.get_entrances()]
+        ['Room1']
+        """
+        if self.graph is None:
+            return []
+        rooms = self.graph.rooms
+        return [rooms[room_id] for room_id in self.graph.get_entrances(self.id)]
+
+    # Return the direction leading from this room to another one.
+    def get_direction_to(self, room):
+        """
+        Return the first direction (in the order of the directions) leading from this room to the given room,
+        or None if the room cannot be reached in one move.
+
+        >>> room1 = Room("Room1", "dans une pièce", False)
+        >>> room2 = Room("Room2", "dans une autre pièce", False)
+        >>> room1.exits = {"N": None, "E": room2}
+        >>> room1.get_direction_to(room2), room2.get_direction_to(room1)
+        ('E', None)
+        """
+        if self.graph is not None and room.graph is self.graph:
+            return self.graph.direction_to(self.id, room.id)
+        for direction, exit_room in (self._exits or _EMPTY).items():
+            if exit_room is room:
+                return direction
+        return None
+
     # Return a long description of this room including exits.
     def get_long_description(self):
         """
@@ -120,24 +284,37 @@ class Room:
         Sorties: N
         <BLANKLINE>
         """
-        if self.is_dark :
-            return f"\nVous êtes {self.description}\n\nImpossible de se repérer, il fait trop sombre.\n"
-        return f"\nVous êtes {self.description}\n\n{self.get_exit_string()}\n"
+        render = self._get_render()
+        description = render.get("long")
+        if description is None:
+            if self.is_dark :
+                description = f"\nVous êtes {self.description}\n\nImpossible de se repérer, il fait trop sombre.\n"
+            else:
+                description = f"\nVous êtes {self.description}\n\n{self.get_exit_string()}\n"
+            render["long"] = description
+        return description
 
     #Define the get_inventory method.
     def get_inventory(self) :
 
+        render = self._get_render()
+        inventory_string = render.get("inventory")
+        if inventory_string is not None:
+            return inventory_string
+
         #If the inventory is empty, return a string indicating that no Item is present in the Room.
-        if len(self.inventory) == 0 and len(self.characters) == 0 :
-            return "\nIl n'y a rien ici.\n"
+        if not self._inventory and not self._characters :
+            render["inventory"] = "\nIl n'y a rien ici.\n"
+            return render["inventory"]
 
         inventory_string = "\nOn voit : \n"
         
-        for item in self.inventory.values() :
-            #For each Item in the Room, list its name, description and weight.
-            inventory_string += f"\t - {item.name} : {item.description} ({item.weight} kg)\n"
+        for item, count in (self._inventory.stacks() if self._inventory else ()) :
+            #For each Item in the Room, list its name, description and weight, and its number of units if there are several.
+            inventory_string += f"\t - {item.name} : {item.description} ({item.weight} kg){f' x{count}' if count > 1 else ''}\n"
 
-        for character in self.characters.values() :
+        for character in (self._characters or _EMPTY).values() :
             #For each character in the Room, list their name and description.
             inventory_string += f"\t - {character.name} : {character.description}\n"
+        render["inventory"] = inventory_string
         return inventory_string
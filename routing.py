@@ -0,0 +1,109 @@
+# Define the Router class.
+
+from collections import OrderedDict, deque
+
+
+class Router:
+    """
+    This class computes the shortest routes between the rooms of a RoomGraph. A route follows the exits,
+    so one-way passages are only taken in their direction, and never leaves a dark room other than the
+    last one: like the 'go' command, the player cannot move in the dark.
+
+    The routes are cached and the cache is dropped as soon as the graph changes (an exit, or the darkness
+    of a room), which is tracked with the version of the graph. When the analysis of the world is given,
+    a room that cannot be reached from the start is known to be out of reach without any search.
+
+    Attributes:
+        graph (RoomGraph) : The graph the routes are computed on.
+        max_routes (int) : The maximum number of routes kept in the cache.
+        report (WorldReport) : The analysis of the world, or None. It is only used while the exits are those it was computed on.
+
+    Methods:
+        __init__(self, graph, max_routes, report) : The constructor.
+        route(self, source, target) : Return the list of the directions leading from source to target, or None.
+
+    Examples:
+
+    >>> from graph import RoomGraph
+    >>> from room import Room
+    >>> graph = RoomGraph(("N", "E", "S", "O"))
+    >>> rooms = [Room(name, "dans une pièce", False) for name in ("A", "B", "C")]
+    >>> _ = [graph.add_room(room) for room in rooms]
+    >>> rooms[0].exits = {"E": rooms[1]}
+    >>> rooms[1].exits = {"S": rooms[2], "O": rooms[0]}
+    >>> router = Router(graph)
+    >>> router.route(rooms[0], rooms[2])
+    ['E', 'S']
+    >>> router.route(rooms[2], rooms[0]) is None
+    True
+    >>> rooms[1].is_dark = True
+    >>> router.route(rooms[0], rooms[2]) is None
+    True
+    """
+
+    # Define the constructor.
+    def __init__(self, graph, max_routes=4096, report=None):
+        self.graph = graph
+        self.max_routes = max_routes
+        self.report = report
+        self._routes = OrderedDict()
+        self._version = graph.version
+
+    # Define the route method.
+    def route(self, source, target):
+        if self._version != self.graph.version:
+            self._routes.clear()
+            self._version = self.graph.version
+
+        key = (source.id, target.id)
+        if key in self._routes:
+            self._routes.move_to_end(key)
+            route = self._routes[key]
+        else:
+            route = self._search(source.id, target.id)
+            self._routes[key] = route
+            if len(self._routes) > self.max_routes:
+                self._routes.popitem(last=False)
+        return None if route is None else list(route)
+
+    # Breadth-first search from source to target, returning the tuple of the directions or None.
+    def _search(self, source, target):
+        if source == target:
+            return ()
+        graph = self.graph
+        dark = graph._dark
+        if dark[source]:
+            return None
+        # Every room reachable from a room reachable from the start is reachable from the start too.
+        report = self.report
+        if (report is not None and report.exits_version == graph.exits_version
+                and report.reachable[source] and not report.reachable[target]):
+            return None
+        # No search is needed when no lit room leads to the target.
+        if not any(not dark[entrance] for entrance in graph.get_entrances(target)):
+            return None
+        parents = {source: None}
+        queue = deque([source])
+        while queue:
+            room_id = queue.popleft()
+            for direction, next_id in graph.get_exit_slots(room_id):
+                if next_id in parents:
+                    continue
+                parents[next_id] = (room_id, direction)
+                if next_id == target:
+                    return self._path(parents, target)
+                # A dark room can end a route, but the player cannot go further from it.
+                if not dark[next_id]:
+                    queue.append(next_id)
+        return None
+
+    # Rebuild the directions from the parents found by the search.
+    def _path(self, parents, target):
+        directions = []
+        step = parents[target]
+        while step is not None:
+            room_id, direction = step
+            directions.append(direction)
+            step = parents[room_id]
+        directions.reverse()
+        return tuple(directions)
@@ -0,0 +1,183 @@
+# Define the SearchIndex class, an inverted index over the texts of the world.
+
+import functools
+import re
+import unicodedata
+from array import array
+
+from observed import MISSING
+
+# Words too common in the descriptions to be worth indexing.
+STOP_WORDS = frozenset(("au", "aux", "avec", "ce", "ces", "dans", "de", "des", "du", "en", "et", "il", "la", "le",
+                        "les", "leur", "ne", "ou", "par", "pas", "pour", "qu", "que", "qui", "sa", "se", "ses", "son",
+                        "sur", "un", "une", "vous", "est"))
+_WORD = re.compile(r"\w+")
+# The combining accents left apart by the NFD normalization ("é" becomes "e" followed by U+0301).
+_ACCENTS = re.compile("[\u0300-\u036f]")
+# The number of rooms, Items and NPCs returned by a search, and of rooms given for each Item.
+MAX_RESULTS = 10
+
+
+def normalize(text):
+    """
+    Return a text in lowercase and without accents, so that texts typed without them still match.
+
+    >>> normalize("La requête du Souverain")
+    'la requete du souverain'
+    """
+    text = text.casefold()
+    if not text.isascii():
+        text = _ACCENTS.sub("", unicodedata.normalize("NFD", text))
+    return text
+
+
+@functools.lru_cache(maxsize=4096)
+def tokenize(text):
+    """
+    Return the set of the words of a text that are indexed: lowercase, without accents, without the
+    one-letter words and the most common French words. Generated worlds reuse the same descriptions
+    many times, hence the cache.
+
+    >>> sorted(tokenize("Une épée forgée dans l'Été"))
+    ['epee', 'ete', 'forgee']
+    """
+    return frozenset(word for word in _WORD.findall(normalize(text)) if len(word) > 1 and word not in STOP_WORDS)
+
+
+class SearchIndex:
+    """
+    This class is an inverted index over the names and descriptions of the rooms, the names and
+    descriptions of the Items and the names, descriptions and messages of the NPCs. Each indexed
+    word gives the rooms, Items and NPCs whose texts contain it, so that a search does not go through
+    the whole world.
+
+    The index observes the graph of the world: the Items and NPCs entering a room are indexed, and
+    the rooms of each Item (an Item may lie in several rooms) are kept up to date. With a world store, a room is indexed when it is loaded.
+    A search returns at most limit results of each kind: only the rooms returned are loaded, and the
+    rooms of an Item are given by their names, which the index keeps.
+
+    Attributes:
+        world (World) : The indexed world.
+        player (Player) : The player, whose inventory is searched too.
+
+    Methods:
+        __init__(self, world, player) : The constructor.
+        search(self, text, limit) : Return the first rooms, Items (with the names of their rooms and whether the player carries them) and NPCs whose texts contain all the words of the text.
+        room_added(self, room) : Index a room and its contents.
+        contents_changed(self, room, attribute, key, old, new) : Keep the index up to date after a change in a room.
+
+    Examples:
+
+    >>> from world import load_world
+    >>> from player import Player
+    >>> world = load_world()
+    >>> index = SearchIndex(world, Player("Sam"))
+    >>> rooms, items, characters = index.search("chateau")
+    >>> [room.name for room in rooms]
+    ['Castle']
+    >>> [(item.name, room_names, carried) for item, room_names, carried in index.search("épée")[1]]
+    [('sword', ['Castle'], False)]
+    >>> [room_names for item, room_names, carried in index.search("argent")[1]]
+    [['VillageSouth', 'Castle', 'Stable']]
+    >>> [room_names for item, room_names, carried in index.search("argent", limit=2)[1]]
+    [['VillageSouth', 'Castle']]
+    >>> [room.name for room in index.search("village")[0]], [room.name for room in index.search("village", limit=1)[0]]
+    (['VillageNorth', 'VillageSouth'], ['VillageNorth'])
+    >>> [character.name for character in index.search("roi")[2]]
+    ['King']
+    """
+
+    # Define the constructor.
+    def __init__(self, world, player):
+        self.world = world
+        self.player = player
+        # Rooms are indexed by id in arrays, Items and NPCs by name in sets.
+        self._rooms = {}
+        self._items = {}
+        self._characters = {}
+        self._item_objects = {}
+        # The ids of the rooms where each Item lies, and the names of the rooms indexed so far.
+        self._item_rooms = {}
+        self._room_names = {}
+        self._character_objects = {}
+
+        # With a world store, only the rooms loaded so far are indexed; the others are indexed when they are loaded.
+        rooms = world.store.resident() if world.store is not None else world.rooms
+        for room in rooms:
+            self.room_added(room)
+        for item in player.inventory.values():
+            self._add_item(item)
+        world.graph.observers.append(self)
+
+    # Define the search method.
+    def search(self, text, limit=MAX_RESULTS):
+        words = tokenize(text)
+        if not words:
+            return [], [], []
+        room_ids = set.intersection(*(set(self._rooms.get(word, ())) for word in words))
+        item_names = set.intersection(*(self._items.get(word, set()) for word in words))
+        character_names = set.intersection(*(self._characters.get(word, set()) for word in words))
+
+        # Only the rooms returned are built: with a world store, the others stay in the file.
+        found_rooms = [self.world.rooms[room_id] for room_id in sorted(room_ids)[:limit]]
+        found_items = []
+        for name in sorted(item_names):
+            room_names = [self._room_names[room_id] for room_id in sorted(self._item_rooms.get(name, ()))[:limit]]
+            carried = name in self.player.inventory
+            # An Item that is neither in a room nor carried by the player has been used up.
+            if room_names or carried:
+                found_items.append((self._item_objects[name], room_names, carried))
+                if len(found_items) == limit:
+                    break
+        found_characters = [self._character_objects[name] for name in sorted(character_names)[:limit]]
+        return found_rooms, found_items, found_characters
+
+    # Define the room_added method.
+    def room_added(self, room):
+        if room.id not in self._room_names:
+            self._room_names[room.id] = room.name
+            for word in tokenize(room.name) | tokenize(room.description):
+                postings = self._rooms.get(word)
+                if postings is None:
+                    postings = self._rooms[word] = array("i")
+                postings.append(room.id)
+        for name, item in (room._inventory or {}).items():
+            self.contents_changed(room, "inventory", name, MISSING, item)
+        for name, character in (room._characters or {}).items():
+            self.contents_changed(room, "characters", name, MISSING, character)
+
+    # Define the contents_changed method.
+    def contents_changed(self, room, attribute, key, old, new):
+        if attribute == "inventory":
+            if new is not MISSING:
+                self._add_item(new)
+                self._item_rooms.setdefault(key, set()).add(room.id)
+            else:
+                room_ids = self._item_rooms.get(key)
+                if room_ids is not None:
+                    room_ids.discard(room.id)
+                    if not room_ids:
+                        del self._item_rooms[key]
+        elif attribute == "characters" and new is not MISSING:
+            self._add_character(new)
+
+    # Index the texts of an Item, the first time it is seen. A world store may build the same Item again.
+    def _add_item(self, item):
+        known = item.name in self._item_objects
+        self._item_objects[item.name] = item
+        if known:
+            return
+        for word in tokenize(item.name) | tokenize(item.description):
+            self._items.setdefault(word, set()).add(item.name)
+
+    # Index the texts of an NPC, the first time it is seen. The NPC knows its room.
+    def _add_character(self, character):
+        known = character.name in self._character_objects
+        self._character_objects[character.name] = character
+        if known:
+            return
+        words = tokenize(character.name) | tokenize(character.description)
+        for msg in character.msgs:
+            words |= tokenize(msg)
+        for word in words:
+            self._characters.setdefault(word, set()).add(character.name)
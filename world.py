@@ -0,0 +1,350 @@
+# Define the World class and the world pack loader.
+
+import json
+import functools
+import pickle
+import struct
+from pathlib import Path
+
+from analysis import analyze_world
+from graph import RoomGraph
+from room import Room
+from item import Item, ItemUse
+from behaviors import BEHAVIORS
+from character import Character
+from quest import Quest
+
+# The fields of the "use" section of an Item, as expected by ItemUse.
+USE_KEYS = frozenset(("behavior", "message", "dark_message", "rooms", "room_message"))
+
+# Path of the world pack used when the game is started without an explicit world.
+DEFAULT_WORLD = Path(__file__).parent / "worlds" / "default.json"
+
+# Header of a compiled snapshot: a magic number, the modification time (ns) and the size of
+# the source world pack, in the same spirit as the .pyc files, and a stamp of the modules
+# whose classes are pickled (and of the modules building them) so that a snapshot never outlives the
+# code that wrote it.
+SNAPSHOT_MAGIC = b"TBAWRLD1"
+SNAPSHOT_HEADER = struct.Struct("<8sQQQ")
+SNAPSHOT_MODULES = ("world.py", "analysis.py", "graph.py", "room.py", "observed.py", "inventory.py", "item.py",
+                    "behaviors.py", "character.py", "quest.py", "objective.py")
+
+# The stamps and the Quests of each world pack, by resolved path: a Quest only holds its definition (the
+# progress of a player is kept by their QuestManager), so all the worlds loaded from the same pack share
+# the same Quests instead of unpickling copies of them. The Quests of an edited pack replace the old ones.
+_QUESTS = {}
+
+
+class World:
+    """
+    This class represents a fully built world: the rooms, the Items and the characters they contain,
+    the quests and the starting state of the player.
+
+    Attributes:
+        rooms (list) : The list of all the Rooms, in the order of the world pack.
+        characters (dict) : The NPCs of the world. Keys are the names of the characters, and the values are the corresponding Character objects.
+        quests (list) : The list of the Quests available in the world.
+        victory (tuple) : The titles of the quests to complete to win, None for all the quests.
+        directions (dict) : The valid words for each direction. Keys are the directions (N, E, S, O, U, D), values are lists of compatible words.
+        rooms_by_name (dict) : The Rooms keyed by name.
+        graph (RoomGraph) : The integer-indexed graph that stores the exits of the rooms.
+        start_room (Room) : The room where the player starts.
+        player_inventory (list) : The Items the player starts with, one per unit (an Item may be repeated).
+        store (WorldStore) : The store the rooms are loaded from when the world is kept in a world store file, None otherwise.
+        report (WorldReport) : The analysis of the map, computed when the world is built and stored in the snapshot.
+
+    Methods:
+        __init__(self) : The constructor.
+        get_room(self, name) : Return the Room with the given name, or None.
+        analyze(self) : Return the analysis of the map, computed again only if an exit changed since the last one.
+
+    Examples:
+
+    >>> world = build_world({"start": "Hall",
+    ...                      "directions": {"N": ["N", "n"], "S": ["S", "s"]},
+    ...                      "rooms": [{"name": "Hall", "description": "dans un hall", "exits": {"N": "Kitchen"}},
+    ...                                {"name": "Kitchen", "description": "dans une cuisine", "exits": {"S": "Hall"}}]})
+    >>> world.start_room.name
+    'Hall'
+    >>> world.get_room("Hall").exits["N"].name
+    'Kitchen'
+    """
+
+    # Define the constructor.
+    def __init__(self):
+        self.rooms = []
+        self.characters = {}
+        self.quests = []
+        self.victory = None
+        self.directions = {}
+        self.rooms_by_name = {}
+        self.graph = None
+        self.start_room = None
+        self.player_inventory = []
+        self.store = None
+        self.report = None
+
+    # Define the get_room method.
+    def get_room(self, name):
+        return self.rooms_by_name.get(name)
+
+    # Define the analyze method.
+    def analyze(self):
+        if self.report is None or self.report.exits_version != self.graph.exits_version:
+            self.report = analyze_world(self)
+        return self.report
+
+
+def validate_pack(pack):
+    """
+    Check that a world pack is consistent before building it.
+
+    Args:
+        pack (dict): The decoded world pack.
+
+    Raises:
+        ValueError: If the pack is malformed. The message lists every problem found.
+
+    Examples:
+
+    >>> validate_pack({"start": "Hall", "directions": {"N": ["N"]},
+    ...                "rooms": [{"name": "Hall", "description": "dans un hall", "exits": {"N": "Nowhere"}}]})
+    Traceback (most recent call last):
+    ...
+    ValueError: Monde invalide :
+      - la salle 'Hall' a une sortie N vers une salle inconnue 'Nowhere'
+    """
+    errors = []
+
+    directions = pack.get("directions")
+    if not isinstance(directions, dict) or not directions:
+        errors.append("la section 'directions' est absente ou vide")
+        directions = {}
+
+    room_names = set()
+    for room in pack.get("rooms", []):
+        name = room.get("name")
+        if not name or not isinstance(room.get("description"), str):
+            errors.append(f"la salle {name!r} doit avoir un nom et une description")
+            continue
+        if name in room_names:
+            errors.append(f"la salle '{name}' est définie plusieurs fois")
+        room_names.add(name)
+    if not room_names:
+        errors.append("le monde ne contient aucune salle")
+
+    items = pack.get("items", {})
+    for name, item in items.items():
+        if not isinstance(item.get("description"), str) or not isinstance(item.get("weight"), (int, float)):
+            errors.append(f"l'objet '{name}' doit avoir une description et un poids")
+        use = item.get("use")
+        if use is not None:
+            for key in set(use) - USE_KEYS:
+                errors.append(f"l'objet '{name}' a un champ d'usage inconnu '{key}'")
+            if use.get("behavior") not in BEHAVIORS:
+                errors.append(f"l'objet '{name}' a un usage inconnu {use.get('behavior')!r}")
+            for room_name in use.get("rooms", []):
+                if room_name not in room_names:
+                    errors.append(f"l'objet '{name}' ne peut être utilisé que dans une salle inconnue '{room_name}'")
+
+    for room in pack.get("rooms", []):
+        for direction, target in room.get("exits", {}).items():
+            if direction not in directions:
+                errors.append(f"la salle '{room.get('name')}' a une direction inconnue '{direction}'")
+            elif target is not None and target not in room_names:
+                errors.append(f"la salle '{room.get('name')}' a une sortie {direction} vers une salle inconnue '{target}'")
+        for item_name in room.get("items", []):
+            if item_name not in items:
+                errors.append(f"la salle '{room.get('name')}' contient un objet inconnu '{item_name}'")
+
+    character_names = set()
+    for character in pack.get("characters", []):
+        name = character.get("name")
+        if name in character_names:
+            errors.append(f"le personnage '{name}' est défini plusieurs fois")
+        character_names.add(name)
+        if character.get("room") not in room_names:
+            errors.append(f"le personnage '{name}' est placé dans une salle inconnue {character.get('room')!r}")
+        if not character.get("messages"):
+            errors.append(f"le personnage '{name}' n'a aucun message")
+
+    quest_titles = {quest.get("title") for quest in pack.get("quests", [])}
+    for quest in pack.get("quests", []):
+        if not quest.get("title") or not isinstance(quest.get("objectives", []), list):
+            errors.append(f"la quête {quest.get('title')!r} doit avoir un titre et une liste d'objectifs")
+        for title in quest.get("prerequisites", []):
+            if title not in quest_titles:
+                errors.append(f"la quête {quest.get('title')!r} a pour prérequis une quête inconnue {title!r}")
+    for title in pack.get("victory", []):
+        if title not in quest_titles:
+            errors.append(f"la victoire dépend d'une quête inconnue {title!r}")
+    cycle = _quest_cycle(pack.get("quests", []))
+    if cycle:
+        errors.append(f"les prérequis des quêtes forment un cycle : {', '.join(cycle)}")
+
+    if pack.get("start") not in room_names:
+        errors.append(f"la salle de départ {pack.get('start')!r} n'existe pas")
+    for item_name in pack.get("player", {}).get("inventory", []):
+        if item_name not in items:
+            errors.append(f"l'inventaire du joueur contient un objet inconnu '{item_name}'")
+
+    if errors:
+        raise ValueError("Monde invalide :\n" + "".join(f"  - {error}\n" for error in errors).rstrip("\n"))
+
+
+def _quest_cycle(quests):
+    """
+    Return the titles of the quests that can never be unlocked because their prerequisites form a
+    cycle, in the order of the pack (an empty list if the prerequisites form a DAG).
+
+    The quests without prerequisites are removed first, then the quests whose prerequisites have all
+    been removed (Kahn's algorithm): the quests left are on a cycle or follow one.
+
+    >>> _quest_cycle([{"title": "A", "prerequisites": ["B"]}, {"title": "B", "prerequisites": ["A"]}, {"title": "C"}])
+    ['A', 'B']
+    """
+    successors = {quest.get("title"): [] for quest in quests}
+    remaining = {}
+    for quest in quests:
+        prerequisites = [title for title in quest.get("prerequisites", []) if title in successors]
+        remaining[quest.get("title")] = len(prerequisites)
+        for title in prerequisites:
+            successors[title].append(quest.get("title"))
+    ready = [title for title, count in remaining.items() if count == 0]
+    while ready:
+        for successor in successors[ready.pop()]:
+            remaining[successor] -= 1
+            if remaining[successor] == 0:
+                ready.append(successor)
+    return [title for title, count in remaining.items() if count > 0]
+
+
+def build_world(pack):
+    """
+    Validate a world pack and build the corresponding World.
+
+    Args:
+        pack (dict): The decoded world pack.
+
+    Returns:
+        World: The built world.
+    """
+    validate_pack(pack)
+    world = World()
+    world.directions = {d: list(words) for d, words in pack["directions"].items()}
+
+    # Create rooms, their id in the graph being their position in the pack.
+    world.graph = RoomGraph(world.directions)
+    rooms_by_name = world.rooms_by_name
+    for data in pack["rooms"]:
+        room = Room(data["name"], data["description"], data.get("dark", False), image=data.get("image"))
+        world.graph.add_room(room)
+        rooms_by_name[room.name] = room
+        world.rooms.append(room)
+
+    # Create exits
+    for data in pack["rooms"]:
+        exits = data.get("exits", {})
+        rooms_by_name[data["name"]].exits = {d: rooms_by_name.get(target) for d, target in exits.items()}
+
+    # Create Items, one object per definition, and place them.
+    items = {name: Item(name, item["description"], item["weight"], ItemUse(**item["use"]) if "use" in item else None)
+             for name, item in pack.get("items", {}).items()}
+    for data in pack["rooms"]:
+        for item_name in data.get("items", []):
+            rooms_by_name[data["name"]].inventory.add(items[item_name])
+    for item_name in pack.get("player", {}).get("inventory", []):
+        world.player_inventory.append(items[item_name])
+
+    # Create characters
+    for data in pack.get("characters", []):
+        room = rooms_by_name[data["room"]]
+        character = Character(data["name"], data["description"], room, data["messages"])
+        room.characters[character.name] = character
+        world.characters[character.name] = character
+
+    # Create quests
+    for data in pack.get("quests", []):
+        world.quests.append(Quest(data["title"], data["description"], list(data.get("objectives", [])), data.get("reward"),
+                                  data.get("prerequisites")))
+    world.victory = tuple(pack["victory"]) if "victory" in pack else None
+
+    world.start_room = rooms_by_name[pack["start"]]
+    world.analyze()
+    return world
+
+
+@functools.cache
+def _code_stamp():
+    """Return the latest modification time (ns) of the modules stored in a snapshot (computed once per process)."""
+    here = Path(__file__).parent
+    return max((here / module).stat().st_mtime_ns for module in SNAPSHOT_MODULES)
+
+
+def snapshot_path(path):
+    """Return the path of the compiled snapshot of a world pack (next to it, in __pycache__)."""
+    path = Path(path)
+    return path.parent / "__pycache__" / (path.stem + ".snapshot")
+
+
+def compile_world(path):
+    """
+    Build a world pack and store the resulting World as a binary snapshot.
+
+    Args:
+        path (str | Path): The path of the JSON world pack.
+
+    Returns:
+        World: The built world.
+    """
+    path = Path(path)
+    stat = path.stat()
+    with open(path, encoding="utf-8") as file:
+        world = build_world(json.load(file))
+
+    # Failing to write the cache is not an error: the world will simply be rebuilt next time.
+    target = snapshot_path(path)
+    try:
+        target.parent.mkdir(exist_ok=True)
+        tmp = target.with_suffix(".tmp")
+        with open(tmp, "wb") as file:
+            file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, stat.st_mtime_ns, stat.st_size, _code_stamp()))
+            pickle.dump(world, file, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(target)
+    except OSError:
+        pass
+    return world
+
+
+def load_world(path=DEFAULT_WORLD):
+    """
+    Load a world, from its compiled snapshot if it is up to date, from the world pack otherwise.
+
+    Args:
+        path (str | Path): The path of the JSON world pack.
+
+    Returns:
+        World: A freshly loaded world, owned by the caller; only its Quests are shared.
+
+    >>> load_world().quests[0] is load_world().quests[0]
+    True
+    """
+    path = Path(path)
+    stat = path.stat()
+    world = None
+    try:
+        with open(snapshot_path(path), "rb") as file:
+            header = SNAPSHOT_HEADER.unpack(file.read(SNAPSHOT_HEADER.size))
+            if header == (SNAPSHOT_MAGIC, stat.st_mtime_ns, stat.st_size, _code_stamp()):
+                world = pickle.load(file)
+    except (OSError, struct.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        pass
+    if world is None:
+        world = compile_world(path)
+    stamp = (stat.st_mtime_ns, stat.st_size, _code_stamp())
+    cached = _QUESTS.get(path.resolve())
+    if cached is not None and cached[0] == stamp:
+        world.quests = cached[1]
+    else:
+        _QUESTS[path.resolve()] = (stamp, world.quests)
+    return world
@@ -0,0 +1,167 @@
+# Description: procedural world generator.
+#
+# Generates world packs of any size, with the same format as worlds/default.json,
+# so that they are validated and built by the world loader like the hand-written world.
+# Usage: python worldgen.py --rooms 10000 --items 5000 --npcs 500 --quests 50 -o worlds/big.json
+
+import argparse
+import json
+import math
+import random
+
+from world import build_world
+
+DIRECTIONS = {'N' : ['N', 'North', 'NORTH', 'north', 'n'], 'E' : ['E', 'East', 'EAST', 'east', 'e'], 'S' : ['S', 'South', 'SOUTH', 'south', 's'], 'O' : ['O', 'Ouest', 'OUEST', 'ouest', 'o'], 'U' : ['U', 'Up', 'UP', 'up', 'u'], 'D' : ['D', 'Down', 'DOWN', 'down', 'd']}
+OPPOSITES = {"N": "S", "S": "N", "E": "O", "O": "E", "U": "D", "D": "U"}
+# Moves on the grid for each horizontal direction (row, column).
+MOVES = {"N": (-1, 0), "S": (1, 0), "E": (0, 1), "O": (0, -1)}
+
+PLACES = ["une clairière", "une crypte", "une taverne", "un moulin", "une chapelle", "une forge",
+          "un marais", "une bibliothèque", "un verger", "une caserne", "un puits", "une tour de guet"]
+ADJECTIVES = ["abandonné(e)", "lumineux(se)", "humide", "silencieux(se)", "délabré(e)", "animé(e)",
+              "étroit(e)", "immense", "poussiéreux(se)", "mystérieux(se)"]
+OBJECTS = [("pomme", "une pomme bien mûre", 1), ("corde", "une corde solide", 2), ("lanterne", "une lanterne éteinte", 2),
+           ("dague", "une dague rouillée", 2), ("parchemin", "un parchemin illisible", 0), ("marteau", "un marteau de forgeron", 4),
+           ("gemme", "une gemme étincelante", 0), ("bouclier", "un bouclier cabossé", 3), ("fiole", "une fiole vide", 1)]
+PEOPLE = [("un(e) marchand(e) ambulant(e)", ["Vous cherchez quelque chose ?", "Mes prix sont les meilleurs du royaume."]),
+          ("un(e) garde fatigué(e)", ["Circulez !", "Rien à signaler."]),
+          ("un(e) paysan(ne)", ["La récolte sera bonne cette année.", "Avez-vous vu mes chèvres ?"]),
+          ("un(e) érudit(e)", ["Savez-vous lire ?", "Les anciens parlaient d'un dragon..."])]
+
+
+def generate_pack(rooms=100, items=50, npcs=10, quests=5, seed=0, one_way_ratio=0.05, dark_ratio=0.05):
+    """
+    Generate a world pack of the given size.
+
+    The rooms are laid out on a square grid. A random spanning tree of the grid gives two-way passages
+    between neighbouring rooms, so that every room can be reached from the start; extra passages are
+    then added, some of them one-way, as well as stairs (U/D) between distant rooms.
+
+    Args:
+        rooms (int): The number of rooms (at least 1).
+        items (int): The number of Items placed in the rooms.
+        npcs (int): The number of NPCs.
+        quests (int): The number of quests.
+        seed (int): The seed of the random generator: the same seed always gives the same world.
+        one_way_ratio (float): The share of the extra passages that are one-way.
+        dark_ratio (float): The share of dark rooms (the start room is never dark).
+
+    Returns:
+        dict: The world pack.
+
+    Examples:
+
+    >>> pack = generate_pack(rooms=20, items=5, npcs=2, quests=1, seed=1)
+    >>> len(pack["rooms"]), len(pack["items"]), len(pack["characters"]), len(pack["quests"])
+    (20, 5, 2, 1)
+    >>> pack == generate_pack(rooms=20, items=5, npcs=2, quests=1, seed=1)
+    True
+    """
+    rng = random.Random(seed)
+    width = math.ceil(math.sqrt(rooms))
+    names = [f"Room{i}" for i in range(rooms)]
+    exits = [{} for _ in range(rooms)]
+
+    def neighbour(i, direction):
+        row, column = divmod(i, width)
+        d_row, d_column = MOVES[direction]
+        row, column = row + d_row, column + d_column
+        j = row * width + column
+        if 0 <= column < width and 0 <= row and j < rooms:
+            return j
+        return None
+
+    # Random spanning tree of the grid (iterative randomized depth-first search), with two-way passages.
+    visited = [False] * rooms
+    visited[0] = True
+    stack = [0]
+    while stack:
+        i = stack[-1]
+        candidates = [(d, j) for d in MOVES if (j := neighbour(i, d)) is not None and not visited[j]]
+        if not candidates:
+            stack.pop()
+            continue
+        direction, j = rng.choice(candidates)
+        exits[i][direction] = names[j]
+        exits[j][OPPOSITES[direction]] = names[i]
+        visited[j] = True
+        stack.append(j)
+
+    # Extra passages between neighbouring rooms, some of them one-way.
+    for i in range(rooms):
+        for direction in ("E", "S"):
+            j = neighbour(i, direction)
+            if j is None or direction in exits[i] or rng.random() > 0.3:
+                continue
+            exits[i][direction] = names[j]
+            if rng.random() >= one_way_ratio:
+                exits[j][OPPOSITES[direction]] = names[i]
+
+    # Stairs between distant rooms.
+    for _ in range(rooms // 20):
+        i, j = rng.randrange(rooms), rng.randrange(rooms)
+        if i != j and "U" not in exits[i] and "D" not in exits[j]:
+            exits[i]["U"] = names[j]
+            exits[j]["D"] = names[i]
+
+    pack = {"start": names[0], "directions": DIRECTIONS, "rooms": [], "items": {}, "characters": [], "quests": [],
+            "player": {"inventory": []}}
+    for i in range(rooms):
+        room = {"name": names[i],
+                "description": f"dans {rng.choice(PLACES)} {rng.choice(ADJECTIVES)}.",
+                "dark": i != 0 and rng.random() < dark_ratio,
+                "exits": exits[i]}
+        pack["rooms"].append(room)
+
+    item_names = []
+    for i in range(items):
+        name, description, weight = rng.choice(OBJECTS)
+        item_names.append(f"{name}{i}")
+        pack["items"][item_names[-1]] = {"description": description, "weight": weight}
+        pack["rooms"][rng.randrange(rooms)].setdefault("items", []).append(item_names[-1])
+
+    npc_names = []
+    for i in range(npcs):
+        description, messages = rng.choice(PEOPLE)
+        npc_names.append(f"Npc{i}")
+        pack["characters"].append({"name": npc_names[-1], "description": description,
+                                   "room": names[rng.randrange(rooms)], "messages": messages})
+
+    for i in range(quests):
+        objectives = [f"Visiter {rng.choice(names)}" for _ in range(3)]
+        if npc_names:
+            objectives.append(f"Parler avec {rng.choice(npc_names)}")
+        if item_names:
+            objectives.append(f"Prendre {rng.choice(item_names)}")
+        objectives.append(f"Se déplacer {rng.randint(5, 50)} fois")
+        quest = {"title": f"Quête {i}", "description": f"La quête numéro {i}.",
+                 "objectives": list(dict.fromkeys(objectives)), "reward": f"Récompense {i}"}
+        # The prerequisites are earlier quests, so that the quests form a DAG.
+        if i:
+            quest["prerequisites"] = sorted({f"Quête {rng.randrange(i)}" for _ in range(rng.randint(1, 2))})
+        pack["quests"].append(quest)
+    return pack
+
+
+def generate_world(rooms=100, items=50, npcs=10, quests=5, seed=0, **options):
+    """Generate a world pack (see generate_pack) and build the corresponding World."""
+    return build_world(generate_pack(rooms, items, npcs, quests, seed, **options))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère un monde aléatoire au format des world packs.")
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--npcs", type=int, default=10)
+    parser.add_argument("--quests", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", required=True, help="fichier JSON à écrire")
+    args = parser.parse_args()
+
+    pack = generate_pack(args.rooms, args.items, args.npcs, args.quests, args.seed)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(pack, file, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
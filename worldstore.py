@@ -0,0 +1,371 @@
+# Define the WorldStore class, a world kept in a memory-mapped file and loaded room by room.
+#
+# Usage: python worldstore.py worlds/default.json worlds/default.store
+
+import mmap
+import pickle
+import struct
+import sys
+import weakref
+from array import array
+from collections import deque
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+from graph import RoomGraph
+from room import Room
+from character import Character
+from world import World, load_world
+
+# Suffix of the world store files.
+STORE_SUFFIX = ".store"
+
+# File layout: a header, the pickled metadata (directions, room names, NPC names, quests...), the exits
+# of all rooms as an array of ints (one slot per direction), the darkness of all rooms as bytes, the
+# room of every NPC as an array of ints, an index giving the (offset, length) of the record of each
+# room, and the room records themselves.
+# A record that is written back takes the place of the previous one if it fits in it, and is appended
+# at the end of the file otherwise; the index is updated in place, and the records are packed again
+# when the store is closed.
+STORE_MAGIC = b"TBASTOR2"
+STORE_HEADER = struct.Struct("<8sIIQQQQQQ")
+INDEX_ENTRY = struct.Struct("<QI")
+
+
+def write_store(world, path):
+    """
+    Write a World in a world store file.
+
+    Args:
+        world (World): The world to store.
+        path (str | Path): The path of the store file.
+    """
+    graph = world.graph
+    count = len(graph.rooms)
+    # The NPCs are found without loading their rooms, so that they move from the start.
+    positions = {npc.name: room.id for room in graph.rooms for npc in (room._characters or {}).values()}
+    meta = pickle.dumps({"directions": world.directions,
+                         "names": [room.name for room in graph.rooms],
+                         "npcs": list(positions),
+                         "start": world.start_room.id,
+                         "quests": world.quests, "victory": world.victory,
+                         "report": world.analyze(),
+                         "player_inventory": world.player_inventory}, protocol=pickle.HIGHEST_PROTOCOL)
+    targets = graph._targets.tobytes()
+    dark = bytes(graph._dark)
+    npcs = array("i", positions.values()).tobytes()
+    records = [_encode_room(room) for room in graph.rooms]
+
+    meta_offset = STORE_HEADER.size
+    targets_offset = meta_offset + len(meta)
+    dark_offset = targets_offset + len(targets)
+    npcs_offset = dark_offset + len(dark)
+    index_offset = npcs_offset + len(npcs)
+    offset = index_offset + count * INDEX_ENTRY.size
+    index = bytearray()
+    for record in records:
+        index += INDEX_ENTRY.pack(offset, len(record))
+        offset += len(record)
+
+    with open(path, "wb") as file:
+        file.write(STORE_HEADER.pack(STORE_MAGIC, count, len(graph.directions),
+                                     meta_offset, targets_offset, dark_offset, npcs_offset, index_offset, len(meta)))
+        file.write(meta)
+        file.write(targets)
+        file.write(dark)
+        file.write(npcs)
+        file.write(index)
+        for record in records:
+            file.write(record)
+
+
+# Serialize the contents of a room (its exits and darkness are stored in the graph arrays).
+def _encode_room(room):
+    items = room._inventory.stacks() if room._inventory else []
+    characters = [(npc.name, npc.description, npc.msgs, npc._msg_index) for npc in (room._characters or {}).values()]
+    return pickle.dumps((room.description, room.image, items, characters), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class WorldStore:
+    """
+    This class gives access to a world stored in a memory-mapped file. The exits and the darkness of
+    every room are loaded at once in a RoomGraph, which is compact, but a Room, with its inventory and
+    its NPCs, is only built when it is needed: when the player or an NPC gets within radius moves of
+    it, or when the game reaches it through an exit. Rooms that are out of range again are evicted and,
+    if they were modified, written back to the file. The room of every NPC is kept in the file, so that
+    all the NPCs take part in the game from the start, wherever they are.
+
+    An evicted room stays in memory, with the same identity, as long as something else refers to it
+    (the history of the player, for instance), so that rooms can be compared with 'is' as before.
+
+    Attributes:
+        path (Path) : The path of the store file.
+        radius (int) : The number of moves around the player within which rooms are kept loaded.
+        graph (RoomGraph) : The graph of the exits of all the rooms.
+        characters (dict) : The NPCs of the loaded rooms, keyed by name.
+        world (World) : A World whose rooms are loaded on access.
+
+    Methods:
+        __init__(self, path, radius) : The constructor.
+        get(self, room_id) : Return the Room with the given id, loading it if needed.
+        resident(self) : Return the list of the rooms currently kept loaded.
+        update(self, anchors) : Load the rooms within radius moves of the anchor rooms and of the NPCs, and evict the others.
+        flush(self) : Write back all the modified rooms.
+        close(self) : Flush the store, pack its records and close the file.
+
+    Examples:
+
+    >>> import tempfile, os
+    >>> path = os.path.join(tempfile.mkdtemp(), "default.store")
+    >>> write_store(load_world(), path)
+    >>> store = WorldStore(path, radius=1)
+    >>> store.world.start_room.name
+    'VillageSouth'
+    >>> len(store.resident()) < len(store.world.rooms)
+    True
+    >>> sorted(store.characters)
+    ['Dad', 'Dragon', 'King', 'Shopkeeper', 'Timmy', 'Troubadour', 'Witch']
+    >>> size = os.path.getsize(path)
+    >>> for _ in range(3):
+    ...     _ = store.world.start_room.inventory.remove("money")
+    ...     store.update([store.world.rooms_by_name["Castle"].id])
+    ...     store.world.start_room.inventory.add(_)
+    ...     store.update([store.world.start_room.id])
+    >>> store.close()
+    >>> os.path.getsize(path) == size
+    True
+    """
+
+    # Define the constructor.
+    def __init__(self, path, radius=2):
+        self.path = Path(path)
+        self.radius = radius
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        (magic, self._count, directions, meta_offset, targets_offset, self._dark_offset,
+         self._npcs_offset, self._index_offset, meta_size) = STORE_HEADER.unpack_from(self._map, 0)
+        if magic != STORE_MAGIC:
+            raise ValueError(f"{self.path} n'est pas un fichier de monde valide.")
+        meta = pickle.loads(self._map[meta_offset:meta_offset + meta_size])
+        self._targets_offset = targets_offset
+
+        # The graph arrays are copied in memory: they are small and read at every move.
+        graph = RoomGraph(meta["directions"])
+        graph._targets = array("i")
+        graph._targets.frombytes(self._map[targets_offset:targets_offset + self._count * directions * 4])
+        graph._dark = bytearray(self._map[self._dark_offset:self._dark_offset + self._count])
+        graph._neighbours = [None] * self._count
+        graph.rooms = _StoredRooms(self)
+        self.graph = graph
+
+        self._names = meta["names"]
+        self._npcs = meta["npcs"]
+        self._ids = None
+        self._live = weakref.WeakValueDictionary()
+        self._resident = {}
+        self._baselines = {}
+        self.characters = {}
+
+        self.world = World()
+        self.world.store = self
+        self.world.graph = graph
+        self.world.rooms = graph.rooms
+        self.world.rooms_by_name = _StoredRoomsByName(self)
+        self.world.characters = self.characters
+        self.world.directions = meta["directions"]
+        self.world.quests = meta["quests"]
+        self.world.victory = meta["victory"]
+        self.world.player_inventory = meta["player_inventory"]
+        # The report was computed when the store was written, on the same exits as the file.
+        self.world.report = meta["report"]
+        self.world.report.exits_version = graph.exits_version
+        self.world.start_room = self.get(meta["start"])
+        # The rooms of all the NPCs are loaded with the start room, and the NPCs with them.
+        positions = array("i", self._map[self._npcs_offset:self._npcs_offset + len(self._npcs) * 4])
+        self.update([meta["start"], *positions])
+
+    # Define the get method.
+    def get(self, room_id):
+        room = self._resident.get(room_id)
+        if room is None:
+            room = self._live.get(room_id) or self._load(room_id)
+            self._resident[room_id] = room
+            # The NPCs of a loaded room take part in the game again.
+            for npc in (room._characters or {}).values():
+                self.characters[npc.name] = npc
+        return room
+
+    # Define the resident method.
+    def resident(self):
+        """Return the list of the rooms currently kept loaded by the store."""
+        return list(self._resident.values())
+
+    # Define the update method.
+    def update(self, anchors):
+        # Rooms within radius moves of the anchors and of the NPCs, following the exits.
+        in_range = set(anchors)
+        in_range.update(npc.current_room.id for npc in self.characters.values())
+        frontier = deque((room_id, 0) for room_id in in_range)
+        while frontier:
+            room_id, distance = frontier.popleft()
+            if distance == self.radius:
+                continue
+            for next_id in self.graph.get_neighbours(room_id):
+                if next_id not in in_range:
+                    in_range.add(next_id)
+                    frontier.append((next_id, distance + 1))
+
+        evicted = [room_id for room_id in self._resident if room_id not in in_range]
+        self._write_back(evicted)
+        for room_id in evicted:
+            del self._resident[room_id]
+        for room_id in in_range:
+            self.get(room_id)
+
+    # Define the flush method.
+    def flush(self):
+        self._write_back(list(self._live.keys()))
+        # The exits and the darkness may have changed too: they are small enough to be rewritten at once.
+        targets = self.graph._targets.tobytes()
+        self._map[self._targets_offset:self._targets_offset + len(targets)] = targets
+        self._map[self._dark_offset:self._dark_offset + self._count] = bytes(self.graph._dark)
+        # The NPCs that left the game keep their last room.
+        positions = array("i", self._map[self._npcs_offset:self._npcs_offset + len(self._npcs) * 4])
+        for number, name in enumerate(self._npcs):
+            npc = self.characters.get(name)
+            if npc is not None:
+                positions[number] = npc.current_room.id
+        self._map[self._npcs_offset:self._npcs_offset + len(positions) * 4] = positions.tobytes()
+        self._map.flush()
+
+    # Define the close method.
+    def close(self):
+        self.flush()
+        end = self._compact()
+        self._map.close()
+        self._file.truncate(end)
+        self._file.close()
+
+    # Pack the records one after the other, dropping the space left by the records written back, and
+    # return the new end of the file.
+    def _compact(self):
+        start = self._index_offset + self._count * INDEX_ENTRY.size
+        entries = [INDEX_ENTRY.unpack_from(self._map, self._index_offset + room_id * INDEX_ENTRY.size)
+                   for room_id in range(self._count)]
+        end = start + sum(length for _, length in entries)
+        if end == len(self._map):
+            return end
+        records = [self._map[offset:offset + length] for offset, length in entries]
+        offset = start
+        for room_id, record in enumerate(records):
+            INDEX_ENTRY.pack_into(self._map, self._index_offset + room_id * INDEX_ENTRY.size, offset, len(record))
+            self._map[offset:offset + len(record)] = record
+            offset += len(record)
+        self._map.flush()
+        return end
+
+    # Build a room, its Items and its NPCs from its record.
+    def _load(self, room_id):
+        offset, length = INDEX_ENTRY.unpack_from(self._map, self._index_offset + room_id * INDEX_ENTRY.size)
+        record = self._map[offset:offset + length]
+        description, image, items, characters = pickle.loads(record)
+
+        room = Room(self._names[room_id], description, bool(self.graph._dark[room_id]), image)
+        room.id = room_id
+        room.graph = self.graph
+        for item, count in items:
+            room.inventory.add(item, count)
+        for name, npc_description, msgs, msg_index in characters:
+            npc = Character(name, npc_description, room, msgs)
+            npc._msg_index = msg_index
+            room.characters[name] = npc
+
+        self.graph.notify_room_added(room)
+        self._live[room_id] = room
+        self._baselines[room_id] = record
+        weakref.finalize(room, self._baselines.pop, room_id, None)
+        return room
+
+    # Write the records of the modified rooms in place when they fit, at the end of the file otherwise,
+    # and point the index at them.
+    def _write_back(self, room_ids):
+        updates = []
+        for room_id in room_ids:
+            room = self._live.get(room_id)
+            if room is None:
+                continue
+            record = _encode_room(room)
+            if record != self._baselines.get(room_id):
+                updates.append((room_id, record))
+                self._baselines[room_id] = record
+        appended = []
+        for room_id, record in updates:
+            entry = self._index_offset + room_id * INDEX_ENTRY.size
+            offset, length = INDEX_ENTRY.unpack_from(self._map, entry)
+            if len(record) <= length:
+                self._map[offset:offset + len(record)] = record
+                INDEX_ENTRY.pack_into(self._map, entry, offset, len(record))
+            else:
+                appended.append((room_id, record))
+        if not appended:
+            return
+
+        self._file.seek(0, 2)
+        for room_id, record in appended:
+            offset = self._file.tell()
+            self._file.write(record)
+            INDEX_ENTRY.pack_into(self._map, self._index_offset + room_id * INDEX_ENTRY.size, offset, len(record))
+        self._file.flush()
+        # Map the file again so that the appended records can be read.
+        self._map.flush()
+        self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+
+class _StoredRooms(Sequence):
+    """The rooms of a WorldStore as a sequence indexed by room id, loading them on access."""
+
+    def __init__(self, store):
+        self._store = store
+
+    def __len__(self):
+        return self._store._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._store.get(index)
+
+
+class _StoredRoomsByName(Mapping):
+    """The rooms of a WorldStore keyed by name, loading them on access."""
+
+    def __init__(self, store):
+        self._store = store
+
+    def __getitem__(self, name):
+        # The index of the names is only built the first time a room is looked up by name.
+        if self._store._ids is None:
+            self._store._ids = {room_name: room_id for room_id, room_name in enumerate(self._store._names)}
+        return self._store.get(self._store._ids[name])
+
+    def __iter__(self):
+        return iter(self._store._names)
+
+    def __len__(self):
+        return self._store._count
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python worldstore.py <monde.json> <monde.store>")
+        sys.exit(1)
+    write_store(load_world(sys.argv[1]), sys.argv[2])
+
+
+if __name__ == "__main__":
+    main()